@@ -0,0 +1,160 @@
+"""
+Load-test /api/articles served by the async handlers (DatabaseExecutor) against the former sync handlers.
+
+Each variant runs in its own uvicorn server process with one worker; the client keeps --concurrency
+requests in flight and reports throughput, latency percentiles and 503 (backpressure) counts. The
+response cache is disabled so every request reaches SQLite.
+
+Usage:
+  python benchmarks/bench_api_concurrency.py --rows 20000 --requests 2000 --concurrency 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import statistics
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Query
+
+from afr_pusher.miniapp_api import DEFAULT_LIMIT, MAX_LIMIT, MiniAppArticleStore, build_app
+from afr_pusher.models import Article
+from afr_pusher.store import SQLiteStore
+
+API_KEY = "bench"
+
+
+def seed(store: SQLiteStore, rows: int, batch_size: int = 5000) -> None:
+    for start in range(0, rows, batch_size):
+        with store.unit_of_work() as work:
+            for idx in range(start, min(start + batch_size, rows)):
+                ts = f"2026-01-01T00:{idx // 60 % 60:02d}:{idx % 60:02d}+00:00"
+                article = Article(
+                    article_id=f"c{idx:08d}",
+                    record_key=f"c{idx:08d}:{ts}",
+                    url=f"https://www.afr.com/bench-{idx}",
+                    title=f"Bench article {idx}",
+                    summary="Summary text " * 30,
+                    published_at=ts,
+                    updated_at=ts,
+                )
+                work.upsert_event(article, f"基准文章 {idx}", "摘要内容" * 60)
+
+
+def _async_app(args: argparse.Namespace) -> FastAPI:
+    return build_app(
+        db_path=args.db,
+        api_key=API_KEY,
+        response_cache_entries=0,
+        db_workers=args.db_workers,
+        db_max_pending=args.db_max_pending,
+    )
+
+
+def _sync_app(args: argparse.Namespace) -> FastAPI:
+    """Same app and middleware, with /api/articles swapped back to a plain def handler on Starlette's threadpool."""
+    app = _async_app(args)
+    app.router.routes = [route for route in app.router.routes if getattr(route, "path", None) != "/api/articles"]
+    store = MiniAppArticleStore(args.db)
+
+    @app.get("/api/articles")
+    def list_articles(
+        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+        status: Optional[str] = Query(default=None),
+    ) -> dict[str, object]:
+        items, next_cursor = store.list_articles_page(limit=limit, status=status)
+        return {"ok": True, "items": items, "count": len(items), "next_cursor": next_cursor}
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _run_server(variant: str, args: argparse.Namespace, port: int) -> None:
+    app = _sync_app(args) if variant == "sync" else _async_app(args)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _serve(variant: str, args: argparse.Namespace) -> tuple[multiprocessing.Process, str]:
+    port = _free_port()
+    process = multiprocessing.Process(target=_run_server, args=(variant, args, port), daemon=True)
+    process.start()
+    base_url = f"http://127.0.0.1:{port}"
+    while True:
+        try:
+            httpx.get(f"{base_url}/health")
+            return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.05)
+
+
+async def _load(base_url: str, total: int, concurrency: int, limit: int) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    busy = 0
+    remaining = iter(range(total))
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal busy
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get("/api/articles", params={"limit": limit})
+            latencies.append(time.perf_counter() - started)
+            if response.status_code == 503:
+                busy += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers={"X-API-Key": API_KEY}, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        return latencies, busy, time.perf_counter() - started
+
+
+def _report(name: str, latencies: list[float], busy: int, elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name}: requests={len(ordered)} rps={len(ordered) / elapsed:.0f} "
+        f"p50_ms={statistics.median(ordered) * 1000:.1f} p99_ms={p99 * 1000:.1f} busy_503={busy}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--db", type=Path, default=Path("/tmp/afr-api-bench.db"))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--db-workers", type=int, default=4)
+    parser.add_argument("--db-max-pending", type=int, default=64)
+    parser.add_argument("--reuse", action="store_true", help="skip seeding when the database already exists")
+    args = parser.parse_args()
+
+    if not args.reuse:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{args.db}{suffix}").unlink(missing_ok=True)
+    store = SQLiteStore(args.db)
+    if not args.reuse:
+        seed(store, args.rows)
+
+    for variant in ("sync", "async"):
+        process, base_url = _serve(variant, args)
+        latencies, busy, elapsed = asyncio.run(_load(base_url, args.requests, args.concurrency, args.limit))
+        _report(variant, latencies, busy, elapsed)
+        process.terminate()
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measure bytes on the wire and latency for a 100-item /api/articles page under each response path.
+
+Variants: stdlib json vs orjson serialization (orjson only when installed), each uncompressed and with
+every Accept-Encoding the server can answer. The response cache is disabled so every request builds
+its body again; "encoder" times FastAPI's default jsonable_encoder + JSONResponse for the same payload.
+
+Usage:
+  python benchmarks/bench_api_payload.py --rows 1000 --repeat 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from afr_pusher import response_codec
+from afr_pusher.miniapp_api import MAX_LIMIT, MiniAppArticleStore, build_app
+from afr_pusher.models import Article
+from afr_pusher.store import SQLiteStore
+
+API_KEY = "bench"
+
+
+def seed(store: SQLiteStore, rows: int) -> None:
+    with store.unit_of_work() as work:
+        for idx in range(rows):
+            ts = f"2026-01-01T00:{idx // 60 % 60:02d}:{idx % 60:02d}+00:00"
+            article = Article(
+                article_id=f"z{idx:08d}",
+                record_key=f"z{idx:08d}:{ts}",
+                url=f"https://www.afr.com/payload-{idx}",
+                title=f"Reserve Bank holds rates as inflation cools, article {idx}",
+                summary="The central bank left the cash rate unchanged and signalled patience. " * 6,
+                published_at=ts,
+                updated_at=ts,
+            )
+            work.upsert_event(article, f"澳洲联储维持利率不变 {idx}", "央行维持现金利率不变，并表示将保持耐心。" * 8)
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float]:
+    ordered = sorted(samples)
+    return statistics.median(ordered), ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+def _measure(client: TestClient, accept_encoding: str, repeat: int) -> tuple[int, float, float]:
+    headers = {"X-API-Key": API_KEY, "Accept-Encoding": accept_encoding}
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get("/api/articles", params={"limit": MAX_LIMIT}, headers=headers)
+        samples.append(time.perf_counter() - started)
+        size = int(response.headers["Content-Length"])
+    p50, p99 = _percentiles(samples)
+    return size, p50, p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--db", type=Path, default=Path("/tmp/afr-payload-bench.db"))
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{args.db}{suffix}").unlink(missing_ok=True)
+    seed(SQLiteStore(args.db), args.rows)
+
+    items, _ = MiniAppArticleStore(args.db).list_articles_page(limit=MAX_LIMIT)
+    payload = {"ok": True, "items": items, "count": len(items)}
+    for name, render in (
+        ("encoder", lambda: JSONResponse(jsonable_encoder(payload)).body),
+        ("dumps", lambda: response_codec.dumps(payload)),
+    ):
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            render()
+            samples.append(time.perf_counter() - started)
+        p50, p99 = _percentiles(samples)
+        print(f"serialize={name} p50_ms={p50 * 1000:.2f} p99_ms={p99 * 1000:.2f}")
+
+    serializers = {"json": None}
+    if response_codec.orjson is not None:
+        serializers["orjson"] = response_codec.orjson
+    encodings = ["identity", "gzip"] + (["br"] if response_codec.brotli is not None else [])
+    for serializer, module in serializers.items():
+        response_codec.orjson = module
+        client = TestClient(build_app(db_path=args.db, api_key=API_KEY, response_cache_entries=0))
+        for encoding in encodings:
+            size, p50, p99 = _measure(client, encoding, args.repeat)
+            print(
+                f"serializer={serializer} encoding={encoding} bytes={size} "
+                f"p50_ms={p50 * 1000:.2f} p99_ms={p99 * 1000:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare /api/search's FTS5 path with a LIKE scan over a synthetic article_events table.
+
+Usage:
+  python benchmarks/bench_search.py --rows 100000 --db /tmp/afr-search-bench.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from pathlib import Path
+
+from afr_pusher.miniapp_api import MiniAppArticleStore
+from afr_pusher.models import Article
+from afr_pusher.store import SQLiteStore
+
+# Common words show up in roughly one title in ten; planted phrases in one row per PLANT_EVERY.
+COMMON_WORDS = "reserve bank rates housing market iron ore budget inflation wages".split()
+PLANT_EVERY = 1000
+PLANTED_EN = "superannuation"
+PLANTED_CJK = "澳洲联储"
+QUERIES = ("reserve bank", "iron ore", PLANTED_EN, PLANTED_CJK, "房价")
+
+
+def _vocabulary(rng: random.Random) -> tuple[list[str], list[str]]:
+    english = [f"w{n:05d}" for n in range(20_000)]
+    cjk = ["".join(chr(rng.randint(0x4E00, 0x9FA5)) for _ in range(2)) for _ in range(5_000)]
+    return english, cjk
+
+
+def _sentence(rng: random.Random, words: list[str], length: int, sep: str, common: float = 0.0) -> str:
+    return sep.join(
+        rng.choice(COMMON_WORDS) if rng.random() < common else rng.choice(words) for _ in range(length)
+    )
+
+
+def seed(store: SQLiteStore, rows: int, batch_size: int = 5000) -> None:
+    rng = random.Random(42)
+    english, cjk = _vocabulary(rng)
+    for start in range(0, rows, batch_size):
+        with store.unit_of_work() as work:
+            for idx in range(start, min(start + batch_size, rows)):
+                ts = f"2026-01-01T00:00:{idx % 60:02d}+00:00"
+                planted = idx % PLANT_EVERY == 0
+                title = _sentence(rng, english, 8, " ", common=0.1)
+                translated_title = _sentence(rng, cjk, 6, "")
+                if planted:
+                    title = f"{PLANTED_EN} {title}"
+                    translated_title = PLANTED_CJK + translated_title
+                article = Article(
+                    article_id=f"p{idx:08d}",
+                    record_key=f"p{idx:08d}:{ts}",
+                    url=f"https://www.afr.com/bench-{idx}",
+                    title=title.capitalize(),
+                    summary=_sentence(rng, english, 40, " ", common=0.02),
+                    published_at=ts,
+                    updated_at=ts,
+                )
+                work.upsert_event(article, translated_title, _sentence(rng, cjk, 40, "，"))
+
+
+def _time(callable_, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callable_()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), max(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--db", type=Path, default=Path("/tmp/afr-search-bench.db"))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--reuse", action="store_true", help="skip seeding when the database already exists")
+    args = parser.parse_args()
+
+    if not args.reuse:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{args.db}{suffix}").unlink(missing_ok=True)
+    store = SQLiteStore(args.db)
+    if not args.reuse:
+        started = time.perf_counter()
+        seed(store, args.rows)
+        print(f"seeded rows={args.rows} sec={time.perf_counter() - started:.1f}")
+
+    api_store = MiniAppArticleStore(args.db)
+    conn = api_store._db.connection()
+    for query in QUERIES:
+        terms = query.split()
+        fts_median, fts_max = _time(lambda: api_store.search_articles(query, limit=20), args.repeat)
+        like_median, like_max = _time(lambda: api_store._search_like(terms, 21, 0), args.repeat)
+        hits = conn.execute("SELECT COUNT(*) FROM article_search WHERE article_search MATCH ?", (
+            " ".join(f'"{term}"' for term in terms),
+        )).fetchone()[0]
+        print(
+            f"query={query!r} matches={hits} "
+            f"fts_median_ms={fts_median * 1000:.2f} fts_max_ms={fts_max * 1000:.2f} "
+            f"like_median_ms={like_median * 1000:.2f} like_max_ms={like_max * 1000:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
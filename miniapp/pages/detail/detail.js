@@ -5,17 +5,29 @@ function cleanText(value) {
   return String(value || '').trim();
 }
 
+function normalizeBlocks(blocks) {
+  return (blocks || [])
+    .map((block) => ({
+      isListItem: block.kind === 'list_item',
+      text: cleanText(block.text)
+    }))
+    .filter((block) => block.text);
+}
+
 function normalizeDetail(raw) {
   const translatedBody = cleanText(raw.translated_summary);
   const originalBody = cleanText(raw.summary);
+  const translatedBlocks = normalizeBlocks(raw.translated_blocks);
 
   return {
     ...raw,
     zhTitle: cleanText(raw.translated_title) || cleanText(raw.title) || '无标题',
     enTitle: cleanText(raw.title) || '-',
     translatedBody,
+    translatedBlocks,
     originalBody,
-    hasTranslatedBody: Boolean(translatedBody),
+    hasTranslatedBlocks: translatedBlocks.length > 0,
+    hasTranslatedBody: Boolean(translatedBody) || translatedBlocks.length > 0,
     displayCreatedAt: formatDateTime(raw.created_at),
     displaySentAt: formatDateTime(raw.sent_at),
     displayLastAttemptAt: formatDateTime(raw.last_attempt_at)
@@ -1,4 +1,4 @@
-const { getArticles } = require('../../utils/api');
+const { getArticles, prefetchArticles } = require('../../utils/api');
 const { formatDateTime } = require('../../utils/time');
 
 const STATUS_OPTIONS = [
@@ -12,25 +12,14 @@ function cleanText(value) {
   return String(value || '').trim();
 }
 
-function clipText(value, maxLength) {
-  if (value.length <= maxLength) {
-    return value;
-  }
-  return `${value.slice(0, maxLength)}...`;
-}
-
 function normalizeArticle(raw) {
   const zhTitle = cleanText(raw.translated_title) || cleanText(raw.title) || '无标题';
   const enTitle = cleanText(raw.title) || '-';
-  const translatedBody = cleanText(raw.translated_summary);
-  const originalBody = cleanText(raw.summary);
 
   return {
     ...raw,
     zhTitle,
     enTitle,
-    previewContent: clipText(translatedBody || originalBody || '-', 120),
-    hasTranslatedBody: Boolean(translatedBody),
     displayTime: formatDateTime(raw.sent_at || raw.last_attempt_at || raw.created_at)
   };
 }
@@ -40,7 +29,9 @@ Page({
     status: 'sent',
     statusOptions: STATUS_OPTIONS,
     articles: [],
+    nextCursor: null,
     loading: false,
+    loadingMore: false,
     errorMessage: ''
   },
 
@@ -52,6 +43,10 @@ Page({
     this.loadArticles({ fromPullDown: true });
   },
 
+  onReachBottom() {
+    this.loadMoreArticles();
+  },
+
   onStatusChange(event) {
     const status = event.currentTarget.dataset.status || '';
     this.setData({ status });
@@ -78,10 +73,12 @@ Page({
         status: this.data.status || undefined
       });
       const items = (result.items || []).map(normalizeArticle);
-      this.setData({ articles: items });
+      this.setData({ articles: items, nextCursor: result.next_cursor || null });
+      this.prefetch(items);
     } catch (err) {
       this.setData({
         articles: [],
+        nextCursor: null,
         errorMessage: `请求失败: ${err.message || 'unknown error'}`
       });
     } finally {
@@ -90,5 +87,35 @@ Page({
         wx.stopPullDownRefresh();
       }
     }
+  },
+
+  prefetch(items) {
+    // Best effort: a failed prefetch just means the detail page fetches the article itself.
+    prefetchArticles(items.map((item) => item.record_key)).catch(() => {});
+  },
+
+  async loadMoreArticles() {
+    if (!this.data.nextCursor || this.data.loading || this.data.loadingMore) {
+      return;
+    }
+    this.setData({ loadingMore: true });
+
+    try {
+      const result = await getArticles({
+        limit: 20,
+        status: this.data.status || undefined,
+        cursor: this.data.nextCursor
+      });
+      const items = (result.items || []).map(normalizeArticle);
+      this.setData({
+        articles: this.data.articles.concat(items),
+        nextCursor: result.next_cursor || null
+      });
+      this.prefetch(items);
+    } catch (err) {
+      wx.showToast({ title: '加载更多失败', icon: 'none' });
+    } finally {
+      this.setData({ loadingMore: false });
+    }
   }
 });
@@ -1,24 +1,44 @@
 const { API_BASE_URL, API_KEY } = require('../config');
 
-function request(path) {
+// Last response per path, so unchanged data is revalidated with If-None-Match and answered by a 304.
+const responseCache = {};
+// Articles fetched ahead of time by prefetchArticles, keyed by record_key; used once by getArticle.
+const prefetched = {};
+const MAX_BATCH_KEYS = 50;
+
+function request(path, { method = 'GET', data } = {}) {
   const headers = {};
   if (API_KEY) {
     headers['X-API-Key'] = API_KEY;
   }
+  const cached = method === 'GET' ? responseCache[path] : null;
+  if (cached) {
+    headers['If-None-Match'] = cached.etag;
+  }
 
   return new Promise((resolve, reject) => {
     wx.request({
       url: `${API_BASE_URL}${path}`,
-      method: 'GET',
+      method,
+      data,
       header: headers,
       timeout: 10000,
       success(res) {
+        if (res.statusCode === 304 && cached) {
+          resolve(cached.data);
+          return;
+        }
         const ok = res.statusCode >= 200 && res.statusCode < 300;
         if (!ok) {
           reject(new Error(`HTTP ${res.statusCode}`));
           return;
         }
-        resolve(res.data || {});
+        const data = res.data || {};
+        const etag = res.header && (res.header.ETag || res.header.etag);
+        if (etag && method === 'GET') {
+          responseCache[path] = { etag, data };
+        }
+        resolve(data);
       },
       fail(err) {
         reject(new Error((err && err.errMsg) || 'network error'));
@@ -27,19 +47,40 @@ function request(path) {
   });
 }
 
-function getArticles({ limit = 20, status } = {}) {
+function getArticles({ limit = 20, status, cursor } = {}) {
   const params = [`limit=${encodeURIComponent(limit)}`];
   if (status) {
     params.push(`status=${encodeURIComponent(status)}`);
   }
+  if (cursor) {
+    params.push(`cursor=${encodeURIComponent(cursor)}`);
+  }
   return request(`/api/articles?${params.join('&')}`);
 }
 
 function getArticle(recordKey) {
+  const item = prefetched[recordKey];
+  if (item) {
+    delete prefetched[recordKey];
+    return Promise.resolve({ ok: true, item });
+  }
   return request(`/api/articles/${encodeURIComponent(recordKey)}`);
 }
 
+// Fetch the full articles behind a list page in one request so opening any of them is instant.
+async function prefetchArticles(recordKeys) {
+  const keys = recordKeys.filter((key) => key && !prefetched[key]).slice(0, MAX_BATCH_KEYS);
+  if (keys.length === 0) {
+    return;
+  }
+  const result = await request('/api/articles/batch', { method: 'POST', data: { record_keys: keys } });
+  (result.items || []).forEach((item) => {
+    prefetched[item.record_key] = item;
+  });
+}
+
 module.exports = {
   getArticles,
-  getArticle
+  getArticle,
+  prefetchArticles
 };
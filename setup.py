@@ -15,8 +15,9 @@ setup(
         "uvicorn>=0.35.0",
     ],
     extras_require={
-        "dev": ["pytest>=8.2.0"],
+        "dev": ["pytest>=8.2.0", "httpx>=0.27.0"],
         "browser": ["playwright>=1.52.0"],
+        "speedups": ["orjson>=3.9.0", "brotli>=1.1.0"],
     },
     entry_points={
         "console_scripts": [
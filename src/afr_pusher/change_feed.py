@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Callable, Optional
+
+from .db_executor import DatabaseBusyError, DatabaseExecutor
+
+DEFAULT_POLL_INTERVAL_SEC = 1.0
+DEFAULT_BUFFER_SIZE = 1000
+FEED_BATCH_LIMIT = 200
+
+ChangeEvent = dict[str, object]
+
+
+class ChangeFeed:
+    """
+    Fans the change log out to any number of waiting API clients from a single watcher task.
+    While anyone is subscribed the watcher reads new change rows once per poll interval (a primary-key
+    seek that finds nothing when idle) and keeps the most recent events in memory; subscribers only wait
+    on an asyncio.Condition, so idle connections cost no threads and no queries.
+    """
+
+    def __init__(
+        self,
+        read_changes: Callable[[int, int], list[ChangeEvent]],
+        latest_seq: Callable[[], int],
+        db: DatabaseExecutor,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SEC,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        logger: Optional[logging.Logger] = None,
+    ):
+        self._read_changes = read_changes
+        self._latest_seq_query = latest_seq
+        self._db = db
+        self.poll_interval = max(0.01, float(poll_interval))
+        self._events: deque[ChangeEvent] = deque(maxlen=max(1, int(buffer_size)))
+        self._latest_seq: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task] = None
+        self._subscribers = 0
+        self.logger = logger or logging.getLogger(__name__)
+
+    @property
+    def subscribers(self) -> int:
+        return self._subscribers
+
+    async def latest_seq(self) -> int:
+        await self._ensure_started()
+        return int(self._latest_seq or 0)
+
+    async def wait_for_events(self, after_seq: int, timeout: float) -> list[ChangeEvent]:
+        """Return events with seq > after_seq, waiting up to timeout seconds for the first one to arrive."""
+        await self._ensure_started()
+        assert self._condition is not None
+        condition = self._condition
+        if int(self._latest_seq or 0) <= after_seq:
+            self._subscribers += 1
+            try:
+                async with condition:
+                    await asyncio.wait_for(
+                        condition.wait_for(lambda: int(self._latest_seq or 0) > after_seq),
+                        timeout,
+                    )
+            except asyncio.TimeoutError:
+                return []
+            finally:
+                self._subscribers -= 1
+        return await self._events_after(after_seq)
+
+    async def _events_after(self, after_seq: int) -> list[ChangeEvent]:
+        buffered = [event for event in self._events if int(event["seq"]) > after_seq]
+        oldest = int(self._events[0]["seq"]) if self._events else None
+        if oldest is not None and oldest <= after_seq + 1:
+            return buffered[:FEED_BATCH_LIMIT]
+        # The client is further behind than the buffer reaches: catch it up from the table once.
+        return await self._db.run(self._read_changes, after_seq, FEED_BATCH_LIMIT)
+
+    async def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # The condition and watcher belong to one event loop; a fresh loop (tests, reloads) gets its own.
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self._task = None
+        if self._latest_seq is None:
+            self._latest_seq = await self._db.run(self._latest_seq_query)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._watch())
+
+    async def _watch(self) -> None:
+        idle_polls = 0
+        # Keep polling briefly after the last subscriber leaves so reconnecting clients find it running.
+        while self._subscribers > 0 or idle_polls < 3:
+            idle_polls = 0 if self._subscribers > 0 else idle_polls + 1
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._poll()
+            except DatabaseBusyError:
+                continue
+            except Exception:
+                self.logger.exception("change feed poll failed")
+
+    async def _poll(self) -> None:
+        assert self._condition is not None
+        while True:
+            events = await self._db.run(self._read_changes, int(self._latest_seq or 0), FEED_BATCH_LIMIT)
+            if not events:
+                return
+            async with self._condition:
+                self._events.extend(events)
+                self._latest_seq = int(events[-1]["seq"])
+                self._condition.notify_all()
+            if len(events) < FEED_BATCH_LIMIT:
+                return
+
+
+def format_sse(event: ChangeEvent) -> str:
+    data = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event['seq']}\nevent: change\ndata: {data}\n\n"
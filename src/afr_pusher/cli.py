@@ -4,49 +4,94 @@ import argparse
 import logging
 import os
 import re
+import sqlite3
 import subprocess
 import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-import requests
-
-from .auth import has_afr_login_state, load_afr_storage_state, refresh_afr_storage_state
-from .config import Settings, _normalize_source
-from .fetchers.afr import AFRFetcher
-from .miniapp_api import run_miniapp_api_server
-from .pipeline import NewsPipeline
-from .senders.router import SenderRouter
-from .senders.telegram import TelegramBotSender
-from .store import SQLiteStore
-from .translators import build_translator
+from .config import Settings, TelegramTarget, _normalize_source
 from .models import PipelineStats
 
+# Everything mode-specific (requests, bs4, FastAPI/uvicorn, playwright) is imported inside the branch that
+# needs it, so a oneshot pusher run from the systemd timer never loads the web stack and --serve-api never
+# loads the fetcher. tests/test_import_time.py guards this.
+if TYPE_CHECKING:
+    import requests
+
+    from .pipeline import NewsPipeline
+    from .senders.fanout import FanoutDelivery
+    from .senders.router import SenderRouter
+    from .senders.telegram import TelegramRateLimiter
+    from .store import SQLiteStore
+
 DEFAULT_LAUNCHD_LABEL = "com.afr.pusher"
 
 
 def _build_router(
     settings: Settings,
     session: requests.Session,
+    target: Optional[TelegramTarget] = None,
+    rate_limiter: Optional[TelegramRateLimiter] = None,
 ) -> SenderRouter:
-    if settings.telegram_bot_token and settings.telegram_chat_id:
+    from .senders.router import SenderRouter
+    from .senders.telegram import TelegramBotSender
+
+    chat_id = target.chat_id if target is not None else settings.telegram_chat_id
+    if settings.telegram_bot_token and chat_id:
         telegram_sender = TelegramBotSender(
             bot_token=settings.telegram_bot_token,
-            chat_id=settings.telegram_chat_id,
+            chat_id=chat_id,
             timeout_sec=settings.request_timeout_sec,
             api_base=settings.telegram_api_base,
-            parse_mode=settings.telegram_parse_mode,
+            parse_mode=(
+                target.parse_mode
+                if target is not None and target.parse_mode is not None
+                else settings.telegram_parse_mode
+            ),
             session=session,
+            rate_limiter=rate_limiter or _build_telegram_rate_limiter(settings),
+            retry_budget_sec=settings.telegram_retry_budget_sec,
         )
         return SenderRouter(primary=telegram_sender, fallback=None, dry_run=settings.dry_run)
 
-    if settings.telegram_bot_token or settings.telegram_chat_id:
-        raise SystemExit("Telegram sender requires both TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID.")
+    if settings.telegram_bot_token or chat_id:
+        raise SystemExit("Telegram sender requires TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID or TELEGRAM_TARGETS.")
 
     return SenderRouter(primary=None, fallback=None, dry_run=settings.dry_run)
 
 
+def _build_telegram_rate_limiter(settings: Settings) -> TelegramRateLimiter:
+    from .senders.telegram import TelegramRateLimiter
+
+    return TelegramRateLimiter(
+        global_rate_per_sec=settings.telegram_global_rate_per_sec,
+        chat_rate_per_sec=settings.telegram_chat_rate_per_sec,
+        group_rate_per_min=settings.telegram_group_rate_per_min,
+    )
+
+
+def _build_fanout(settings: Settings, session: requests.Session) -> FanoutDelivery:
+    from requests.adapters import HTTPAdapter
+
+    from .senders.fanout import FanoutDelivery
+
+    targets = settings.delivery_targets()
+    if not targets:
+        return FanoutDelivery({"": _build_router(settings, session)})
+    # Every target uses the same bot token, so they share one set of Telegram limits.
+    rate_limiter = _build_telegram_rate_limiter(settings)
+    workers = max(1, settings.telegram_fanout_workers)
+    # Keep one pooled connection per concurrent sender instead of reconnecting past urllib3's default of 10.
+    session.mount(settings.telegram_api_base, HTTPAdapter(pool_maxsize=max(10, workers)))
+    return FanoutDelivery(
+        {target.chat_id: _build_router(settings, session, target, rate_limiter) for target in targets},
+        max_workers=workers,
+    )
+
+
 def _parse_daily_at(value: str) -> tuple[int, int]:
     text = value.strip()
     match = re.fullmatch(r"([01]?\d|2[0-3]):([0-5]\d)", text)
@@ -68,6 +113,7 @@ def _merge_stats(left: PipelineStats, right: PipelineStats) -> PipelineStats:
         sent=left.sent + right.sent,
         failed=left.failed + right.failed,
         skipped=left.skipped + right.skipped,
+        partial=left.partial + right.partial,
     )
 
 
@@ -78,6 +124,49 @@ def _run_pipelines(pipelines: list[NewsPipeline]) -> PipelineStats:
     return stats
 
 
+def _log_run_complete(logger: logging.Logger, stats: PipelineStats, store: SQLiteStore) -> None:
+    logger.info(
+        "run complete: fetched=%s sent=%s failed=%s skipped=%s partial=%s",
+        stats.fetched,
+        stats.sent,
+        stats.failed,
+        stats.skipped,
+        stats.partial,
+    )
+    lock_waits = store.lock_wait_stats()
+    if lock_waits.waits:
+        logger.info(
+            "store lock waits: count=%s total=%.3fs max=%.3fs",
+            lock_waits.waits,
+            lock_waits.total_sec,
+            lock_waits.max_sec,
+        )
+
+
+def _export_snapshots(settings: Settings, logger: logging.Logger) -> None:
+    if settings.miniapp_snapshot_dir is None:
+        return
+    from .snapshot import export_snapshots
+
+    try:
+        report = export_snapshots(
+            settings.db_path,
+            settings.miniapp_snapshot_dir,
+            detail_count=settings.miniapp_snapshot_detail_count,
+        )
+    except (OSError, sqlite3.Error):
+        # A failed export leaves the previous files in place; nginx falls back to the API for missing ones.
+        logger.exception("snapshot export failed: dir=%s", settings.miniapp_snapshot_dir)
+        return
+    logger.info(
+        "snapshot export: dir=%s written=%s unchanged=%s removed=%s",
+        settings.miniapp_snapshot_dir,
+        report.files_written,
+        report.files_unchanged,
+        report.files_removed,
+    )
+
+
 def _source_enabled(selected_source: str | None, candidate: str) -> bool:
     return selected_source is None or selected_source == candidate
 
@@ -250,6 +339,11 @@ def _parse_args() -> argparse.Namespace:
         default=DEFAULT_LAUNCHD_LABEL,
         help=f"launchd label (default: {DEFAULT_LAUNCHD_LABEL})",
     )
+    parser.add_argument(
+        "--run-retention",
+        action="store_true",
+        help="Archive expired rows per RETENTION_* settings, vacuum the database, and exit",
+    )
     parser.add_argument(
         "--serve-api",
         action="store_true",
@@ -296,6 +390,8 @@ def main() -> None:
     if args.refresh_afr_session:
         if args.install_launchd or args.uninstall_launchd or args.serve_api:
             raise SystemExit("--refresh-afr-session cannot be combined with launchd or API modes.")
+        from .auth import refresh_afr_storage_state
+
         refresh_afr_storage_state(
             storage_state_path=settings.afr_storage_state_path,
             start_url=settings.afr_login_url,
@@ -304,11 +400,36 @@ def main() -> None:
         )
         return
 
+    if args.run_retention:
+        if args.install_launchd or args.uninstall_launchd or args.serve_api:
+            raise SystemExit("--run-retention cannot be combined with launchd or API modes.")
+        from .retention import RetentionPolicy, run_retention
+        from .store import SQLiteStore
+
+        run_retention(
+            SQLiteStore(settings.db_path),
+            events_policy=RetentionPolicy(
+                max_age_days=settings.retention_events_max_age_days,
+                max_rows=settings.retention_events_max_rows,
+            ),
+            deliveries_policy=RetentionPolicy(
+                max_age_days=settings.retention_deliveries_max_age_days,
+                max_rows=settings.retention_deliveries_max_rows,
+            ),
+            archive_dir=settings.retention_archive_dir,
+            changes_max_age_days=settings.retention_changes_max_age_days,
+            vacuum_step_pages=settings.retention_vacuum_step_pages,
+            logger=logger,
+        )
+        return
+
     if args.serve_api:
         if args.install_launchd or args.uninstall_launchd:
             raise SystemExit("--serve-api cannot be combined with --install-launchd/--uninstall-launchd.")
         if not settings.miniapp_api_key:
             raise SystemExit("MINIAPP_API_KEY is required when --serve-api is enabled.")
+        from .miniapp_api import run_miniapp_api_server
+
         run_miniapp_api_server(
             db_path=settings.db_path,
             host=args.api_host,
@@ -316,6 +437,14 @@ def main() -> None:
             api_key=settings.miniapp_api_key,
             cors_origins=settings.miniapp_api_cors_origins,
             logger=logger,
+            cache_max_age=settings.miniapp_api_cache_max_age_sec,
+            db_workers=settings.miniapp_api_db_workers,
+            db_max_pending=settings.miniapp_api_db_max_pending,
+            compress_min_bytes=settings.miniapp_api_compress_min_bytes,
+            rate_per_key=settings.miniapp_api_rate_per_key,
+            burst_per_key=settings.miniapp_api_burst_per_key,
+            rate_per_ip=settings.miniapp_api_rate_per_ip,
+            burst_per_ip=settings.miniapp_api_burst_per_ip,
         )
         return
 
@@ -346,6 +475,14 @@ def main() -> None:
         logger.info("launchd uninstalled: label=%s plist=%s", args.launchd_label, plist_path)
         return
 
+    import requests
+
+    from .auth import has_afr_login_state, load_afr_storage_state
+    from .fetchers.afr import AFRFetcher
+    from .pipeline import NewsPipeline
+    from .store import SQLiteStore
+    from .translators import build_translator
+
     session = requests.Session()
     session.headers.update({"User-Agent": settings.request_user_agent})
     load_afr_storage_state(session, settings.afr_storage_state_path, logger=logger)
@@ -359,13 +496,16 @@ def main() -> None:
         article_path_prefix=settings.afr_article_path_prefix,
         prefer_content_api=prefer_content_api,
         session=session,
+        store=store,
+        feed_name="main",
+        recheck_interval_sec=settings.afr_recheck_interval_sec,
     )
     translator = build_translator(settings, session=session)
-    router = _build_router(settings, session=session)
+    fanout = _build_fanout(settings, session=session)
 
-    if not settings.dry_run and not (router.primary or router.fallback):
+    if not settings.dry_run and not fanout.has_senders:
         raise SystemExit(
-            "No sender configured. Set TELEGRAM_BOT_TOKEN + TELEGRAM_CHAT_ID, "
+            "No sender configured. Set TELEGRAM_BOT_TOKEN + TELEGRAM_CHAT_ID (or TELEGRAM_TARGETS), "
             "or use --dry-run."
         )
 
@@ -376,7 +516,8 @@ def main() -> None:
                 settings=settings,
                 fetcher=fetcher,
                 translator=translator,
-                sender_router=router,
+                sender_router=None,
+                fanout=fanout,
                 store=store,
                 logger=logger,
                 feed_name="main",
@@ -392,13 +533,17 @@ def main() -> None:
             article_path_prefix=settings.street_talk_article_path_prefix,
             prefer_content_api=prefer_content_api,
             session=session,
+            store=store,
+            feed_name="street-talk",
+            recheck_interval_sec=settings.afr_recheck_interval_sec,
         )
         pipelines.append(
             NewsPipeline(
                 settings=settings,
                 fetcher=street_talk_fetcher,
                 translator=translator,
-                sender_router=router,
+                sender_router=None,
+                fanout=fanout,
                 store=store,
                 logger=logger,
                 feed_name="street-talk",
@@ -428,24 +573,14 @@ def main() -> None:
             time.sleep(wait_seconds)
 
             stats = _run_pipelines(pipelines)
-            logger.info(
-                "run complete: fetched=%s sent=%s failed=%s skipped=%s",
-                stats.fetched,
-                stats.sent,
-                stats.failed,
-                stats.skipped,
-            )
+            _log_run_complete(logger, stats, store)
+            _export_snapshots(settings, logger)
         return
 
     while True:
         stats = _run_pipelines(pipelines)
-        logger.info(
-            "run complete: fetched=%s sent=%s failed=%s skipped=%s",
-            stats.fetched,
-            stats.sent,
-            stats.failed,
-            stats.skipped,
-        )
+        _log_run_complete(logger, stats, store)
+        _export_snapshots(settings, logger)
 
         if not args.loop:
             break
@@ -71,6 +71,20 @@ def _pick(
     return str(value)
 
 
+def _optional_int(value: Optional[str]) -> Optional[int]:
+    text = (value or "").strip()
+    if not text:
+        return None
+    return int(text)
+
+
+def _optional_path(value: Optional[str]) -> Optional[Path]:
+    text = (value or "").strip()
+    if not text:
+        return None
+    return Path(text).expanduser()
+
+
 def _split_csv(value: Optional[str]) -> tuple[str, ...]:
     raw = (value or "").strip()
     if not raw:
@@ -78,6 +92,25 @@ def _split_csv(value: Optional[str]) -> tuple[str, ...]:
     return tuple(part.strip() for part in raw.split(",") if part.strip())
 
 
+@dataclass(frozen=True)
+class TelegramTarget:
+    chat_id: str
+    # None inherits TELEGRAM_PARSE_MODE.
+    parse_mode: Optional[str] = None
+
+
+def _parse_telegram_targets(value: Optional[str]) -> tuple[TelegramTarget, ...]:
+    """Parse TELEGRAM_TARGETS: comma-separated chat ids, each optionally followed by :parse_mode."""
+    targets: dict[str, TelegramTarget] = {}
+    for entry in _split_csv(value):
+        chat_id, _, parse_mode = entry.partition(":")
+        chat_id = chat_id.strip()
+        if not chat_id:
+            raise ValueError(f"TELEGRAM_TARGETS entry has no chat id: {entry!r}")
+        targets.setdefault(chat_id, TelegramTarget(chat_id=chat_id, parse_mode=parse_mode.strip() or None))
+    return tuple(targets.values())
+
+
 def _normalize_source(value: Optional[str]) -> Optional[str]:
     normalized = (value or "").strip().lower()
     if not normalized or normalized == "all":
@@ -125,6 +158,30 @@ class Settings:
     afr_login_url: str = "https://www.afr.com"
     street_talk_homepage_url: str = "https://www.afr.com/street-talk"
     street_talk_article_path_prefix: Optional[str] = "/street-talk"
+    afr_recheck_interval_sec: float = 3600.0
+    retention_events_max_age_days: Optional[int] = None
+    retention_events_max_rows: Optional[int] = None
+    retention_deliveries_max_age_days: Optional[int] = None
+    retention_deliveries_max_rows: Optional[int] = None
+    retention_changes_max_age_days: Optional[int] = None
+    retention_archive_dir: Path = Path("./data/archive")
+    retention_vacuum_step_pages: int = 256
+    miniapp_api_cache_max_age_sec: int = 0
+    miniapp_api_db_workers: int = 4
+    miniapp_api_db_max_pending: int = 64
+    miniapp_api_compress_min_bytes: int = 1024
+    miniapp_api_rate_per_key: float = 0.0
+    miniapp_api_burst_per_key: int = 0
+    miniapp_api_rate_per_ip: float = 0.0
+    miniapp_api_burst_per_ip: int = 0
+    telegram_targets: tuple[TelegramTarget, ...] = ()
+    telegram_fanout_workers: int = 8
+    telegram_global_rate_per_sec: float = 30.0
+    telegram_chat_rate_per_sec: float = 1.0
+    telegram_group_rate_per_min: int = 20
+    telegram_retry_budget_sec: float = 60.0
+    miniapp_snapshot_dir: Optional[Path] = None
+    miniapp_snapshot_detail_count: int = 100
 
     @classmethod
     def from_mapping(cls, mapping: Mapping[str, str]) -> "Settings":
@@ -140,6 +197,7 @@ class Settings:
             ).expanduser(),
             afr_login_url=(_pick(values, "AFR_LOGIN_URL", "https://www.afr.com") or "https://www.afr.com").strip(),
             afr_max_articles=int(_pick(values, "AFR_MAX_ARTICLES", "1") or "1"),
+            afr_recheck_interval_sec=float(_pick(values, "AFR_RECHECK_INTERVAL_SEC", "3600") or "3600"),
             request_timeout_sec=float(_pick(values, "REQUEST_TIMEOUT_SEC", "12") or "12"),
             request_user_agent=(_pick(
                 values,
@@ -174,6 +232,31 @@ class Settings:
                 _pick(values, "AFR_STREET_TALK_HOMEPAGE_URL", "https://www.afr.com/street-talk")
                 or "https://www.afr.com/street-talk"
             ).strip(),
+            retention_events_max_age_days=_optional_int(_pick(values, "RETENTION_EVENTS_MAX_AGE_DAYS")),
+            retention_events_max_rows=_optional_int(_pick(values, "RETENTION_EVENTS_MAX_ROWS")),
+            retention_deliveries_max_age_days=_optional_int(_pick(values, "RETENTION_DELIVERIES_MAX_AGE_DAYS")),
+            retention_deliveries_max_rows=_optional_int(_pick(values, "RETENTION_DELIVERIES_MAX_ROWS")),
+            retention_changes_max_age_days=_optional_int(_pick(values, "RETENTION_CHANGES_MAX_AGE_DAYS")),
+            retention_archive_dir=Path(
+                _pick(values, "RETENTION_ARCHIVE_DIR", "./data/archive") or "./data/archive"
+            ).expanduser(),
+            retention_vacuum_step_pages=int(_pick(values, "RETENTION_VACUUM_STEP_PAGES", "256") or "256"),
+            miniapp_api_cache_max_age_sec=int(_pick(values, "MINIAPP_API_CACHE_MAX_AGE_SEC", "0") or "0"),
+            miniapp_api_db_workers=int(_pick(values, "MINIAPP_API_DB_WORKERS", "4") or "4"),
+            miniapp_api_db_max_pending=int(_pick(values, "MINIAPP_API_DB_MAX_PENDING", "64") or "64"),
+            miniapp_api_compress_min_bytes=int(_pick(values, "MINIAPP_API_COMPRESS_MIN_BYTES", "1024") or "1024"),
+            miniapp_api_rate_per_key=float(_pick(values, "MINIAPP_API_RATE_PER_KEY", "0") or "0"),
+            miniapp_api_burst_per_key=int(_pick(values, "MINIAPP_API_BURST_PER_KEY", "0") or "0"),
+            miniapp_api_rate_per_ip=float(_pick(values, "MINIAPP_API_RATE_PER_IP", "0") or "0"),
+            miniapp_api_burst_per_ip=int(_pick(values, "MINIAPP_API_BURST_PER_IP", "0") or "0"),
+            telegram_targets=_parse_telegram_targets(_pick(values, "TELEGRAM_TARGETS")),
+            telegram_fanout_workers=int(_pick(values, "TELEGRAM_FANOUT_WORKERS", "8") or "8"),
+            telegram_global_rate_per_sec=float(_pick(values, "TELEGRAM_GLOBAL_RATE_PER_SEC", "30") or "30"),
+            telegram_chat_rate_per_sec=float(_pick(values, "TELEGRAM_CHAT_RATE_PER_SEC", "1") or "1"),
+            telegram_group_rate_per_min=int(_pick(values, "TELEGRAM_GROUP_RATE_PER_MIN", "20") or "20"),
+            telegram_retry_budget_sec=float(_pick(values, "TELEGRAM_RETRY_BUDGET_SEC", "60") or "60"),
+            miniapp_snapshot_dir=_optional_path(_pick(values, "MINIAPP_SNAPSHOT_DIR")),
+            miniapp_snapshot_detail_count=int(_pick(values, "MINIAPP_SNAPSHOT_DETAIL_COUNT", "100") or "100"),
             street_talk_article_path_prefix=(
                 _pick(values, "AFR_STREET_TALK_ARTICLE_PATH_PREFIX", "/street-talk") or ""
             ).strip()
@@ -202,6 +285,14 @@ class Settings:
     def from_env(cls) -> "Settings":
         return cls.from_mapping(os.environ)
 
+    def delivery_targets(self) -> tuple[TelegramTarget, ...]:
+        """TELEGRAM_TARGETS when set, otherwise the single TELEGRAM_CHAT_ID."""
+        if self.telegram_targets:
+            return self.telegram_targets
+        if self.telegram_chat_id:
+            return (TelegramTarget(chat_id=self.telegram_chat_id),)
+        return ()
+
     def ensure_dirs(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.afr_storage_state_path.parent.mkdir(parents=True, exist_ok=True)
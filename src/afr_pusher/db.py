@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import quote
+
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHE_SIZE_KIB = 8 * 1024
+DEFAULT_MMAP_SIZE_BYTES = 64 * 1024 * 1024
+# Waits shorter than this are normal statement latency, not lock contention.
+LOCK_WAIT_THRESHOLD_SEC = 0.001
+
+
+@dataclass(frozen=True)
+class LockWaitStats:
+    waits: int = 0
+    total_sec: float = 0.0
+    max_sec: float = 0.0
+
+
+@dataclass(frozen=True)
+class ReadStats:
+    connections: int = 0
+    acquires: int = 0
+    acquire_total_sec: float = 0.0
+    acquire_max_sec: float = 0.0
+    queries: int = 0
+    query_total_sec: float = 0.0
+    query_max_sec: float = 0.0
+
+
+class SQLiteConnectionManager:
+    """
+    Hands out one long-lived connection per thread, tuned for a WAL database.
+    With read_only=True connections are opened with mode=ro and query_only, for API readers that must
+    never write; in WAL mode they read alongside the writer and its checkpoints without blocking either.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        mmap_size_bytes: int = DEFAULT_MMAP_SIZE_BYTES,
+        read_only: bool = False,
+    ):
+        self.db_path = Path(db_path)
+        self.read_only = read_only
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size_bytes = mmap_size_bytes
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._lock_waits = LockWaitStats()
+        self._read_stats = ReadStats()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        if self.read_only:
+            conn = sqlite3.connect(
+                f"file:{quote(str(self.db_path.resolve()))}?mode=ro",
+                uri=True,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.busy_timeout_ms / 1000,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size_bytes)}")
+        return conn
+
+    def enable_wal(self) -> None:
+        # journal_mode is persistent, so setting it once when the schema is created is enough.
+        self.connection().execute("PRAGMA journal_mode = WAL")
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a write transaction, taking the write lock up front and timing how long that took."""
+        conn = self.connection()
+        started = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        self._record_lock_wait(time.perf_counter() - started)
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def reading(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yield this thread's connection for a read, timing how long it took to obtain (opening it on first
+        use) and how long the caller held it. Fetch results fully inside the block so no read snapshot
+        outlives it and holds back WAL checkpoints.
+        """
+        started = time.perf_counter()
+        conn = self.connection()
+        acquired = time.perf_counter()
+        try:
+            yield conn
+        finally:
+            self._record_read(acquired - started, time.perf_counter() - acquired)
+
+    def _record_read(self, acquire_sec: float, query_sec: float) -> None:
+        with self._lock:
+            current = self._read_stats
+            self._read_stats = ReadStats(
+                connections=len(self._connections),
+                acquires=current.acquires + 1,
+                acquire_total_sec=current.acquire_total_sec + acquire_sec,
+                acquire_max_sec=max(current.acquire_max_sec, acquire_sec),
+                queries=current.queries + 1,
+                query_total_sec=current.query_total_sec + query_sec,
+                query_max_sec=max(current.query_max_sec, query_sec),
+            )
+
+    def read_stats(self) -> ReadStats:
+        with self._lock:
+            return self._read_stats
+
+    def _record_lock_wait(self, elapsed: float) -> None:
+        if elapsed < LOCK_WAIT_THRESHOLD_SEC:
+            return
+        with self._lock:
+            current = self._lock_waits
+            self._lock_waits = LockWaitStats(
+                waits=current.waits + 1,
+                total_sec=current.total_sec + elapsed,
+                max_sec=max(current.max_sec, elapsed),
+            )
+
+    def lock_wait_stats(self) -> LockWaitStats:
+        with self._lock:
+            return self._lock_waits
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Optional, TypeVar
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+
+T = TypeVar("T")
+
+
+class DatabaseBusyError(RuntimeError):
+    """Raised when the executor's backlog is full; the API answers 503 instead of queueing more work."""
+
+
+@dataclass(frozen=True)
+class DatabaseExecutorStats:
+    workers: int = 0
+    max_pending: int = 0
+    in_flight: int = 0
+    completed: int = 0
+    rejected: int = 0
+    queue_wait_total_sec: float = 0.0
+    queue_wait_max_sec: float = 0.0
+
+
+class DatabaseExecutor:
+    """
+    Runs blocking SQLite calls for async handlers on a small fixed set of threads.
+    At most workers + max_pending calls are accepted at once; anything beyond that is rejected straight
+    away so a burst cannot pile up unbounded work behind a slow query.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_pending: int = DEFAULT_MAX_PENDING):
+        self.workers = max(1, int(workers))
+        self.max_pending = max(0, int(max_pending))
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="afr-db")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats = DatabaseExecutorStats(workers=self.workers, max_pending=self.max_pending)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_pending:
+                self._bump(rejected=1)
+                raise DatabaseBusyError("database executor backlog is full")
+            self._in_flight += 1
+        queued_at = time.perf_counter()
+        try:
+            future = self._pool.submit(self._timed, queued_at, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # Released when the call really finishes, even if the awaiting request was cancelled meanwhile.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _timed(self, queued_at: float, call: Callable[[], T]) -> T:
+        waited = time.perf_counter() - queued_at
+        with self._lock:
+            current = self._stats
+            self._stats = replace(
+                current,
+                queue_wait_total_sec=current.queue_wait_total_sec + waited,
+                queue_wait_max_sec=max(current.queue_wait_max_sec, waited),
+            )
+        return call()
+
+    def _release(self, _: Optional[Future] = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._bump(completed=1)
+
+    def _bump(self, *, completed: int = 0, rejected: int = 0) -> None:
+        current = self._stats
+        self._stats = replace(current, completed=current.completed + completed, rejected=current.rejected + rejected)
+
+    def stats(self) -> DatabaseExecutorStats:
+        with self._lock:
+            return replace(self._stats, in_flight=self._in_flight)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
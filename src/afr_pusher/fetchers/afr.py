@@ -12,7 +12,8 @@ import requests
 from bs4 import BeautifulSoup
 
 from ..message import serialize_content_blocks
-from ..models import Article, ArticleBlock
+from ..models import Article, ArticleBlock, HomepageEntry, KnownArticle
+from ..store import SQLiteStore
 
 ARTICLE_PATH_RE = re.compile(r"/[^\s\"'#?]*-\d{8}-p[0-9a-z]+/?$", re.IGNORECASE)
 ARTICLE_ID_RE = re.compile(r"-(p[0-9a-z]+)$", re.IGNORECASE)
@@ -24,6 +25,7 @@ ARTICLE_BODY_MIN_LEN = 80
 ARTICLE_CONTENT_MAX_CHARS = 3500
 CONTENT_API_URL_TEMPLATE = "https://api.afr.com/api/content/v0/assets/{article_id}"
 LIST_ITEM_PREFIX_RE = re.compile(r"^(?:[-*•]\s+)(.+)$")
+DEFAULT_RECHECK_INTERVAL_SEC = 3600.0
 
 
 class AFRFetcher:
@@ -35,6 +37,9 @@ class AFRFetcher:
         article_path_prefix: Optional[str] = None,
         prefer_content_api: bool = False,
         session: Optional[requests.Session] = None,
+        store: Optional[SQLiteStore] = None,
+        feed_name: str = "afr",
+        recheck_interval_sec: float = DEFAULT_RECHECK_INTERVAL_SEC,
     ):
         self.homepage_url = homepage_url
         self.timeout_sec = timeout_sec
@@ -43,27 +48,116 @@ class AFRFetcher:
         self.prefer_content_api = prefer_content_api
         self.session = session or requests.Session()
         self.session.headers.update({"User-Agent": self.user_agent})
+        self.store = store
+        self.feed_name = feed_name
+        self.recheck_interval_sec = max(float(recheck_interval_sec), 0.0)
+        self._homepage_snapshot: Optional[dict[str, HomepageEntry]] = None
 
     def fetch_recent(self, limit: int = 1) -> list[Article]:
         homepage_html = self._get_text(self.homepage_url)
         article_urls = self._extract_article_urls(homepage_html)
+        candidate_urls, check_times = self._select_candidate_urls(article_urls)
 
         articles: list[Article] = []
-        scan_limit = max(limit * 4, limit, 20)
-        for url in article_urls[:scan_limit]:
+        # Stop once limit articles are in hand: anything fetched beyond that would be dropped unstored and
+        # look undelivered again next run. The cap only bounds how many failing pages are tried.
+        scan_limit = max(limit * 4, 20)
+        for url in candidate_urls[:scan_limit]:
+            if len(articles) >= limit:
+                break
             try:
                 article = self._fetch_article(url)
             except Exception:
                 continue
+            check_times[url] = datetime.now(timezone.utc).isoformat()
             if article:
                 articles.append(article)
 
+        self._remember_homepage(article_urls, check_times)
+
         articles.sort(
             key=lambda item: (item.updated_at or item.published_at or ""),
             reverse=True,
         )
         return articles[: max(limit, 0)]
 
+    def _load_homepage_snapshot(self) -> dict[str, HomepageEntry]:
+        # Daemon mode keeps the snapshot in memory; one-shot runs read it back from SQLite.
+        if self._homepage_snapshot is None:
+            self._homepage_snapshot = self.store.get_homepage_snapshot(self.feed_name) if self.store else {}
+        return self._homepage_snapshot
+
+    def _select_candidate_urls(self, article_urls: list[str]) -> tuple[list[str], dict[str, str]]:
+        """
+        Order homepage URLs as new ones first, then known ones that are due for a re-check.
+        Known links are throttled by the re-check interval, except those whose stored article is still
+        pending or failed: they are fetched again on every run so the send is retried.
+        Also returns check times inherited from articles already sent under another feed.
+        """
+        previous = self._load_homepage_snapshot()
+        # One bulk lookup tells which links are articles already stored (by any feed) and delivered.
+        stored = (
+            self.store.get_known_articles(self._extract_article_id(url) for url in article_urls)
+            if self.store is not None and article_urls
+            else {}
+        )
+        sent = {article_id: known for article_id, known in stored.items() if known.status == "sent"}
+        if not previous and not sent:
+            return list(article_urls), {}
+
+        known_urls = [url for url in article_urls if url in previous]
+        previous_order = sorted(known_urls, key=lambda url: previous[url].position)
+        previous_rank = {url: rank for rank, url in enumerate(previous_order)}
+
+        now = datetime.now(timezone.utc)
+        new_urls: list[str] = []
+        stored_due_urls: list[str] = []
+        inherited_check_times: dict[str, str] = {}
+        for url in article_urls:
+            if url in previous:
+                continue
+            sent_article = sent.get(self._extract_article_id(url))
+            if sent_article is None:
+                new_urls.append(url)
+                continue
+            inherited_check_times[url] = sent_article.seen_at
+            if self._needs_recheck(HomepageEntry(url, -1, sent_article.seen_at), promoted=False, now=now):
+                stored_due_urls.append(url)
+        due_urls = [
+            url
+            for rank, url in enumerate(known_urls)
+            if self._is_undelivered(url, stored)
+            or self._needs_recheck(previous[url], promoted=rank < previous_rank[url], now=now)
+        ]
+        return new_urls + due_urls + stored_due_urls, inherited_check_times
+
+    def _is_undelivered(self, url: str, stored: dict[str, KnownArticle]) -> bool:
+        # Links with no stored row (or no store at all) have no delivery to retry; check times decide.
+        known = stored.get(self._extract_article_id(url))
+        return known is not None and known.status != "sent"
+
+    def _needs_recheck(self, entry: HomepageEntry, *, promoted: bool, now: datetime) -> bool:
+        # A link that overtook its old neighbours on the homepage usually means the article was updated.
+        if promoted or not entry.last_checked_at:
+            return True
+        try:
+            last_checked = datetime.fromisoformat(entry.last_checked_at)
+        except ValueError:
+            return True
+        return (now - last_checked).total_seconds() >= self.recheck_interval_sec
+
+    def _remember_homepage(self, article_urls: list[str], check_times: dict[str, str]) -> None:
+        previous = self._load_homepage_snapshot()
+        snapshot: dict[str, HomepageEntry] = {}
+        for position, url in enumerate(article_urls):
+            last_checked_at = check_times.get(url)
+            if last_checked_at is None and url in previous:
+                last_checked_at = previous[url].last_checked_at
+            snapshot[url] = HomepageEntry(url=url, position=position, last_checked_at=last_checked_at)
+        self._homepage_snapshot = snapshot
+        if self.store is not None:
+            self.store.save_homepage_snapshot(self.feed_name, article_urls, check_times)
+
     def _get_text(self, url: str) -> str:
         response = self.session.get(url, timeout=self.timeout_sec)
         response.raise_for_status()
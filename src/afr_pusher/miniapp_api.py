@@ -2,158 +2,117 @@ from __future__ import annotations
 
 import argparse
 import logging
+import math
 import os
 import sqlite3
-from contextlib import closing
+from dataclasses import asdict
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from pathlib import Path
 from typing import Optional
-from urllib.parse import unquote
+from urllib.parse import unquote, urlencode
 
-import uvicorn
-from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi import Body, FastAPI, HTTPException, Query, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from .change_feed import DEFAULT_POLL_INTERVAL_SEC, ChangeFeed, format_sse
+from .db_executor import DEFAULT_MAX_PENDING, DEFAULT_WORKERS, DatabaseBusyError, DatabaseExecutor
+from .miniapp_store import (
+    API_VERSION,
+    DEFAULT_LIMIT,
+    DEFAULT_STATS_DAYS,
+    MAX_LIMIT,
+    MAX_SEARCH_OFFSET,
+    MAX_SEARCH_QUERY_CHARS,
+    MAX_STATS_DAYS,
+    VALID_STATUS,
+    DataValidator,
+    MiniAppArticleStore,
+    parse_fields,
+)
+from .ratelimit import TokenBucketLimiter
+from .response_cache import DEFAULT_MAX_ENTRIES, ResponseCache
+from .response_codec import DEFAULT_COMPRESS_MIN_BYTES, FastJSONResponse, compress, negotiate_encoding
 from .store import SQLiteStore
 
-DEFAULT_LIMIT = 20
-MAX_LIMIT = 100
-VALID_STATUS = {"pending", "sent", "failed"}
 DEFAULT_DB_PATH = Path("./data/afr_pusher.db")
 DB_PATH_ENV = "AFR_MINIAPP_DB_PATH"
 API_KEY_ENV = "MINIAPP_API_KEY"
 CORS_ORIGINS_ENV = "MINIAPP_API_CORS_ORIGINS"
 API_KEY_HEADER = "X-API-Key"
+CACHE_MAX_AGE_ENV = "MINIAPP_API_CACHE_MAX_AGE_SEC"
+DB_WORKERS_ENV = "MINIAPP_API_DB_WORKERS"
+DB_MAX_PENDING_ENV = "MINIAPP_API_DB_MAX_PENDING"
+COMPRESS_MIN_BYTES_ENV = "MINIAPP_API_COMPRESS_MIN_BYTES"
+RATE_LIMIT_ENVS = (
+    "MINIAPP_API_RATE_PER_KEY",
+    "MINIAPP_API_BURST_PER_KEY",
+    "MINIAPP_API_RATE_PER_IP",
+    "MINIAPP_API_BURST_PER_IP",
+)
+BUSY_RETRY_AFTER_SEC = 1
+# Responses under these paths depend only on database contents (see MiniAppArticleStore.data_validator).
+DATA_PATH_PREFIXES = ("/api/articles", "/api/search", "/api/stats")
+MAX_BATCH_KEYS = 50
+STREAM_KEEPALIVE_SEC = 15.0
+MAX_LONG_POLL_SEC = 55
+
+
+def _cache_control(max_age: int) -> str:
+    if max_age > 0:
+        # Shared caches (nginx proxy_cache) may reuse the response; Vary keeps API keys apart.
+        return f"public, max-age={max_age}"
+    return "no-cache"
+
+
+def _validator_headers(validator: DataValidator, cache_control: str) -> dict[str, str]:
+    headers = {"ETag": validator.etag, "Cache-Control": cache_control}
+    if validator.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(validator.last_modified, usegmt=True)
+    return headers
+
+
+def _is_not_modified(request: Request, validator: DataValidator) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since; GET uses weak comparison.
+        current = validator.etag.removeprefix("W/")
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return any(tag == "*" or tag.removeprefix("W/") == current for tag in candidates)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and validator.last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return validator.last_modified <= since
+    return False
+
+
+def _busy_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"ok": False, "error": "busy"},
+        headers={"Retry-After": str(BUSY_RETRY_AFTER_SEC)},
+    )
 
 
-class MiniAppArticleStore:
-    def __init__(self, db_path: Path):
-        self.db_path = Path(db_path)
-
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
-    @staticmethod
-    def _row_to_article(row: sqlite3.Row) -> dict[str, object]:
-        return {
-            "record_key": str(row["record_key"]),
-            "article_id": str(row["article_id"]),
-            "url": str(row["url"]),
-            "title": str(row["title"]),
-            "summary": str(row["summary"]),
-            "translated_title": str(row["translated_title"]),
-            "translated_summary": str(row["translated_summary"]),
-            "status": str(row["status"]),
-            "sent_channel": row["sent_channel"],
-            "published_at": row["published_at"],
-            "updated_at": row["updated_at"],
-            "created_at": str(row["created_at"]),
-            "last_attempt_at": row["last_attempt_at"],
-            "sent_at": row["sent_at"],
-            "last_error": row["last_error"],
-        }
-
-    def list_articles(self, *, limit: int = DEFAULT_LIMIT, status: Optional[str] = None) -> list[dict[str, object]]:
-        safe_limit = max(1, min(int(limit), MAX_LIMIT))
-        where_sql = ""
-        params: list[object] = []
-
-        if status:
-            where_sql = "WHERE status = ?"
-            params.append(status)
-
-        params.append(safe_limit)
-
-        query = f"""
-            SELECT
-                record_key,
-                article_id,
-                url,
-                title,
-                summary,
-                translated_title,
-                translated_summary,
-                status,
-                sent_channel,
-                published_at,
-                updated_at,
-                created_at,
-                last_attempt_at,
-                sent_at,
-                last_error
-            FROM article_events
-            {where_sql}
-            ORDER BY COALESCE(sent_at, last_attempt_at, created_at) DESC, created_at DESC
-            LIMIT ?
-        """
-
-        with closing(self._connect()) as conn:
-            rows = conn.execute(query, tuple(params)).fetchall()
-            return [self._row_to_article(row) for row in rows]
-
-    def get_article(self, record_key: str) -> Optional[dict[str, object]]:
-        with closing(self._connect()) as conn:
-            article_row = conn.execute(
-                """
-                SELECT
-                    record_key,
-                    article_id,
-                    url,
-                    title,
-                    summary,
-                    translated_title,
-                    translated_summary,
-                    status,
-                    sent_channel,
-                    published_at,
-                    updated_at,
-                    created_at,
-                    last_attempt_at,
-                    sent_at,
-                    last_error
-                FROM article_events
-                WHERE record_key = ?
-                LIMIT 1
-                """,
-                (record_key,),
-            ).fetchone()
-
-            if article_row is None:
-                return None
-
-            deliveries = conn.execute(
-                """
-                SELECT
-                    channel,
-                    target,
-                    success,
-                    error_message,
-                    response_excerpt,
-                    created_at
-                FROM deliveries
-                WHERE record_key = ?
-                ORDER BY id DESC
-                LIMIT 10
-                """,
-                (record_key,),
-            ).fetchall()
-
-        article = self._row_to_article(article_row)
-        article["deliveries"] = [
-            {
-                "channel": str(row["channel"]),
-                "target": str(row["target"]),
-                "success": bool(row["success"]),
-                "error_message": row["error_message"],
-                "response_excerpt": row["response_excerpt"],
-                "created_at": str(row["created_at"]),
-            }
-            for row in deliveries
-        ]
-        return article
+def _rate_limited_response(retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"ok": False, "error": "rate_limited"},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def _response_cache_key(request: Request) -> str:
+    params = sorted((key, value.strip()) for key, value in request.query_params.multi_items())
+    return request.url.path + "?" + urlencode(params)
 
 
 def build_app(
@@ -162,6 +121,16 @@ def build_app(
     api_key: str,
     cors_origins: tuple[str, ...] = (),
     logger: Optional[logging.Logger] = None,
+    cache_max_age: int = 0,
+    response_cache_entries: int = DEFAULT_MAX_ENTRIES,
+    db_workers: int = DEFAULT_WORKERS,
+    db_max_pending: int = DEFAULT_MAX_PENDING,
+    compress_min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES,
+    stream_poll_interval: float = DEFAULT_POLL_INTERVAL_SEC,
+    rate_per_key: float = 0.0,
+    burst_per_key: int = 0,
+    rate_per_ip: float = 0.0,
+    burst_per_ip: int = 0,
 ) -> FastAPI:
     normalized_api_key = (api_key or "").strip()
     if not normalized_api_key:
@@ -175,28 +144,122 @@ def build_app(
     app_logger = logger or logging.getLogger("afr_pusher.miniapp_api")
     normalized_origins = tuple(origin.strip() for origin in cors_origins if origin.strip())
     store = MiniAppArticleStore(db_file)
+    # Every query runs on these threads, so the store never holds more than db_workers read connections.
+    db = DatabaseExecutor(workers=db_workers, max_pending=db_max_pending)
+    feed = ChangeFeed(
+        store.read_change_feed,
+        store.latest_change_seq,
+        db,
+        poll_interval=stream_poll_interval,
+        logger=app_logger,
+    )
 
     app = FastAPI(
         title="AFR MiniApp API",
         description="JSON API for WeChat Mini Program article browsing",
-        version="0.1.0",
+        version=API_VERSION,
     )
+    cache_control = _cache_control(cache_max_age)
+    response_cache = ResponseCache(max_entries=response_cache_entries)
+    # A rate or burst of 0 disables that limiter.
+    key_limiter = TokenBucketLimiter(rate_per_key, burst_per_key)
+    ip_limiter = TokenBucketLimiter(rate_per_ip, burst_per_ip)
 
     app.add_middleware(
         CORSMiddleware,
         allow_origins=list(normalized_origins),
-        allow_methods=["GET", "OPTIONS"],
-        allow_headers=[API_KEY_HEADER, "Content-Type"],
+        allow_methods=["GET", "POST", "OPTIONS"],
+        allow_headers=[API_KEY_HEADER, "Content-Type", "If-None-Match", "If-Modified-Since"],
+        expose_headers=["ETag", "Last-Modified"],
     )
     if not normalized_origins:
         app_logger.warning("CORS whitelist is empty; browser cross-origin requests will be rejected")
 
+    async def request_validator(request: Request) -> DataValidator:
+        # conditional_get and cached_responses both need it; one executor round trip serves the whole request.
+        validator = getattr(request.state, "data_validator", None)
+        if validator is None:
+            validator = await db.run(store.data_validator)
+            request.state.data_validator = validator
+        return validator
+
+    # Middleware registered later wraps the ones before it, so requests pass
+    # api_key_guard -> compressed_responses -> conditional_get -> cached_responses -> handler.
+    @app.middleware("http")
+    async def cached_responses(request: Request, call_next):
+        cacheable = request.method == "GET" and request.url.path.startswith(DATA_PATH_PREFIXES)
+        if not cacheable or not response_cache.enabled:
+            return await call_next(request)
+        key = _response_cache_key(request)
+        try:
+            version = (await request_validator(request)).etag
+        except DatabaseBusyError:
+            return _busy_response()
+        body = response_cache.get(key, version)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        response_cache.put(key, version, body)
+        return Response(content=body, media_type="application/json")
+
+    @app.middleware("http")
+    async def conditional_get(request: Request, call_next):
+        if request.method not in ("GET", "HEAD") or not request.url.path.startswith(DATA_PATH_PREFIXES):
+            return await call_next(request)
+        # Taken before the handler runs: if a write lands in between, the next request simply gets a 200.
+        try:
+            validator = await request_validator(request)
+        except DatabaseBusyError:
+            return _busy_response()
+        headers = _validator_headers(validator, cache_control)
+        if _is_not_modified(request, validator):
+            response = Response(status_code=304, headers=headers)
+        else:
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            response.headers.update(headers)
+        if cache_max_age > 0:
+            response.headers.add_vary_header(API_KEY_HEADER)
+        return response
+
+    @app.middleware("http")
+    async def compressed_responses(request: Request, call_next):
+        response = await call_next(request)
+        if compress_min_bytes <= 0 or not request.url.path.startswith("/api/") or response.status_code != 200:
+            return response
+        if response.headers.get("Content-Type", "").startswith("text/event-stream"):
+            return response
+        response.headers.add_vary_header("Accept-Encoding")
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None or "Content-Encoding" in response.headers:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+        if len(body) >= compress_min_bytes:
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, status_code=response.status_code, headers=headers)
+
     @app.middleware("http")
     async def api_key_guard(request: Request, call_next):
         if request.url.path.startswith("/api/"):
+            # Per-IP first so requests with a wrong key are throttled too. Behind nginx, run uvicorn with
+            # --proxy-headers so request.client is the mini program user, not the proxy.
+            if ip_limiter.enabled:
+                retry_after = ip_limiter.acquire(request.client.host if request.client else "-")
+                if retry_after:
+                    return _rate_limited_response(retry_after)
             provided = (request.headers.get(API_KEY_HEADER) or "").strip()
             if provided != normalized_api_key:
                 return JSONResponse(status_code=401, content={"ok": False, "error": "unauthorized"})
+            if key_limiter.enabled:
+                retry_after = key_limiter.acquire(provided)
+                if retry_after:
+                    return _rate_limited_response(retry_after)
         return await call_next(request)
 
     @app.exception_handler(HTTPException)
@@ -209,44 +272,170 @@ def build_app(
         message = str(exc.errors()[0].get("msg", "validation_error")) if exc.errors() else "validation_error"
         return JSONResponse(status_code=422, content={"ok": False, "error": message})
 
+    @app.exception_handler(DatabaseBusyError)
+    async def database_busy_handler(_: Request, exc: DatabaseBusyError) -> JSONResponse:
+        return _busy_response()
+
     @app.exception_handler(sqlite3.Error)
     async def sqlite_exception_handler(_: Request, exc: sqlite3.Error) -> JSONResponse:
         app_logger.exception("api sqlite error")
         return JSONResponse(status_code=500, content={"ok": False, "error": "internal_error"})
 
     @app.get("/health")
-    def health() -> dict[str, bool]:
-        return {"ok": True}
+    async def health() -> Response:
+        return FastJSONResponse({"ok": True})
 
     @app.get("/api/articles")
-    def list_articles(
+    async def list_articles(
         limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
         status: Optional[str] = Query(default=None),
-    ) -> dict[str, object]:
+        cursor: Optional[str] = Query(default=None, max_length=512),
+        fields: Optional[str] = Query(default=None, max_length=512),
+    ) -> Response:
         normalized_status = (status or "").strip().lower() or None
         if normalized_status is not None and normalized_status not in VALID_STATUS:
             raise HTTPException(status_code=400, detail="status must be pending, sent, or failed")
+        try:
+            selected_fields = parse_fields(fields)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from None
+
+        try:
+            items, next_cursor = await db.run(
+                store.list_articles_page,
+                limit=limit,
+                status=normalized_status,
+                cursor=(cursor or "").strip() or None,
+                fields=selected_fields,
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid cursor") from None
+        return FastJSONResponse(
+            {
+                "ok": True,
+                "items": items,
+                "count": len(items),
+                "limit": limit,
+                "status": normalized_status,
+                "next_cursor": next_cursor,
+            }
+        )
 
-        items = store.list_articles(limit=limit, status=normalized_status)
-        return {
-            "ok": True,
-            "items": items,
-            "count": len(items),
-            "limit": limit,
-            "status": normalized_status,
-        }
+    @app.get("/api/metrics")
+    async def metrics() -> Response:
+        return FastJSONResponse(
+            {
+                "ok": True,
+                "response_cache": asdict(response_cache.stats()),
+                "db_reads": asdict(store.read_stats()),
+                "db_executor": asdict(db.stats()),
+                "stream_subscribers": feed.subscribers,
+                "rate_limit": {"per_key": asdict(key_limiter.stats()), "per_ip": asdict(ip_limiter.stats())},
+            }
+        )
+
+    @app.get("/api/search")
+    async def search_articles(
+        q: str = Query(..., min_length=1, max_length=MAX_SEARCH_QUERY_CHARS),
+        limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+        offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET),
+    ) -> Response:
+        query = q.strip()
+        if not query:
+            raise HTTPException(status_code=400, detail="q required")
+
+        items, has_more = await db.run(store.search_articles, query, limit=limit, offset=offset)
+        return FastJSONResponse(
+            {
+                "ok": True,
+                "items": items,
+                "count": len(items),
+                "limit": limit,
+                "offset": offset,
+                "next_offset": offset + limit if has_more and offset + limit <= MAX_SEARCH_OFFSET else None,
+            }
+        )
+
+    @app.post("/api/articles/batch")
+    async def get_articles_batch(
+        record_keys: list[str] = Body(..., embed=True, min_length=1, max_length=MAX_BATCH_KEYS),
+    ) -> Response:
+        keys = [key.strip() for key in record_keys if key.strip()]
+        if not keys:
+            raise HTTPException(status_code=400, detail="record_keys required")
+
+        items = await db.run(store.get_articles, keys)
+        found = {str(item["record_key"]) for item in items}
+        return FastJSONResponse(
+            {
+                "ok": True,
+                "items": items,
+                "count": len(items),
+                "missing": [key for key in dict.fromkeys(keys) if key not in found],
+            }
+        )
+
+    @app.get("/api/stats")
+    async def stats(days: int = Query(DEFAULT_STATS_DAYS, ge=1, le=MAX_STATS_DAYS)) -> Response:
+        return FastJSONResponse({"ok": True, **(await db.run(store.get_stats, days))})
+
+    @app.get("/api/changes")
+    async def long_poll_changes(
+        since: Optional[int] = Query(default=None, ge=0),
+        timeout: int = Query(25, ge=0, le=MAX_LONG_POLL_SEC),
+    ) -> Response:
+        after_seq = since if since is not None else await feed.latest_seq()
+        items = await feed.wait_for_events(after_seq, timeout)
+        return FastJSONResponse(
+            {
+                "ok": True,
+                "items": items,
+                "count": len(items),
+                "next_since": int(items[-1]["seq"]) if items else after_seq,
+            }
+        )
+
+    @app.get("/api/stream")
+    async def stream_changes(
+        request: Request,
+        since: Optional[int] = Query(default=None, ge=0),
+    ) -> Response:
+        last_event_id = (request.headers.get("Last-Event-ID") or "").strip()
+        after_seq = int(last_event_id) if last_event_id.isdigit() else since
+        if after_seq is None:
+            after_seq = await feed.latest_seq()
+
+        async def events(after_seq: int):
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    batch = await feed.wait_for_events(after_seq, STREAM_KEEPALIVE_SEC)
+                except DatabaseBusyError:
+                    batch = []
+                if not batch:
+                    yield ": keepalive\n\n"
+                    continue
+                for event in batch:
+                    yield format_sse(event)
+                after_seq = int(batch[-1]["seq"])
+
+        return StreamingResponse(
+            events(after_seq),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
 
     @app.get("/api/articles/{record_key:path}")
-    def get_article(record_key: str) -> dict[str, object]:
+    async def get_article(record_key: str) -> Response:
         normalized_key = unquote(record_key).strip()
         if not normalized_key:
             raise HTTPException(status_code=400, detail="record_key required")
 
-        item = store.get_article(normalized_key)
+        item = await db.run(store.get_article, normalized_key)
         if item is None:
             raise HTTPException(status_code=404, detail="not_found")
 
-        return {"ok": True, "item": item}
+        return FastJSONResponse({"ok": True, "item": item})
 
     return app
 
@@ -282,6 +471,47 @@ def _resolve_cors_origins(cors_origins: Optional[str] = None) -> tuple[str, ...]
     return _parse_cors_origins(os.getenv(CORS_ORIGINS_ENV, ""))
 
 
+def _resolve_cache_max_age(cache_max_age: Optional[int] = None) -> int:
+    if cache_max_age is not None:
+        return max(0, int(cache_max_age))
+    env_value = (os.getenv(CACHE_MAX_AGE_ENV) or "").strip()
+    return max(0, int(env_value)) if env_value else 0
+
+
+def _resolve_db_limits(
+    db_workers: Optional[int] = None,
+    db_max_pending: Optional[int] = None,
+) -> tuple[int, int]:
+    workers = db_workers if db_workers is not None else int(os.getenv(DB_WORKERS_ENV) or DEFAULT_WORKERS)
+    max_pending = (
+        db_max_pending if db_max_pending is not None else int(os.getenv(DB_MAX_PENDING_ENV) or DEFAULT_MAX_PENDING)
+    )
+    return max(1, int(workers)), max(0, int(max_pending))
+
+
+def _resolve_compress_min_bytes(compress_min_bytes: Optional[int] = None) -> int:
+    if compress_min_bytes is not None:
+        return int(compress_min_bytes)
+    env_value = (os.getenv(COMPRESS_MIN_BYTES_ENV) or "").strip()
+    return int(env_value) if env_value else DEFAULT_COMPRESS_MIN_BYTES
+
+
+def _resolve_rate_limits(
+    rate_per_key: Optional[float] = None,
+    burst_per_key: Optional[int] = None,
+    rate_per_ip: Optional[float] = None,
+    burst_per_ip: Optional[int] = None,
+) -> dict[str, object]:
+    explicit = (rate_per_key, burst_per_key, rate_per_ip, burst_per_ip)
+    names = ("rate_per_key", "burst_per_key", "rate_per_ip", "burst_per_ip")
+    resolved: dict[str, object] = {}
+    for name, env_name, value in zip(names, RATE_LIMIT_ENVS, explicit):
+        if value is None:
+            value = (os.getenv(env_name) or "").strip() or 0
+        resolved[name] = float(value) if name.startswith("rate") else int(value)
+    return resolved
+
+
 def create_app() -> FastAPI:
     """
     Uvicorn factory entrypoint.
@@ -290,11 +520,17 @@ def create_app() -> FastAPI:
       MINIAPP_API_KEY=your_secret \
       python3 -m uvicorn afr_pusher.miniapp_api:create_app --factory --host 127.0.0.1 --port 8000 --reload
     """
+    db_workers, db_max_pending = _resolve_db_limits()
     return build_app(
         db_path=_resolve_db_path(),
         api_key=_resolve_api_key(),
         cors_origins=_resolve_cors_origins(),
         logger=logging.getLogger("afr_pusher.miniapp_api"),
+        cache_max_age=_resolve_cache_max_age(),
+        db_workers=db_workers,
+        db_max_pending=db_max_pending,
+        compress_min_bytes=_resolve_compress_min_bytes(),
+        **_resolve_rate_limits(),
     )
 
 
@@ -306,20 +542,36 @@ def run_miniapp_api_server(
     host: str = "127.0.0.1",
     port: int = 8000,
     logger: Optional[logging.Logger] = None,
+    cache_max_age: Optional[int] = None,
+    db_workers: Optional[int] = None,
+    db_max_pending: Optional[int] = None,
+    compress_min_bytes: Optional[int] = None,
+    rate_per_key: Optional[float] = None,
+    burst_per_key: Optional[int] = None,
+    rate_per_ip: Optional[float] = None,
+    burst_per_ip: Optional[int] = None,
 ) -> None:
     if port < 1 or port > 65535:
         raise ValueError("port must be in [1, 65535]")
 
     db_file = _resolve_db_path(db_path)
     app_logger = logger or logging.getLogger("afr_pusher.miniapp_api")
+    workers, max_pending = _resolve_db_limits(db_workers, db_max_pending)
     app = build_app(
         db_path=db_file,
         api_key=_resolve_api_key(api_key),
         cors_origins=cors_origins,
         logger=app_logger,
+        cache_max_age=_resolve_cache_max_age(cache_max_age),
+        db_workers=workers,
+        db_max_pending=max_pending,
+        compress_min_bytes=_resolve_compress_min_bytes(compress_min_bytes),
+        **_resolve_rate_limits(rate_per_key, burst_per_key, rate_per_ip, burst_per_ip),
     )
     app_logger.info("miniapp api started: http://%s:%s (db=%s)", host, port, db_file)
 
+    import uvicorn
+
     uvicorn.run(app, host=host, port=port, log_level="info")
 
 
@@ -0,0 +1,532 @@
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .db import ReadStats, SQLiteConnectionManager
+from .store import read_content_blocks
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+VALID_STATUS = {"pending", "sent", "failed"}
+API_VERSION = "0.1.0"
+MAX_SEARCH_QUERY_CHARS = 200
+MAX_SEARCH_OFFSET = 1000
+# The trigram tokenizer cannot match terms shorter than this; such queries fall back to LIKE.
+TRIGRAM_MIN_CHARS = 3
+SNIPPET_OPEN = "【"
+SNIPPET_CLOSE = "】"
+SNIPPET_CHARS = 64
+DEFAULT_STATS_DAYS = 30
+MAX_STATS_DAYS = 366
+TOP_FAILURE_REASONS = 20
+DELIVERY_HISTORY_LIMIT = 10
+ARTICLE_FIELDS = (
+    "record_key",
+    "article_id",
+    "url",
+    "title",
+    "summary",
+    "translated_title",
+    "translated_summary",
+    "status",
+    "sent_channel",
+    "published_at",
+    "updated_at",
+    "created_at",
+    "last_attempt_at",
+    "sent_at",
+    "last_error",
+)
+# Default shape of /api/articles pages; every column here is stored in the list indexes (migration 7).
+COMPACT_LIST_FIELDS = (
+    "record_key",
+    "title",
+    "translated_title",
+    "status",
+    "published_at",
+    "created_at",
+    "last_attempt_at",
+    "sent_at",
+)
+_NULLABLE_FIELDS = {"sent_channel", "published_at", "updated_at", "last_attempt_at", "sent_at", "last_error"}
+
+
+# Both tables are AUTOINCREMENT, so their sqlite_sequence entries only grow with every article change
+# (via the change-log triggers) and every delivery attempt.
+DATA_VALIDATOR_SQL = """
+SELECT
+    COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'changes'), 0) AS changes_seq,
+    COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'delivery_batches'), 0) AS batches_seq,
+    (SELECT changed_ts FROM changes ORDER BY seq DESC LIMIT 1) AS changed_ts,
+    (SELECT created_at FROM delivery_batches ORDER BY id DESC LIMIT 1) AS batch_created_at
+"""
+
+
+@dataclass(frozen=True)
+class DataValidator:
+    etag: str
+    last_modified: Optional[datetime]
+
+
+class MiniAppArticleStore:
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        # Long-lived read-only connections, one per worker thread; the pusher's SQLiteStore is the only writer.
+        self._db = SQLiteConnectionManager(self.db_path, read_only=True)
+        self._validators = threading.local()
+        self._has_search_index: Optional[bool] = None
+
+    def data_validator(self) -> DataValidator:
+        """
+        Return a validator that changes whenever any API-visible data changes.
+        PRAGMA data_version only moves when another connection commits, so between pusher writes this
+        answers from memory without reading any table.
+        """
+        with self._db.reading() as conn:
+            data_version = int(conn.execute("PRAGMA data_version").fetchone()[0])
+            cached = getattr(self._validators, "entry", None)
+            if cached is not None and cached[0] == data_version:
+                return cached[1]
+            row = conn.execute(DATA_VALIDATOR_SQL).fetchone()
+
+        stamps = [datetime.fromtimestamp(int(row["changed_ts"]) / 1000, tz=timezone.utc)] if row["changed_ts"] else []
+        if row["batch_created_at"]:
+            stamps.append(datetime.fromisoformat(str(row["batch_created_at"])))
+        validator = DataValidator(
+            etag=f'W/"{API_VERSION}-{int(row["changes_seq"])}-{int(row["batches_seq"])}"',
+            last_modified=max(stamps).replace(microsecond=0) if stamps else None,
+        )
+        self._validators.entry = (data_version, validator)
+        return validator
+
+    def get_stats(self, days: int = DEFAULT_STATS_DAYS) -> dict[str, object]:
+        """
+        Per-day article and delivery counts for the last `days` UTC days, read from the rollup tables
+        (migration 8), so the cost depends on the window and not on how much history is stored.
+        """
+        safe_days = max(1, min(int(days), MAX_STATS_DAYS))
+        since_day = (datetime.now(timezone.utc).date() - timedelta(days=safe_days - 1)).isoformat()
+        with self._db.reading() as conn:
+            article_rows = conn.execute(
+                "SELECT day, created, sent, failed FROM article_daily_stats WHERE day >= ? ORDER BY day",
+                (since_day,),
+            ).fetchall()
+            delivery_rows = conn.execute(
+                """
+                SELECT day, channel, attempts, successes
+                FROM delivery_daily_stats
+                WHERE day >= ?
+                ORDER BY day, channel
+                """,
+                (since_day,),
+            ).fetchall()
+            reason_rows = conn.execute(
+                """
+                SELECT channel, reason, SUM(failures) AS failures
+                FROM delivery_failure_reasons
+                WHERE day >= ?
+                GROUP BY channel, reason
+                ORDER BY failures DESC, channel, reason
+                LIMIT ?
+                """,
+                (since_day, TOP_FAILURE_REASONS),
+            ).fetchall()
+
+        channels: dict[str, list[int]] = {}
+        for row in delivery_rows:
+            totals = channels.setdefault(str(row["channel"]), [0, 0])
+            totals[0] += int(row["attempts"])
+            totals[1] += int(row["successes"])
+        return {
+            "days": safe_days,
+            "since": since_day,
+            "articles_per_day": [
+                {
+                    "day": str(row["day"]),
+                    "created": int(row["created"]),
+                    "sent": int(row["sent"]),
+                    "failed": int(row["failed"]),
+                }
+                for row in article_rows
+            ],
+            "deliveries_per_day": [
+                {
+                    "day": str(row["day"]),
+                    "channel": str(row["channel"]),
+                    "attempts": int(row["attempts"]),
+                    "successes": int(row["successes"]),
+                }
+                for row in delivery_rows
+            ],
+            "success_rate_by_channel": [
+                {
+                    "channel": channel,
+                    "attempts": attempts,
+                    "successes": successes,
+                    "success_rate": round(successes / attempts, 4) if attempts else None,
+                }
+                for channel, (attempts, successes) in sorted(channels.items())
+            ],
+            "failure_reasons": [
+                {"channel": str(row["channel"]), "reason": str(row["reason"]), "failures": int(row["failures"])}
+                for row in reason_rows
+            ],
+        }
+
+    def latest_change_seq(self) -> int:
+        with self._db.reading() as conn:
+            row = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()
+        return int(row[0])
+
+    def read_change_feed(self, after_seq: int, limit: int) -> list[dict[str, object]]:
+        """Change-log entries after after_seq, oldest first, each with the article's current compact fields."""
+        columns = ", ".join(f"e.{field}" for field in COMPACT_LIST_FIELDS)
+        with self._db.reading() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT c.seq, c.op, c.record_key AS change_key, c.changed_ts, {columns}
+                FROM changes AS c
+                LEFT JOIN article_events AS e ON e.record_key = c.record_key
+                WHERE c.seq > ?
+                ORDER BY c.seq
+                LIMIT ?
+                """,
+                (int(after_seq), max(1, int(limit))),
+            ).fetchall()
+        return [
+            {
+                "seq": int(row["seq"]),
+                "op": str(row["op"]),
+                "record_key": str(row["change_key"]),
+                "changed_ts": int(row["changed_ts"]),
+                "article": self._row_to_article(row, COMPACT_LIST_FIELDS) if row["record_key"] is not None else None,
+            }
+            for row in rows
+        ]
+
+    def read_stats(self) -> ReadStats:
+        return self._db.read_stats()
+
+    def close(self) -> None:
+        self._db.close()
+
+    @staticmethod
+    def _row_to_article(row: sqlite3.Row, fields: tuple[str, ...] = ARTICLE_FIELDS) -> dict[str, object]:
+        return {field: row[field] if field in _NULLABLE_FIELDS else str(row[field]) for field in fields}
+
+    def list_articles(
+        self,
+        *,
+        limit: int = DEFAULT_LIMIT,
+        status: Optional[str] = None,
+        fields: tuple[str, ...] = ARTICLE_FIELDS,
+    ) -> list[dict[str, object]]:
+        items, _ = self.list_articles_page(limit=limit, status=status, fields=fields)
+        return items
+
+    def list_articles_page(
+        self,
+        *,
+        limit: int = DEFAULT_LIMIT,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: tuple[str, ...] = ARTICLE_FIELDS,
+    ) -> tuple[list[dict[str, object]], Optional[str]]:
+        """
+        Return one page, newest first, and the cursor for the next page (None on the last page).
+        Pages resume with an index seek past the previous page's last (sort_ts, record_key), so deep pages
+        cost the same as the first one. Only the requested fields are selected; a subset of
+        COMPACT_LIST_FIELDS is answered from the covering list index alone.
+        Raises ValueError for a malformed cursor.
+        """
+        safe_limit = max(1, min(int(limit), MAX_LIMIT))
+        conditions: list[str] = []
+        params: list[object] = []
+
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if cursor:
+            sort_ts, record_key = decode_cursor(cursor)
+            conditions.append("(sort_ts, record_key) < (?, ?)")
+            params.extend([sort_ts, record_key])
+
+        where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # One extra row tells whether another page exists.
+        params.append(safe_limit + 1)
+
+        columns = ", ".join(dict.fromkeys((*fields, "record_key", "sort_ts")))
+        query = f"""
+            SELECT {columns}
+            FROM article_events
+            {where_sql}
+            ORDER BY sort_ts DESC, record_key DESC
+            LIMIT ?
+        """
+
+        with self._db.reading() as conn:
+            rows = conn.execute(query, tuple(params)).fetchall()
+        next_cursor = None
+        if len(rows) > safe_limit:
+            rows = rows[:safe_limit]
+            next_cursor = encode_cursor(int(rows[-1]["sort_ts"]), str(rows[-1]["record_key"]))
+        return [self._row_to_article(row, fields) for row in rows], next_cursor
+
+    def search_articles(
+        self,
+        query: str,
+        *,
+        limit: int = DEFAULT_LIMIT,
+        offset: int = 0,
+    ) -> tuple[list[dict[str, object]], bool]:
+        """
+        Rank articles matching every term of the query and report whether more results follow.
+        Queries with a term shorter than three characters, or databases without the trigram index, use a LIKE
+        scan ordered by recency instead.
+        """
+        terms = _search_terms(query)
+        if not terms:
+            return [], False
+        safe_limit = max(1, min(int(limit), MAX_LIMIT))
+        safe_offset = max(0, min(int(offset), MAX_SEARCH_OFFSET))
+        # One extra row tells whether another page exists without counting every match.
+        if all(len(term) >= TRIGRAM_MIN_CHARS for term in terms) and self._search_index_ready():
+            items = self._search_fts(terms, safe_limit + 1, safe_offset)
+        else:
+            items = self._search_like(terms, safe_limit + 1, safe_offset)
+        return items[:safe_limit], len(items) > safe_limit
+
+    def _search_index_ready(self) -> bool:
+        # The index is missing when the pusher's SQLite library had no trigram tokenizer at migration time.
+        if self._has_search_index is None:
+            with self._db.reading() as conn:
+                row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'article_search'").fetchone()
+            self._has_search_index = row is not None
+        return self._has_search_index
+
+    def _search_fts(self, terms: list[str], limit: int, offset: int) -> list[dict[str, object]]:
+        match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        with self._db.reading() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT
+                    e.record_key,
+                    e.article_id,
+                    e.url,
+                    e.title,
+                    e.translated_title,
+                    e.status,
+                    e.published_at,
+                    e.created_at,
+                    e.sent_at,
+                    snippet(article_search, -1, '{SNIPPET_OPEN}', '{SNIPPET_CLOSE}', '…', 24) AS snippet
+                FROM article_search
+                JOIN article_events AS e ON e.rowid = article_search.rowid
+                WHERE article_search MATCH ?
+                ORDER BY bm25(article_search, 5.0, 1.0, 5.0, 1.0)
+                LIMIT ? OFFSET ?
+                """,
+                (match, limit, offset),
+            ).fetchall()
+        return [self._row_to_search_hit(row, str(row["snippet"])) for row in rows]
+
+    def _search_like(self, terms: list[str], limit: int, offset: int) -> list[dict[str, object]]:
+        columns = ("title", "summary", "translated_title", "translated_summary")
+        clauses: list[str] = []
+        params: list[object] = []
+        for term in terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.append("(" + " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in columns) + ")")
+            params.extend([pattern] * len(columns))
+        params.extend([limit, offset])
+        with self._db.reading() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT
+                    record_key,
+                    article_id,
+                    url,
+                    title,
+                    translated_title,
+                    status,
+                    published_at,
+                    created_at,
+                    sent_at,
+                    summary,
+                    translated_summary
+                FROM article_events
+                WHERE {" AND ".join(clauses)}
+                ORDER BY sort_ts DESC, record_key DESC
+                LIMIT ? OFFSET ?
+                """,
+                tuple(params),
+            ).fetchall()
+        return [self._row_to_search_hit(row, _like_snippet(row, terms[0])) for row in rows]
+
+    @staticmethod
+    def _row_to_search_hit(row: sqlite3.Row, snippet: str) -> dict[str, object]:
+        return {
+            "record_key": str(row["record_key"]),
+            "article_id": str(row["article_id"]),
+            "url": str(row["url"]),
+            "title": str(row["title"]),
+            "translated_title": str(row["translated_title"]),
+            "status": str(row["status"]),
+            "published_at": row["published_at"],
+            "created_at": str(row["created_at"]),
+            "sent_at": row["sent_at"],
+            "snippet": snippet,
+        }
+
+    def get_article(self, record_key: str) -> Optional[dict[str, object]]:
+        articles = self.get_articles([record_key])
+        return articles[0] if articles else None
+
+    def get_articles(self, record_keys: Sequence[str]) -> list[dict[str, object]]:
+        """
+        Return full articles with their blocks and recent deliveries, in request order, skipping unknown keys.
+        Each table is read once for the whole batch: one IN query for the articles, one windowed query for
+        the last DELIVERY_HISTORY_LIMIT deliveries of each, and one content_blocks lookup.
+        """
+        keys = list(dict.fromkeys(record_keys))
+        if not keys:
+            return []
+        placeholders = ", ".join("?" for _ in keys)
+        with self._db.reading() as conn:
+            article_rows = conn.execute(
+                f"""
+                SELECT
+                    record_key,
+                    article_id,
+                    url,
+                    title,
+                    summary,
+                    translated_title,
+                    translated_summary,
+                    status,
+                    sent_channel,
+                    published_at,
+                    updated_at,
+                    created_at,
+                    last_attempt_at,
+                    sent_at,
+                    last_error,
+                    source_blocks,
+                    translated_blocks
+                FROM article_events
+                WHERE record_key IN ({placeholders})
+                """,
+                keys,
+            ).fetchall()
+            if not article_rows:
+                return []
+
+            found = [str(row["record_key"]) for row in article_rows]
+            delivery_rows = conn.execute(
+                f"""
+                SELECT record_key, channel, target, success, error_message, response_excerpt, created_at
+                FROM (
+                    SELECT
+                        i.record_key,
+                        b.channel,
+                        b.target,
+                        b.success,
+                        b.error_message,
+                        b.response_excerpt,
+                        b.created_at,
+                        ROW_NUMBER() OVER (PARTITION BY i.record_key ORDER BY i.batch_id DESC) AS recent_rank
+                    FROM delivery_batch_items AS i
+                    JOIN delivery_batches AS b ON b.id = i.batch_id
+                    WHERE i.record_key IN ({", ".join("?" for _ in found)})
+                )
+                WHERE recent_rank <= ?
+                ORDER BY record_key, recent_rank
+                """,
+                (*found, DELIVERY_HISTORY_LIMIT),
+            ).fetchall()
+
+            blocks = read_content_blocks(
+                conn,
+                [refs for row in article_rows for refs in (row["source_blocks"], row["translated_blocks"])],
+            )
+
+        deliveries: dict[str, list[dict[str, object]]] = {}
+        for row in delivery_rows:
+            deliveries.setdefault(str(row["record_key"]), []).append(
+                {
+                    "channel": str(row["channel"]),
+                    "target": str(row["target"]),
+                    "success": bool(row["success"]),
+                    "error_message": row["error_message"],
+                    "response_excerpt": row["response_excerpt"],
+                    "created_at": str(row["created_at"]),
+                }
+            )
+        by_key: dict[str, dict[str, object]] = {}
+        for idx, row in enumerate(article_rows):
+            article = self._row_to_article(row)
+            source_blocks, translated_blocks = blocks[2 * idx], blocks[2 * idx + 1]
+            article["source_blocks"] = [{"kind": block.kind, "text": block.text} for block in source_blocks]
+            article["translated_blocks"] = [{"kind": block.kind, "text": block.text} for block in translated_blocks]
+            article["deliveries"] = deliveries.get(str(row["record_key"]), [])
+            by_key[str(row["record_key"])] = article
+        return [by_key[key] for key in keys if key in by_key]
+
+
+def parse_fields(raw: Optional[str]) -> tuple[str, ...]:
+    """Turn a comma-separated fields= value into known article fields; blank means the compact list shape."""
+    requested = [part.strip() for part in (raw or "").split(",") if part.strip()]
+    if not requested:
+        return COMPACT_LIST_FIELDS
+    unknown = [field for field in requested if field not in ARTICLE_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    # record_key identifies every item; keep the declared order so equal projections serialize alike.
+    return tuple(field for field in ARTICLE_FIELDS if field == "record_key" or field in requested)
+
+
+def encode_cursor(sort_ts: int, record_key: str) -> str:
+    raw = json.dumps([sort_ts, record_key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_ts, record_key = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(sort_ts, int) or not isinstance(record_key, str):
+        raise ValueError("invalid cursor")
+    return sort_ts, record_key
+
+
+def _search_terms(query: str) -> list[str]:
+    return [term for term in (query or "")[:MAX_SEARCH_QUERY_CHARS].split() if term]
+
+
+def _like_snippet(row: sqlite3.Row, term: str) -> str:
+    for column in ("translated_summary", "summary", "translated_title", "title"):
+        text = str(row[column] or "")
+        index = text.lower().find(term.lower())
+        if index < 0:
+            continue
+        start = max(0, index - SNIPPET_CHARS // 2)
+        end = min(len(text), index + len(term) + SNIPPET_CHARS // 2)
+        return (
+            ("…" if start > 0 else "")
+            + text[start:index]
+            + SNIPPET_OPEN
+            + text[index : index + len(term)]
+            + SNIPPET_CLOSE
+            + text[index + len(term) : end]
+            + ("…" if end < len(text) else "")
+        )
+    return ""
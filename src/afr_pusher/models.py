@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def epoch_ms(iso_timestamp: str) -> int:
+    parsed = datetime.fromisoformat(iso_timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // timedelta(milliseconds=1)
+
+
 @dataclass(frozen=True)
 class ArticleBlock:
     kind: str
@@ -28,6 +37,30 @@ class Article:
     content_blocks: tuple[ArticleBlock, ...] = ()
 
 
+@dataclass(frozen=True)
+class HomepageEntry:
+    url: str
+    position: int
+    last_checked_at: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class KnownArticle:
+    article_id: str
+    record_key: str
+    status: str
+    seen_at: str
+
+
+@dataclass(frozen=True)
+class ChangeEntry:
+    seq: int
+    record_key: str
+    op: str
+    status: Optional[str]
+    changed_ts: int
+
+
 @dataclass(frozen=True)
 class DeliveryResult:
     channel: str
@@ -42,3 +75,5 @@ class PipelineStats:
     sent: int = 0
     failed: int = 0
     skipped: int = 0
+    # Articles that reached some delivery targets but not all; they stay unsent and are retried next run.
+    partial: int = 0
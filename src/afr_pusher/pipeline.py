@@ -13,8 +13,9 @@ from .message import (
 )
 from .models import Article, ArticleBlock, PipelineStats
 from .preview import SummaryCardRenderer
+from .senders.fanout import FanoutDelivery, TargetDelivery
 from .senders.router import SenderRouter
-from .store import SQLiteStore
+from .store import SQLiteStore, StoreUnitOfWork
 from .translators.base import Translator
 
 
@@ -24,17 +25,23 @@ class NewsPipeline:
         settings: Settings,
         fetcher: AFRFetcher,
         translator: Translator,
-        sender_router: SenderRouter,
+        sender_router: Optional[SenderRouter],
         store: SQLiteStore,
         logger: Optional[logging.Logger] = None,
         preview_renderer: Optional[SummaryCardRenderer] = None,
         feed_name: str = "afr",
         batch_message_title: str = "AFR 要闻速览",
+        fanout: Optional[FanoutDelivery] = None,
     ):
         self.settings = settings
         self.fetcher = fetcher
         self.translator = translator
-        self.sender_router = sender_router
+        # A bare router delivers to the single TELEGRAM_CHAT_ID; the CLI passes a fan-out over all targets.
+        if fanout is None:
+            if sender_router is None:
+                raise ValueError("NewsPipeline needs a sender_router or a fanout")
+            fanout = FanoutDelivery({settings.telegram_chat_id or "": sender_router})
+        self.fanout = fanout
         self.store = store
         self.logger = logger or logging.getLogger(__name__)
         self.feed_name = feed_name
@@ -52,7 +59,6 @@ class NewsPipeline:
 
     def run_once(self) -> PipelineStats:
         stats = PipelineStats()
-        delivery_target = self.settings.telegram_chat_id or ""
         articles = self.fetcher.fetch_recent(limit=self.settings.afr_max_articles)
         stats = PipelineStats(
             fetched=len(articles),
@@ -63,94 +69,211 @@ class NewsPipeline:
         include_article_content = self.settings.afr_max_articles == 1
         ready_for_delivery: list[tuple[Article, str, str, tuple[ArticleBlock, ...]]] = []
 
+        sent_keys = self.store.is_sent_many(article.record_key for article in articles)
+        pending_articles: list[Article] = []
         for article in articles:
-            if self.store.is_sent(article.record_key):
+            if article.record_key in sent_keys:
                 stats = PipelineStats(
                     fetched=stats.fetched,
                     sent=stats.sent,
                     failed=stats.failed,
                     skipped=stats.skipped + 1,
+                    partial=stats.partial,
                 )
                 self.logger.info("skipping already-sent article: record_key=%s url=%s", article.record_key, article.url)
                 continue
+            pending_articles.append(article)
 
+        with self.store.unit_of_work() as work:
             # Persist raw content first so a failed translation/delivery can be retried later.
-            self.store.upsert_event(article, article.title, article.summary)
+            for article in pending_articles:
+                work.upsert_event(article, article.title, article.summary)
+            work.flush()
 
-            try:
-                cached_translation = (
-                    self.store.get_sent_translation_by_title(article.title) if include_article_content else None
+            for article in pending_articles:
+                try:
+                    translated_title, translated_summary, translated_blocks = self._translate_article(
+                        article,
+                        work,
+                        include_article_content=include_article_content,
+                    )
+                    work.upsert_event(article, translated_title, translated_summary, translated_blocks)
+                    ready_for_delivery.append((article, translated_title, translated_summary, translated_blocks))
+
+                except Exception as exc:
+                    work.mark_failed(article.record_key, str(exc))
+                    stats = PipelineStats(
+                        fetched=stats.fetched,
+                        sent=stats.sent,
+                        failed=stats.failed + 1,
+                        skipped=stats.skipped,
+                        partial=stats.partial,
+                    )
+                    self.logger.exception("pipeline failed for article=%s", article.url)
+            work.flush()
+
+            if ready_for_delivery:
+                stats = self._deliver(ready_for_delivery, work, stats, include_article_content)
+
+        return stats
+
+    def _translate_article(
+        self,
+        article: Article,
+        work: StoreUnitOfWork,
+        *,
+        include_article_content: bool,
+    ) -> tuple[str, str, tuple[ArticleBlock, ...]]:
+        cached_translation = (
+            self.store.get_sent_translation_with_blocks(article.title) if include_article_content else None
+        )
+        content_source = article.content or article.summary
+        use_cached_translation = False
+        if cached_translation is not None:
+            translated_title, translated_summary, translated_blocks = cached_translation
+            # Guard against stale cache where translated title is still raw source text.
+            if translated_title.strip() != article.title.strip():
+                use_cached_translation = True
+            else:
+                self.logger.info(
+                    "translation cache bypassed (looks untranslated): title=%s",
+                    article.title,
                 )
-                content_source = article.content or article.summary
-                use_cached_translation = False
-                if cached_translation is not None:
-                    translated_title, translated_summary = cached_translation
-                    # Guard against stale cache where translated title is still raw source text.
-                    if translated_title.strip() != article.title.strip():
-                        use_cached_translation = True
-                    else:
+        if use_cached_translation:
+            self.logger.info("translation cache hit: title=%s", article.title)
+            # Rows written before blocks were stored only have the flattened text.
+            if not translated_blocks:
+                translated_blocks = parse_content_blocks(translated_summary)
+            return translated_title, translated_summary, translated_blocks
+
+        translated_title = self.translator.translate(
+            article.title,
+            source_lang=self.settings.source_lang,
+            target_lang=self.settings.target_lang,
+        )
+        if include_article_content:
+            translated_blocks = self._translate_content_blocks(article, work)
+            translated_summary = serialize_content_blocks(translated_blocks) or self.translator.translate(
+                content_source,
+                source_lang=self.settings.source_lang,
+                target_lang=self.settings.target_lang,
+            )
+            self.logger.info("translation cache miss: title=%s", article.title)
+        else:
+            translated_summary = article.summary
+            translated_blocks = ()
+        return translated_title, translated_summary, translated_blocks
+
+    def _deliver(
+        self,
+        ready_for_delivery: list[tuple[Article, str, str, tuple[ArticleBlock, ...]]],
+        work: StoreUnitOfWork,
+        stats: PipelineStats,
+        include_article_content: bool,
+    ) -> PipelineStats:
+        # Articles retried after a partial failure only go to the targets that do not have them yet,
+        # so articles are grouped by the targets they are still missing and each group gets its own message.
+        delivered = self.store.get_delivered_targets(article.record_key for article, _, _, _ in ready_for_delivery)
+        groups: dict[tuple[str, ...], list[tuple[Article, str, str, tuple[ArticleBlock, ...]]]] = {}
+        for entry in ready_for_delivery:
+            reached = delivered.get(entry[0].record_key, {})
+            missing = tuple(target for target in self.fanout.targets if target not in reached)
+            groups.setdefault(missing, []).append(entry)
+
+        preview_targets = [target for target in self.fanout.targets if any(target in missing for missing in groups)]
+        if self.preview_renderer is not None and preview_targets:
+            translated_titles = [title for _, title, _, _ in ready_for_delivery]
+            preview_path = self.preview_renderer.render(translated_titles)
+            if preview_path:
+                for delivery in self.fanout.send_image(preview_path, targets=preview_targets):
+                    if delivery.routed.final_result.success:
                         self.logger.info(
-                            "translation cache bypassed (looks untranslated): title=%s",
-                            article.title,
-                        )
-                if use_cached_translation:
-                    self.logger.info("translation cache hit: title=%s", article.title)
-                    translated_blocks = parse_content_blocks(translated_summary) if include_article_content else ()
-                else:
-                    translated_title = self.translator.translate(
-                        article.title,
-                        source_lang=self.settings.source_lang,
-                        target_lang=self.settings.target_lang,
-                    )
-                    if include_article_content:
-                        translated_blocks = self._translate_content_blocks(article)
-                        translated_summary = serialize_content_blocks(translated_blocks) or self.translator.translate(
-                            content_source,
-                            source_lang=self.settings.source_lang,
-                            target_lang=self.settings.target_lang,
+                            "preview image sent: path=%s target=%s channel=%s",
+                            preview_path,
+                            delivery.target,
+                            delivery.routed.final_result.channel,
                         )
                     else:
-                        translated_summary = article.summary
-                        translated_blocks = ()
-                    if include_article_content:
-                        self.logger.info("translation cache miss: title=%s", article.title)
-                self.store.upsert_event(article, translated_title, translated_summary)
-                ready_for_delivery.append((article, translated_title, translated_summary, translated_blocks))
-
-            except Exception as exc:
-                self.store.mark_failed(article.record_key, str(exc))
+                        self.logger.warning(
+                            "preview image send failed: path=%s target=%s error=%s",
+                            preview_path,
+                            delivery.target,
+                            delivery.routed.final_result.error_message,
+                        )
+
+        for missing, entries in groups.items():
+            failed: list[TargetDelivery] = []
+            if missing:
+                deliveries = self._send_to_targets(entries, missing, work, include_article_content)
+                failed = [delivery for delivery in deliveries if not delivery.routed.final_result.success]
+                for delivery in deliveries:
+                    if delivery.routed.final_result.success:
+                        for article, _, _, _ in entries:
+                            reached = delivered.setdefault(article.record_key, {})
+                            reached[delivery.target] = delivery.routed.final_result.channel
+
+            # An article is sent once every target has it; until then it stays failed and is retried next run.
+            if not failed:
+                for article, _, _, _ in entries:
+                    channels = list(delivered.get(article.record_key, {}).values())
+                    work.mark_sent(article.record_key, channels[-1] if channels else "none")
                 stats = PipelineStats(
                     fetched=stats.fetched,
-                    sent=stats.sent,
-                    failed=stats.failed + 1,
+                    sent=stats.sent + len(entries),
+                    failed=stats.failed,
                     skipped=stats.skipped,
+                    partial=stats.partial,
                 )
-                self.logger.exception("pipeline failed for article=%s", article.url)
+            else:
+                stats = self._record_failed_group(entries, failed, delivered, work, stats)
+            # Persist this group's delivery records and statuses before sending the next one, so messages
+            # that already went out are never sent again if the run dies part-way.
+            work.flush()
 
-        if not ready_for_delivery:
-            return stats
+        return stats
 
-        preview_path = None
-        if self.preview_renderer is not None:
-            translated_titles = [title for _, title, _, _ in ready_for_delivery]
-            preview_path = self.preview_renderer.render(translated_titles)
-            if preview_path:
-                preview_result = self.sender_router.send_image(delivery_target, preview_path)
-                if preview_result.final_result.success:
-                    self.logger.info(
-                        "preview image sent: path=%s channel=%s",
-                        preview_path,
-                        preview_result.final_result.channel,
-                    )
-                else:
-                    self.logger.warning(
-                        "preview image send failed: path=%s error=%s",
-                        preview_path,
-                        preview_result.final_result.error_message,
-                    )
+    def _record_failed_group(
+        self,
+        entries: list[tuple[Article, str, str, tuple[ArticleBlock, ...]]],
+        failed: list[TargetDelivery],
+        delivered: dict[str, dict[str, str]],
+        work: StoreUnitOfWork,
+        stats: PipelineStats,
+    ) -> PipelineStats:
+        error = _delivery_error(failed)
+        partial = [article for article, _, _, _ in entries if delivered.get(article.record_key)]
+        for article, _, _, _ in entries:
+            work.mark_failed(article.record_key, error)
+        if partial:
+            self.logger.warning(
+                "partial delivery: count=%s failed_targets=%s error=%s",
+                len(partial),
+                len(failed),
+                error,
+            )
+        if len(partial) < len(entries):
+            self.logger.warning(
+                "batch delivery failed: count=%s error=%s",
+                len(entries) - len(partial),
+                error,
+            )
+        return PipelineStats(
+            fetched=stats.fetched,
+            sent=stats.sent,
+            failed=stats.failed + len(entries) - len(partial),
+            skipped=stats.skipped,
+            partial=stats.partial + len(partial),
+        )
 
-        if include_article_content and len(ready_for_delivery) == 1:
-            article, title, content, blocks = ready_for_delivery[0]
+    def _send_to_targets(
+        self,
+        entries: list[tuple[Article, str, str, tuple[ArticleBlock, ...]]],
+        targets: tuple[str, ...],
+        work: StoreUnitOfWork,
+        include_article_content: bool,
+    ) -> list[TargetDelivery]:
+        if include_article_content and len(entries) == 1:
+            article, title, content, blocks = entries[0]
             batch_message = format_single_article_message(
                 title,
                 content,
@@ -160,57 +283,68 @@ class NewsPipeline:
             mode = "single-with-content"
         else:
             batch_message = format_batch_message(
-                [title for _, title, _, _ in ready_for_delivery],
-                article_urls=[article.url for article, _, _, _ in ready_for_delivery],
+                [title for _, title, _, _ in entries],
+                article_urls=[article.url for article, _, _, _ in entries],
                 header=self.batch_message_title,
             )
             mode = "batch-titles"
         self.logger.info(
-            "sending message: feed=%s mode=%s items=%s chars=%s",
+            "sending message: feed=%s mode=%s items=%s chars=%s targets=%s",
             self.feed_name,
             mode,
-            len(ready_for_delivery),
+            len(entries),
             len(batch_message),
+            len(targets),
         )
-        routed = self.sender_router.send(delivery_target, batch_message)
-
-        for article, _, _, _ in ready_for_delivery:
-            for attempt in routed.attempts:
-                self.store.record_delivery_attempt(article.record_key, delivery_target, attempt)
-
-        if routed.final_result.success:
-            for article, _, _, _ in ready_for_delivery:
-                self.store.mark_sent(article.record_key, routed.final_result.channel)
-            stats = PipelineStats(
-                fetched=stats.fetched,
-                sent=stats.sent + len(ready_for_delivery),
-                failed=stats.failed,
-                skipped=stats.skipped,
-            )
-        else:
-            error = routed.final_result.error_message or "unknown send failure"
-            for article, _, _, _ in ready_for_delivery:
-                self.store.mark_failed(article.record_key, error)
-            stats = PipelineStats(
-                fetched=stats.fetched,
-                sent=stats.sent,
-                failed=stats.failed + len(ready_for_delivery),
-                skipped=stats.skipped,
-            )
-            self.logger.warning("batch delivery failed: count=%s error=%s", len(ready_for_delivery), error)
+        deliveries = self.fanout.send(batch_message, targets=targets)
 
-        return stats
+        # One delivery_batches row per target attempt; the articles are linked to it, not copied.
+        record_keys = [article.record_key for article, _, _, _ in entries]
+        for delivery in deliveries:
+            for attempt in delivery.routed.attempts:
+                work.record_delivery_batch(record_keys, delivery.target, attempt)
+        return deliveries
 
-    def _translate_content_blocks(self, article: Article) -> tuple[ArticleBlock, ...]:
+    def _translate_content_blocks(self, article: Article, work: StoreUnitOfWork) -> tuple[ArticleBlock, ...]:
         source_blocks = article.content_blocks or parse_content_blocks(article.content or article.summary)
+        source_blocks = tuple(block for block in source_blocks if block.text.strip())
+        # Blocks seen in earlier articles (boilerplate, repeated disclosures) come from translation memory.
+        memory = self.store.get_translation_memory(
+            (block.text for block in source_blocks),
+            source_lang=self.settings.source_lang,
+            target_lang=self.settings.target_lang,
+        )
         translated: list[ArticleBlock] = []
+        new_pairs: list[tuple[str, str]] = []
+        translated_count = 0
         for block in source_blocks:
-            if not block.text.strip():
-                continue
-            translated_text = self.translator.translate(
-                block.text,
-                source_lang=self.settings.source_lang,
-                target_lang=self.settings.target_lang,
-            )
-            translated.append(ArticleBlock(kind=block.kind, text=translated_text.strip()))
+            translated_text = memory.get(block.text)
+            if translated_text is None:
+                translated_count += 1
+                translated_text = self.translator.translate(
+                    block.text,
+                    source_lang=self.settings.source_lang,
+                    target_lang=self.settings.target_lang,
+                ).strip()
+                memory[block.text] = translated_text
+                # Pass-through output (noop translator, provider echoing the source) must not be remembered,
+                # or later runs with a real translator would reuse the untranslated text forever.
+                if translated_text != block.text.strip():
+                    new_pairs.append((block.text, translated_text))
+            translated.append(ArticleBlock(kind=block.kind, text=translated_text))
+        memory_hits = len(source_blocks) - translated_count
+        if memory_hits:
+            self.logger.info("translation memory hits: title=%s blocks=%s", article.title, memory_hits)
+        work.remember_translations(
+            new_pairs,
+            source_lang=self.settings.source_lang,
+            target_lang=self.settings.target_lang,
+        )
         return tuple(translated)
+
+
+def _delivery_error(failed: list[TargetDelivery]) -> str:
+    errors = [delivery.routed.final_result.error_message or "unknown send failure" for delivery in failed]
+    if len(failed) <= 1:
+        return errors[0] if errors else "unknown send failure"
+    return "; ".join(f"{delivery.target}: {error}" for delivery, error in zip(failed, errors))
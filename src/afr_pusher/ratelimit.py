@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+DEFAULT_MAX_KEYS = 10_000
+
+
+@dataclass(frozen=True)
+class RateLimitStats:
+    rate_per_sec: float = 0.0
+    burst: int = 0
+    allowed: int = 0
+    limited: int = 0
+    tracked_keys: int = 0
+
+
+class TokenBucketLimiter:
+    """
+    One token bucket per key (API key, client IP, chat), refilled lazily on access, so each check is O(1).
+    It takes no lock: the API calls it from the event loop only, threaded callers hold their own lock.
+    The least recently seen keys are dropped beyond max_keys; a dropped key starts again with a full bucket.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        burst: int,
+        *,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_sec = max(0.0, float(rate_per_sec))
+        self.burst = max(0, int(burst))
+        self.max_keys = max(1, int(max_keys))
+        self._clock = clock
+        # key -> [tokens, last refill time]
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._allowed = 0
+        self._limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_sec > 0 and self.burst > 0
+
+    def acquire(self, key: str) -> float:
+        """Take one token for key. Returns 0.0 when allowed, otherwise seconds until a token is available."""
+        bucket = self._refill(key)
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            self._allowed += 1
+            return 0.0
+        self._limited += 1
+        return (1.0 - bucket[0]) / self.rate_per_sec
+
+    def wait_time(self, key: str) -> float:
+        """Seconds until key has a token, without taking it; lets callers check several buckets first."""
+        bucket = self._refill(key)
+        return 0.0 if bucket[0] >= 1.0 else (1.0 - bucket[0]) / self.rate_per_sec
+
+    def _refill(self, key: str) -> list[float]:
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+            bucket = [float(self.burst), now]
+            self._buckets[key] = bucket
+        else:
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate_per_sec)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def stats(self) -> RateLimitStats:
+        return RateLimitStats(
+            rate_per_sec=self.rate_per_sec,
+            burst=self.burst,
+            allowed=self._allowed,
+            limited=self._limited,
+            tracked_keys=len(self._buckets),
+        )
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized response bodies, all tagged with one data version.
+    Seeing a newer version drops every entry at once, since any write may affect any cached page.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._version: Optional[str] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = ResponseCacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: str, version: str) -> Optional[bytes]:
+        with self._lock:
+            self._sync_version(version)
+            body = self._entries.get(key)
+            if body is None:
+                self._bump(misses=1)
+                return None
+            self._entries.move_to_end(key)
+            self._bump(hits=1)
+            return body
+
+    def put(self, key: str, version: str, body: bytes) -> None:
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            # A request that started before the latest version change must not store its (older) body.
+            if version != self._version:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = body
+            self._bytes += len(body)
+            evicted = 0
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._bytes -= len(dropped)
+                evicted += 1
+            if evicted:
+                self._bump(evictions=evicted)
+
+    def stats(self) -> ResponseCacheStats:
+        with self._lock:
+            return ResponseCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def _sync_version(self, version: str) -> None:
+        if version == self._version:
+            return
+        if self._entries:
+            self._entries.clear()
+            self._bytes = 0
+            self._bump(invalidations=1)
+        self._version = version
+
+    def _bump(self, *, hits: int = 0, misses: int = 0, evictions: int = 0, invalidations: int = 0) -> None:
+        current = self._stats
+        self._stats = ResponseCacheStats(
+            hits=current.hits + hits,
+            misses=current.misses + misses,
+            evictions=current.evictions + evictions,
+            invalidations=current.invalidations + invalidations,
+        )
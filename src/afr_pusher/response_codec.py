@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any, Optional
+
+from fastapi.responses import Response
+
+try:  # Optional speedups: pip install -e '.[speedups]'
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+DEFAULT_COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response that skips FastAPI's jsonable_encoder; handlers return it with plain str/int/None data."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br (when brotli is installed) or gzip from an Accept-Encoding header, honouring q=0."""
+    offered: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name.strip()] = quality
+    wildcard = offered.get("*", 0.0)
+    candidates = (("br", brotli is not None), ("gzip", True))
+    for name, available in candidates:
+        if available and offered.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+from .models import epoch_ms, utc_now_iso
+from .store import SQLiteStore
+
+DEFAULT_VACUUM_STEP_PAGES = 256
+ARCHIVE_CHUNK_ROWS = 1000
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    max_age_days: Optional[int] = None
+    max_rows: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age_days is not None or self.max_rows is not None
+
+
+@dataclass(frozen=True)
+class RetentionReport:
+    archived_events: int = 0
+    archived_deliveries: int = 0
+    compacted_changes: int = 0
+    archive_path: Optional[Path] = None
+    vacuum_steps: int = 0
+    bytes_reclaimed: int = 0
+
+
+class _ArchiveWriter:
+    """Appends archived rows as gzip-compressed JSON lines; the file is only created on first write."""
+
+    def __init__(self, archive_dir: Path, now: datetime):
+        self.path = Path(archive_dir) / f"afr-archive-{now.strftime('%Y%m%dT%H%M%SZ')}.jsonl.gz"
+        self._handle: Optional[gzip.GzipFile] = None
+
+    def write(self, table: str, rows: list[sqlite3.Row]) -> None:
+        if not rows:
+            return
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = gzip.open(self.path, "ab")
+        for row in rows:
+            line = json.dumps({"table": table, "row": dict(row)}, ensure_ascii=False, separators=(",", ":"))
+            self._handle.write(line.encode("utf-8") + b"\n")
+        # Rows must be durable in the archive before they are deleted from the database.
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def close(self) -> Optional[Path]:
+        if self._handle is None:
+            return None
+        self._handle.close()
+        return self.path
+
+
+def run_retention(
+    store: SQLiteStore,
+    *,
+    events_policy: RetentionPolicy,
+    deliveries_policy: RetentionPolicy,
+    archive_dir: Path,
+    changes_max_age_days: Optional[int] = None,
+    vacuum_step_pages: int = DEFAULT_VACUUM_STEP_PAGES,
+    logger: Optional[logging.Logger] = None,
+) -> RetentionReport:
+    logger = logger or logging.getLogger(__name__)
+    conn = store.connection_manager.connection()
+    now = datetime.now(timezone.utc)
+    pages_before = _page_count(conn)
+    archive = _ArchiveWriter(archive_dir, now)
+
+    try:
+        archived_deliveries = 0
+        archived_events = 0
+        if events_policy.enabled:
+            archived_events, cascaded = _archive_events(store, archive, events_policy, now)
+            archived_deliveries += cascaded
+            if archived_events:
+                _purge_unreferenced_blocks(store)
+        if deliveries_policy.enabled:
+            archived_deliveries += _archive_deliveries(store, archive, deliveries_policy, now)
+    finally:
+        archive_path = archive.close()
+    # Runs after archiving so the delete entries it produced are collapsed too.
+    compacted_changes = store.compact_changes(max_age_days=changes_max_age_days)
+
+    vacuum_steps = _incremental_vacuum(store, vacuum_step_pages, logger)
+    page_size = int(conn.execute("PRAGMA page_size").fetchone()[0])
+    bytes_reclaimed = max(pages_before - _page_count(conn), 0) * page_size
+
+    report = RetentionReport(
+        archived_events=archived_events,
+        archived_deliveries=archived_deliveries,
+        compacted_changes=compacted_changes,
+        archive_path=archive_path,
+        vacuum_steps=vacuum_steps,
+        bytes_reclaimed=bytes_reclaimed,
+    )
+    logger.info(
+        "retention complete: events=%s deliveries=%s changes=%s archive=%s vacuum_steps=%s bytes_reclaimed=%s",
+        report.archived_events,
+        report.archived_deliveries,
+        report.compacted_changes,
+        report.archive_path or "-",
+        report.vacuum_steps,
+        report.bytes_reclaimed,
+    )
+    return report
+
+
+def _page_count(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA page_count").fetchone()[0])
+
+
+def _auto_vacuum_mode(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA auto_vacuum").fetchone()[0])
+
+
+def _cutoff_ms(policy: RetentionPolicy, now: datetime) -> Optional[int]:
+    if policy.max_age_days is None:
+        return None
+    return epoch_ms((now - timedelta(days=policy.max_age_days)).isoformat())
+
+
+def _archive_events(
+    store: SQLiteStore,
+    archive: _ArchiveWriter,
+    policy: RetentionPolicy,
+    now: datetime,
+) -> tuple[int, int]:
+    conn = store.connection_manager.connection()
+    cutoff_ms = _cutoff_ms(policy, now)
+    # Rows beyond the newest max_rows, or older than the age cutoff, are expired.
+    expired_sql = """
+        SELECT record_key FROM article_events
+        WHERE (? IS NOT NULL AND sort_ts < ?)
+           OR (? IS NOT NULL AND record_key NOT IN (
+                SELECT record_key FROM article_events ORDER BY sort_ts DESC, record_key DESC LIMIT ?
+           ))
+        LIMIT ?
+    """
+    archived_events = 0
+    archived_deliveries = 0
+    while True:
+        keys = [
+            str(row["record_key"])
+            for row in conn.execute(
+                expired_sql,
+                (cutoff_ms, cutoff_ms, policy.max_rows, policy.max_rows, ARCHIVE_CHUNK_ROWS),
+            )
+        ]
+        if not keys:
+            return archived_events, archived_deliveries
+
+        placeholders = ", ".join("?" for _ in keys)
+        event_rows = conn.execute(f"SELECT * FROM article_events WHERE record_key IN ({placeholders})", keys).fetchall()
+        item_rows = conn.execute(
+            f"SELECT * FROM delivery_batch_items WHERE record_key IN ({placeholders})", keys
+        ).fetchall()
+        # A batch goes with its last article; batches still linked to live articles stay.
+        batch_rows = conn.execute(
+            f"""
+            SELECT * FROM delivery_batches AS b
+            WHERE b.id IN (SELECT batch_id FROM delivery_batch_items WHERE record_key IN ({placeholders}))
+              AND NOT EXISTS (
+                SELECT 1 FROM delivery_batch_items AS i
+                WHERE i.batch_id = b.id AND i.record_key NOT IN ({placeholders})
+              )
+            """,
+            keys + keys,
+        ).fetchall()
+        archive.write("article_events", event_rows)
+        # Block references are only meaningful next to the texts they point at.
+        archive.write("content_blocks", _referenced_block_rows(conn, event_rows))
+        archive.write("delivery_batch_items", item_rows)
+        archive.write("delivery_batches", batch_rows)
+        batch_ids = [int(row["id"]) for row in batch_rows]
+        with store.connection_manager.transaction() as tx:
+            tx.execute(f"DELETE FROM delivery_batch_items WHERE record_key IN ({placeholders})", keys)
+            if batch_ids:
+                tx.execute(
+                    f"DELETE FROM delivery_batches WHERE id IN ({', '.join('?' for _ in batch_ids)})",
+                    batch_ids,
+                )
+            tx.execute(f"DELETE FROM article_events WHERE record_key IN ({placeholders})", keys)
+        archived_events += len(event_rows)
+        archived_deliveries += len(batch_rows)
+
+
+def _referenced_block_rows(conn: sqlite3.Connection, event_rows: list[sqlite3.Row]) -> list[sqlite3.Row]:
+    hashes = sorted(
+        {
+            digest
+            for row in event_rows
+            for column in ("source_blocks", "translated_blocks")
+            if row[column]
+            for _, digest in json.loads(row[column])
+        }
+    )
+    rows: list[sqlite3.Row] = []
+    for start in range(0, len(hashes), ARCHIVE_CHUNK_ROWS):
+        chunk = hashes[start : start + ARCHIVE_CHUNK_ROWS]
+        placeholders = ", ".join("?" for _ in chunk)
+        rows.extend(conn.execute(f"SELECT * FROM content_blocks WHERE hash IN ({placeholders})", chunk))
+    return rows
+
+
+def _purge_unreferenced_blocks(store: SQLiteStore) -> None:
+    # Translation memory follows the source blocks of live articles; block texts go once nothing points at them.
+    live_refs = """
+        SELECT json_extract(ref.value, '$[1]')
+        FROM article_events AS e, json_each(COALESCE(e.source_blocks, '[]')) AS ref
+        UNION
+        SELECT json_extract(ref.value, '$[1]')
+        FROM article_events AS e, json_each(COALESCE(e.translated_blocks, '[]')) AS ref
+    """
+    with store.connection_manager.transaction() as tx:
+        tx.execute("CREATE TEMP TABLE IF NOT EXISTS live_block_refs (hash TEXT PRIMARY KEY)")
+        tx.execute("DELETE FROM live_block_refs")
+        tx.execute(f"INSERT OR IGNORE INTO live_block_refs (hash) {live_refs}")
+        tx.execute("DELETE FROM translation_memory WHERE source_hash NOT IN (SELECT hash FROM live_block_refs)")
+        tx.execute(
+            """
+            DELETE FROM content_blocks
+            WHERE hash NOT IN (SELECT hash FROM live_block_refs)
+              AND hash NOT IN (SELECT source_hash FROM translation_memory)
+              AND hash NOT IN (SELECT translated_hash FROM translation_memory)
+            """
+        )
+
+
+def _archive_deliveries(
+    store: SQLiteStore,
+    archive: _ArchiveWriter,
+    policy: RetentionPolicy,
+    now: datetime,
+) -> int:
+    conn = store.connection_manager.connection()
+    cutoff_iso = (now - timedelta(days=policy.max_age_days)).isoformat() if policy.max_age_days is not None else None
+    expired_sql = """
+        SELECT * FROM delivery_batches
+        WHERE (? IS NOT NULL AND created_at < ?)
+           OR (? IS NOT NULL AND id <= (
+                SELECT id FROM delivery_batches ORDER BY id DESC LIMIT 1 OFFSET ?
+           ))
+        ORDER BY id
+        LIMIT ?
+    """
+    archived = 0
+    while True:
+        rows = conn.execute(
+            expired_sql,
+            (cutoff_iso, cutoff_iso, policy.max_rows, policy.max_rows, ARCHIVE_CHUNK_ROWS),
+        ).fetchall()
+        if not rows:
+            return archived
+        ids = [int(row["id"]) for row in rows]
+        placeholders = ", ".join("?" for _ in ids)
+        item_rows = conn.execute(
+            f"SELECT * FROM delivery_batch_items WHERE batch_id IN ({placeholders})", ids
+        ).fetchall()
+        archive.write("delivery_batches", rows)
+        archive.write("delivery_batch_items", item_rows)
+        with store.connection_manager.transaction() as tx:
+            # Kept articles lose part of their delivery history: log them as updated so the API's
+            # ETag/Last-Modified move on and change-feed readers refetch them.
+            tx.execute(
+                f"""
+                INSERT INTO changes (record_key, op, status, changed_ts)
+                SELECT record_key, 'update', status, ?
+                FROM article_events
+                WHERE record_key IN (SELECT record_key FROM delivery_batch_items WHERE batch_id IN ({placeholders}))
+                ORDER BY sort_ts, record_key
+                """,
+                [epoch_ms(utc_now_iso()), *ids],
+            )
+            tx.execute(f"DELETE FROM delivery_batch_items WHERE batch_id IN ({placeholders})", ids)
+            tx.execute(f"DELETE FROM delivery_batches WHERE id IN ({placeholders})", ids)
+        archived += len(rows)
+
+
+def _incremental_vacuum(store: SQLiteStore, step_pages: int, logger: logging.Logger) -> int:
+    conn = store.connection_manager.connection()
+    if _auto_vacuum_mode(conn) != 2:
+        # Databases created before auto_vacuum=INCREMENTAL need one full VACUUM to switch modes.
+        logger.warning("converting database to auto_vacuum=INCREMENTAL with a one-time VACUUM")
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        # VACUUM may renumber article_events rowids, which the search index is keyed on.
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'article_search'").fetchone():
+            conn.execute("INSERT INTO article_search (article_search) VALUES ('rebuild')")
+        return 1
+
+    steps = 0
+    step_pages = max(int(step_pages), 1)
+    while int(conn.execute("PRAGMA freelist_count").fetchone()[0]) > 0:
+        # Each step is its own short write transaction so readers and the pusher are never blocked for long.
+        conn.execute(f"PRAGMA incremental_vacuum({step_pages})").fetchall()
+        steps += 1
+    return steps
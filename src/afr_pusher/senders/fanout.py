@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Mapping, Optional
+
+from ..models import DeliveryResult
+from .router import RoutedDelivery, SenderRouter
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class TargetDelivery:
+    target: str
+    routed: RoutedDelivery
+
+
+class FanoutDelivery:
+    """
+    Sends the same message to every target, each through its own SenderRouter (so each target can have
+    its own sender settings). Targets are sent concurrently on a short-lived thread pool, a single target
+    inline; Telegram pacing is left to the rate limiter the senders share. A target whose sender raises is
+    reported as a failed delivery and never stops the others. Results come back in target order; passing
+    targets limits a send to those targets (used to retry only the ones that failed before).
+    """
+
+    def __init__(self, routers: Mapping[str, SenderRouter], *, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.routers = dict(routers)
+        self.max_workers = max(1, int(max_workers))
+
+    @property
+    def targets(self) -> list[str]:
+        return list(self.routers)
+
+    @property
+    def has_senders(self) -> bool:
+        return any(router.primary or router.fallback for router in self.routers.values())
+
+    def send(self, message: str, *, targets: Optional[Iterable[str]] = None) -> list[TargetDelivery]:
+        return self._fan_out(lambda target, router: router.send(target, message), targets)
+
+    def send_image(self, image_path: Path, *, targets: Optional[Iterable[str]] = None) -> list[TargetDelivery]:
+        return self._fan_out(lambda target, router: router.send_image(target, image_path), targets)
+
+    def _fan_out(
+        self,
+        call: Callable[[str, SenderRouter], RoutedDelivery],
+        targets: Optional[Iterable[str]],
+    ) -> list[TargetDelivery]:
+        selected = None if targets is None else set(targets)
+        items = [(target, router) for target, router in self.routers.items() if selected is None or target in selected]
+        if len(items) <= 1 or self.max_workers == 1:
+            return [_deliver_one(target, router, call) for target, router in items]
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(items)),
+            thread_name_prefix="afr-send",
+        ) as pool:
+            return list(pool.map(lambda item: _deliver_one(item[0], item[1], call), items))
+
+
+def _deliver_one(
+    target: str,
+    router: SenderRouter,
+    call: Callable[[str, SenderRouter], RoutedDelivery],
+) -> TargetDelivery:
+    try:
+        return TargetDelivery(target=target, routed=call(target, router))
+    except Exception as exc:
+        sender = router.primary or router.fallback
+        failed = DeliveryResult(
+            channel=sender.name if sender else "none",
+            success=False,
+            error_message=f"Delivery raised: {exc}",
+        )
+        return TargetDelivery(target=target, routed=RoutedDelivery(final_result=failed, attempts=[failed]))
@@ -1,13 +1,77 @@
 from __future__ import annotations
 
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import requests
 
 from ..models import DeliveryResult
+from ..ratelimit import TokenBucketLimiter
 from .base import Sender
 
+# Bot API limits from Telegram's FAQ: about 30 messages/s overall, 1 message/s in one chat and 20 messages
+# per minute in a group or channel.
+DEFAULT_GLOBAL_RATE_PER_SEC = 30.0
+DEFAULT_CHAT_RATE_PER_SEC = 1.0
+DEFAULT_GROUP_RATE_PER_MIN = 20
+DEFAULT_RETRY_BUDGET_SEC = 60.0
+# Used when a 429 response carries no parameters.retry_after.
+DEFAULT_RETRY_AFTER_SEC = 1.0
+
+
+class TelegramRateLimiter:
+    """
+    Paces Bot API calls with token buckets for the global, per-chat and per-group limits, plus the
+    retry_after deadlines Telegram hands out with 429 responses. One instance is shared by every sender
+    using the same bot token; acquire() is thread-safe and never blocks, senders sleep on the delay it returns.
+    """
+
+    def __init__(
+        self,
+        *,
+        global_rate_per_sec: float = DEFAULT_GLOBAL_RATE_PER_SEC,
+        chat_rate_per_sec: float = DEFAULT_CHAT_RATE_PER_SEC,
+        group_rate_per_min: int = DEFAULT_GROUP_RATE_PER_MIN,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._global = TokenBucketLimiter(global_rate_per_sec, max(1, int(global_rate_per_sec)), clock=clock)
+        self._chat = TokenBucketLimiter(chat_rate_per_sec, 1, clock=clock)
+        self._group = TokenBucketLimiter(group_rate_per_min / 60.0, group_rate_per_min, clock=clock)
+        self._blocked_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.clock = clock
+        self.sleep = sleep
+
+    def acquire(self, chat_id: str) -> float:
+        """Take a send slot for chat_id when every limit allows it (returns 0.0), else return seconds to wait."""
+        with self._lock:
+            buckets = [(limiter, key) for limiter, key in self._buckets(chat_id) if limiter.enabled]
+            delay = max(
+                [self._blocked_until.get(chat_id, 0.0) - self.clock()]
+                + [limiter.wait_time(key) for limiter, key in buckets]
+            )
+            if delay > 0:
+                return delay
+            for limiter, key in buckets:
+                limiter.acquire(key)
+            return 0.0
+
+    def block(self, chat_id: str, retry_after: float) -> None:
+        """Hold every send to chat_id for retry_after seconds, as told by a 429 response."""
+        with self._lock:
+            until = self.clock() + max(0.0, retry_after)
+            self._blocked_until[chat_id] = max(until, self._blocked_until.get(chat_id, 0.0))
+
+    def _buckets(self, chat_id: str) -> list[tuple[TokenBucketLimiter, str]]:
+        buckets = [(self._global, ""), (self._chat, chat_id)]
+        # Groups, supergroups and channels have negative ids; public channels may be given as @username.
+        if chat_id.startswith(("-", "@")):
+            buckets.append((self._group, chat_id))
+        return buckets
+
 
 class TelegramBotSender(Sender):
     name = "telegram-bot"
@@ -20,6 +84,8 @@ class TelegramBotSender(Sender):
         api_base: str = "https://api.telegram.org",
         parse_mode: Optional[str] = "HTML",
         session: Optional[requests.Session] = None,
+        rate_limiter: Optional[TelegramRateLimiter] = None,
+        retry_budget_sec: float = DEFAULT_RETRY_BUDGET_SEC,
     ):
         token = bot_token.strip()
         target_chat = chat_id.strip()
@@ -38,6 +104,8 @@ class TelegramBotSender(Sender):
         normalized_parse_mode = (parse_mode or "").strip()
         self.parse_mode = None if normalized_parse_mode.upper() in {"", "NONE", "PLAIN_TEXT"} else normalized_parse_mode
         self.session = session or requests.Session()
+        self.rate_limiter = rate_limiter or TelegramRateLimiter()
+        self.retry_budget_sec = max(0.0, float(retry_budget_sec))
 
     def send(self, target: str, message: str) -> DeliveryResult:
         payload = {
@@ -58,35 +126,65 @@ class TelegramBotSender(Sender):
                 error_message=f"Image not found: {path}",
             )
 
-        url = self._method_url("sendPhoto")
-        try:
+        def post_photo() -> requests.Response:
             with path.open("rb") as image_file:
-                response = self.session.post(
-                    url,
+                return self.session.post(
+                    self._method_url("sendPhoto"),
                     data={"chat_id": self.chat_id},
                     files={"photo": image_file},
                     timeout=self.timeout_sec,
                 )
-                response.raise_for_status()
-        except Exception as exc:
-            return DeliveryResult(
-                channel=self.name,
-                success=False,
-                error_message=f"HTTP request failed: {exc}",
-            )
 
-        return self._parse_response(response)
+        return self._send_paced(post_photo)
 
     def _method_url(self, method: str) -> str:
         return f"{self.api_base}/bot{self.bot_token}/{method}"
 
     def _post_json(self, method: str, payload: dict) -> DeliveryResult:
-        try:
-            response = self.session.post(
+        return self._send_paced(
+            lambda: self.session.post(
                 self._method_url(method),
                 json=payload,
                 timeout=self.timeout_sec,
             )
+        )
+
+    def _send_paced(self, post: Callable[[], requests.Response]) -> DeliveryResult:
+        """
+        Wait for a send slot, post, and on 429 wait out retry_after and post again, for as long as the
+        next attempt still starts within retry_budget_sec; past that the last failure is returned.
+        """
+        limiter = self.rate_limiter
+        deadline = limiter.clock() + self.retry_budget_sec
+        while True:
+            delay = limiter.acquire(self.chat_id)
+            if delay > 0:
+                if limiter.clock() + delay > deadline:
+                    return DeliveryResult(
+                        channel=self.name,
+                        success=False,
+                        error_message=f"Telegram rate limit: no send slot within {self.retry_budget_sec:g}s",
+                    )
+                limiter.sleep(delay)
+                continue
+
+            try:
+                response = post()
+            except Exception as exc:
+                return DeliveryResult(
+                    channel=self.name,
+                    success=False,
+                    error_message=f"HTTP request failed: {exc}",
+                )
+
+            retry_after = _retry_after(response)
+            if retry_after is None:
+                break
+            limiter.block(self.chat_id, retry_after)
+            if limiter.clock() + retry_after > deadline:
+                return self._parse_response(response)
+
+        try:
             response.raise_for_status()
         except Exception as exc:
             return DeliveryResult(
@@ -118,3 +216,20 @@ class TelegramBotSender(Sender):
             success=True,
             response_excerpt=(response.text or "")[:400],
         )
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds Telegram asks us to wait for a 429 Too Many Requests response, None for any other response."""
+    try:
+        body = response.json()
+    except Exception:
+        body = {}
+    if not isinstance(body, dict):
+        body = {}
+    if response.status_code != 429 and body.get("error_code") != 429:
+        return None
+    parameters = body.get("parameters") or {}
+    try:
+        return float(parameters.get("retry_after", DEFAULT_RETRY_AFTER_SEC))
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER_SEC
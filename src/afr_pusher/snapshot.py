@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .miniapp_store import COMPACT_LIST_FIELDS, DEFAULT_LIMIT, MAX_LIMIT, VALID_STATUS, MiniAppArticleStore
+
+DEFAULT_DETAIL_COUNT = 100
+# get_articles reads this many articles per query while exporting detail files.
+DETAIL_CHUNK = 50
+LIST_NAMES = ("all", *sorted(VALID_STATUS))
+
+
+@dataclass(frozen=True)
+class SnapshotReport:
+    files_written: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+
+
+def export_snapshots(
+    db_path: Path,
+    out_dir: Path,
+    *,
+    detail_count: int = DEFAULT_DETAIL_COUNT,
+) -> SnapshotReport:
+    """
+    Write the first /api/articles page for every status filter and the /api/articles/{key} body of the most
+    recent articles as static files (plain and .gz) under out_dir, in exactly the shape the API returns.
+    Every file is written to a temporary name and renamed into place, so nginx never serves a partial file;
+    files whose content did not change are left alone, which keeps their mtime-based ETag stable.
+    """
+    root = Path(out_dir)
+    store = MiniAppArticleStore(db_path)
+    writer = _SnapshotWriter()
+    try:
+        for name in LIST_NAMES:
+            status = None if name == "all" else name
+            items, next_cursor = store.list_articles_page(
+                limit=DEFAULT_LIMIT,
+                status=status,
+                fields=COMPACT_LIST_FIELDS,
+            )
+            writer.write(
+                root / "lists" / f"{name}.json",
+                {
+                    "ok": True,
+                    "items": items,
+                    "count": len(items),
+                    "limit": DEFAULT_LIMIT,
+                    "status": status,
+                    "next_cursor": next_cursor,
+                },
+            )
+
+        keys = [key for key in _recent_keys(store, detail_count) if _is_safe_file_name(key)]
+        articles_dir = root / "articles"
+        for start in range(0, len(keys), DETAIL_CHUNK):
+            for item in store.get_articles(keys[start : start + DETAIL_CHUNK]):
+                writer.write(articles_dir / f"{item['record_key']}.json", {"ok": True, "item": item})
+        writer.prune(articles_dir, keep={f"{key}.json" for key in keys})
+    finally:
+        store.close()
+    return writer.report()
+
+
+def _recent_keys(store: MiniAppArticleStore, count: int) -> list[str]:
+    keys: list[str] = []
+    cursor: Optional[str] = None
+    while len(keys) < count:
+        items, cursor = store.list_articles_page(
+            limit=min(count - len(keys), MAX_LIMIT),
+            cursor=cursor,
+            fields=("record_key",),
+        )
+        keys.extend(str(item["record_key"]) for item in items)
+        if cursor is None:
+            break
+    return keys
+
+
+class _SnapshotWriter:
+    def __init__(self) -> None:
+        self._written = 0
+        self._unchanged = 0
+        self._removed = 0
+
+    def write(self, path: Path, payload: dict[str, object]) -> None:
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if _read_bytes(path) == body:
+            self._unchanged += 1
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The .gz goes first so gzip_static never pairs a new plain file with a stale compressed one.
+        _replace_atomically(path.with_name(path.name + ".gz"), gzip.compress(body, mtime=0))
+        _replace_atomically(path, body)
+        self._written += 1
+
+    def prune(self, directory: Path, *, keep: set[str]) -> None:
+        if not directory.is_dir():
+            return
+        for entry in directory.iterdir():
+            name = entry.name
+            plain = name[: -len(".gz")] if name.endswith(".json.gz") else name
+            if name.startswith(".") or not plain.endswith(".json") or plain in keep:
+                continue
+            entry.unlink(missing_ok=True)
+            self._removed += 1
+
+    def report(self) -> SnapshotReport:
+        return SnapshotReport(
+            files_written=self._written,
+            files_unchanged=self._unchanged,
+            files_removed=self._removed,
+        )
+
+
+def _is_safe_file_name(record_key: str) -> bool:
+    return bool(record_key) and "/" not in record_key and "\0" not in record_key and not record_key.startswith(".")
+
+
+def _read_bytes(path: Path) -> Optional[bytes]:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _replace_atomically(path: Path, data: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        # mkstemp creates 0600 files; nginx workers run as another user and need to read them.
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
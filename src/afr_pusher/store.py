@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 import sqlite3
-from contextlib import closing
+import threading
+from contextlib import contextmanager
+from itertools import groupby
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Mapping, Optional, Sequence
 
-from .models import Article, DeliveryResult, utc_now_iso
+from .db import LockWaitStats, SQLiteConnectionManager
+from .models import Article, ArticleBlock, ChangeEntry, DeliveryResult, HomepageEntry, KnownArticle, epoch_ms, utc_now_iso
+
+
+def _sql_epoch_ms(expression: str) -> str:
+    return f"CAST(ROUND((julianday({expression}) - 2440587.5) * 86400000) AS INTEGER)"
 
 
 SCHEMA = """
@@ -43,147 +53,901 @@ CREATE TABLE IF NOT EXISTS deliveries (
 );
 
 CREATE INDEX IF NOT EXISTS idx_deliveries_record_key ON deliveries(record_key);
+
+CREATE TABLE IF NOT EXISTS homepage_urls (
+    feed TEXT NOT NULL,
+    url TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    first_seen_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL,
+    last_checked_at TEXT,
+    PRIMARY KEY(feed, url)
+);
+"""
+
+# Failure reasons are grouped on the first line of the error, capped so one noisy message cannot bloat the rollup.
+_FAILURE_REASON_SQL = (
+    "substr(COALESCE(NULLIF(trim(substr(b.error_message, 1, instr(b.error_message || char(10), char(10)) - 1)), ''), "
+    "'unknown'), 1, 120)"
+)
+
+# Applied in order on top of SCHEMA; PRAGMA user_version records how many have run.
+# SCHEMA is the version-0 baseline, so later migrations are free to drop or reshape its tables.
+MIGRATIONS: tuple[tuple[str, ...], ...] = (
+    # 1: integer epoch-millisecond sort keys so list queries can be served from an index.
+    (
+        "ALTER TABLE article_events ADD COLUMN created_ts INTEGER",
+        "ALTER TABLE article_events ADD COLUMN sort_ts INTEGER",
+        f"""
+        UPDATE article_events SET
+            created_ts = {_sql_epoch_ms("created_at")},
+            sort_ts = {_sql_epoch_ms("COALESCE(sent_at, last_attempt_at, created_at)")}
+        """,
+        "CREATE INDEX idx_article_events_sort ON article_events(sort_ts DESC, created_ts DESC)",
+        "CREATE INDEX idx_article_events_status_sort ON article_events(status, sort_ts DESC, created_ts DESC)",
+    ),
+    # 2: one delivery row per send attempt, linked to the articles it covered, instead of a copy per article.
+    (
+        """
+        CREATE TABLE delivery_batches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            channel TEXT NOT NULL,
+            target TEXT NOT NULL,
+            success INTEGER NOT NULL,
+            error_message TEXT,
+            response_excerpt TEXT,
+            created_at TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE delivery_batch_items (
+            record_key TEXT NOT NULL,
+            batch_id INTEGER NOT NULL REFERENCES delivery_batches(id),
+            PRIMARY KEY(record_key, batch_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX idx_delivery_batch_items_batch ON delivery_batch_items(batch_id)",
+        # Legacy rows keep their ids; each becomes a single-article batch.
+        """
+        INSERT INTO delivery_batches (id, channel, target, success, error_message, response_excerpt, created_at)
+        SELECT id, channel, target, success, error_message, response_excerpt, created_at FROM deliveries
+        """,
+        "INSERT OR IGNORE INTO delivery_batch_items (record_key, batch_id) SELECT record_key, id FROM deliveries",
+        "DROP TABLE deliveries",
+    ),
+    # 3: structured source/translated blocks stored as references into a content-addressed text table,
+    # plus a block-level translation memory keyed by the same hashes.
+    (
+        "CREATE TABLE content_blocks (hash TEXT PRIMARY KEY, text TEXT NOT NULL) WITHOUT ROWID",
+        "ALTER TABLE article_events ADD COLUMN source_blocks TEXT",
+        "ALTER TABLE article_events ADD COLUMN translated_blocks TEXT",
+        """
+        CREATE TABLE translation_memory (
+            source_hash TEXT NOT NULL,
+            source_lang TEXT NOT NULL,
+            target_lang TEXT NOT NULL,
+            translated_hash TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY(source_hash, source_lang, target_lang)
+        ) WITHOUT ROWID
+        """,
+    ),
+    # 4: trigram full-text index over titles and summaries (trigram needs SQLite >= 3.34, and handles CJK text).
+    # article_search is an external-content table keyed by article_events.rowid and kept in sync by triggers.
+    # Skipped on libraries without the trigram tokenizer (see SEARCH_INDEX_MIGRATION).
+    (
+        """
+        CREATE VIRTUAL TABLE article_search USING fts5(
+            title, summary, translated_title, translated_summary,
+            content='article_events', content_rowid='rowid', tokenize='trigram'
+        )
+        """,
+        """
+        CREATE TRIGGER article_events_search_insert AFTER INSERT ON article_events BEGIN
+            INSERT INTO article_search (rowid, title, summary, translated_title, translated_summary)
+            VALUES (new.rowid, new.title, new.summary, new.translated_title, new.translated_summary);
+        END
+        """,
+        """
+        CREATE TRIGGER article_events_search_delete AFTER DELETE ON article_events BEGIN
+            INSERT INTO article_search (article_search, rowid, title, summary, translated_title, translated_summary)
+            VALUES ('delete', old.rowid, old.title, old.summary, old.translated_title, old.translated_summary);
+        END
+        """,
+        """
+        CREATE TRIGGER article_events_search_update
+        AFTER UPDATE OF title, summary, translated_title, translated_summary ON article_events
+        WHEN old.title IS NOT new.title
+          OR old.summary IS NOT new.summary
+          OR old.translated_title IS NOT new.translated_title
+          OR old.translated_summary IS NOT new.translated_summary
+        BEGIN
+            INSERT INTO article_search (article_search, rowid, title, summary, translated_title, translated_summary)
+            VALUES ('delete', old.rowid, old.title, old.summary, old.translated_title, old.translated_summary);
+            INSERT INTO article_search (rowid, title, summary, translated_title, translated_summary)
+            VALUES (new.rowid, new.title, new.summary, new.translated_title, new.translated_summary);
+        END
+        """,
+        "INSERT INTO article_search (article_search) VALUES ('rebuild')",
+    ),
+    # 5: change log for downstream readers; seq only ever grows (AUTOINCREMENT never reuses values).
+    (
+        """
+        CREATE TABLE changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            record_key TEXT NOT NULL,
+            op TEXT NOT NULL,
+            status TEXT,
+            changed_ts INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX idx_changes_record_key ON changes(record_key, seq)",
+        f"""
+        CREATE TRIGGER article_events_changes_insert AFTER INSERT ON article_events BEGIN
+            INSERT INTO changes (record_key, op, status, changed_ts)
+            VALUES (new.record_key, 'insert', new.status, {_sql_epoch_ms("'now'")});
+        END
+        """,
+        # Re-upserting an unchanged article still runs an UPDATE; only log real changes.
+        f"""
+        CREATE TRIGGER article_events_changes_update AFTER UPDATE ON article_events
+        WHEN old.status IS NOT new.status
+          OR old.title IS NOT new.title
+          OR old.summary IS NOT new.summary
+          OR old.translated_title IS NOT new.translated_title
+          OR old.translated_summary IS NOT new.translated_summary
+          OR old.translated_blocks IS NOT new.translated_blocks
+          OR old.last_error IS NOT new.last_error
+          OR old.sent_at IS NOT new.sent_at
+        BEGIN
+            INSERT INTO changes (record_key, op, status, changed_ts)
+            VALUES (new.record_key, 'update', new.status, {_sql_epoch_ms("'now'")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER article_events_changes_delete AFTER DELETE ON article_events BEGIN
+            INSERT INTO changes (record_key, op, status, changed_ts)
+            VALUES (old.record_key, 'delete', NULL, {_sql_epoch_ms("'now'")});
+        END
+        """,
+        # Existing articles are replayed as inserts so a reader starting at seq 0 sees the whole table.
+        f"""
+        INSERT INTO changes (record_key, op, status, changed_ts)
+        SELECT record_key, 'insert', status, {_sql_epoch_ms("'now'")}
+        FROM article_events
+        ORDER BY sort_ts, created_ts
+        """,
+    ),
+    # 6: list order breaks sort_ts ties on the unique record_key so keyset cursors are exact.
+    (
+        "DROP INDEX idx_article_events_sort",
+        "DROP INDEX idx_article_events_status_sort",
+        "CREATE INDEX idx_article_events_sort ON article_events(sort_ts DESC, record_key DESC)",
+        "CREATE INDEX idx_article_events_status_sort ON article_events(status, sort_ts DESC, record_key DESC)",
+    ),
+    # 7: the list indexes also carry the compact list columns, so list pages never touch the table rows.
+    (
+        "DROP INDEX idx_article_events_sort",
+        "DROP INDEX idx_article_events_status_sort",
+        """
+        CREATE INDEX idx_article_events_sort ON article_events(
+            sort_ts DESC, record_key DESC,
+            status, title, translated_title, published_at, created_at, last_attempt_at, sent_at
+        )
+        """,
+        """
+        CREATE INDEX idx_article_events_status_sort ON article_events(
+            status, sort_ts DESC, record_key DESC,
+            title, translated_title, published_at, created_at, last_attempt_at, sent_at
+        )
+        """,
+    ),
+    # 8: per-day rollups for /api/stats, kept current by triggers so reads cost O(days), not O(history).
+    # Archiving old rows does not rewrite past statistics (there are no delete triggers).
+    (
+        """
+        CREATE TABLE article_daily_stats (
+            day TEXT PRIMARY KEY,
+            created INTEGER NOT NULL DEFAULT 0,
+            sent INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE delivery_daily_stats (
+            day TEXT NOT NULL,
+            channel TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            successes INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, channel)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TABLE delivery_failure_reasons (
+            day TEXT NOT NULL,
+            channel TEXT NOT NULL,
+            reason TEXT NOT NULL,
+            failures INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, channel, reason)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TRIGGER article_events_stats_insert AFTER INSERT ON article_events BEGIN
+            INSERT INTO article_daily_stats (day, created) VALUES (substr(new.created_at, 1, 10), 1)
+            ON CONFLICT(day) DO UPDATE SET created = created + 1;
+        END
+        """,
+        # sent/failed count articles by their current outcome, on the day of their last attempt, exactly as the
+        # backfill below does: a retried article leaves "failed" when it is re-queued (the upsert resets it to
+        # pending), so one that failed three times and was then sent counts once as sent and never as failed.
+        """
+        CREATE TRIGGER article_events_stats_status AFTER UPDATE OF status, last_attempt_at ON article_events
+        WHEN (old.status IN ('sent', 'failed') OR new.status IN ('sent', 'failed'))
+          AND (new.status IS NOT old.status OR new.last_attempt_at IS NOT old.last_attempt_at)
+        BEGIN
+            INSERT INTO article_daily_stats (day, sent, failed)
+            SELECT
+                substr(COALESCE(old.last_attempt_at, old.created_at), 1, 10),
+                -(old.status = 'sent'),
+                -(old.status = 'failed')
+            WHERE old.status IN ('sent', 'failed')
+            ON CONFLICT(day) DO UPDATE SET sent = sent + excluded.sent, failed = failed + excluded.failed;
+            INSERT INTO article_daily_stats (day, sent, failed)
+            SELECT
+                substr(COALESCE(new.last_attempt_at, new.created_at), 1, 10),
+                new.status = 'sent',
+                new.status = 'failed'
+            WHERE new.status IN ('sent', 'failed')
+            ON CONFLICT(day) DO UPDATE SET sent = sent + excluded.sent, failed = failed + excluded.failed;
+        END
+        """,
+        # One attempt per article in the batch, matching how success rates were read from deliveries.
+        f"""
+        CREATE TRIGGER delivery_batch_items_stats AFTER INSERT ON delivery_batch_items BEGIN
+            INSERT INTO delivery_daily_stats (day, channel, attempts, successes)
+            SELECT substr(b.created_at, 1, 10), b.channel, 1, b.success
+            FROM delivery_batches AS b
+            WHERE b.id = new.batch_id
+            ON CONFLICT(day, channel) DO UPDATE SET
+                attempts = attempts + 1,
+                successes = successes + excluded.successes;
+            INSERT INTO delivery_failure_reasons (day, channel, reason, failures)
+            SELECT substr(b.created_at, 1, 10), b.channel, {_FAILURE_REASON_SQL}, 1
+            FROM delivery_batches AS b
+            WHERE b.id = new.batch_id AND NOT b.success
+            ON CONFLICT(day, channel, reason) DO UPDATE SET failures = failures + 1;
+        END
+        """,
+        """
+        INSERT INTO article_daily_stats (day, created, sent, failed)
+        SELECT day, SUM(created), SUM(sent), SUM(failed)
+        FROM (
+            SELECT substr(created_at, 1, 10) AS day, 1 AS created, 0 AS sent, 0 AS failed FROM article_events
+            UNION ALL
+            SELECT substr(COALESCE(last_attempt_at, created_at), 1, 10), 0, status = 'sent', status = 'failed'
+            FROM article_events
+            WHERE status IN ('sent', 'failed')
+        )
+        GROUP BY day
+        """,
+        """
+        INSERT INTO delivery_daily_stats (day, channel, attempts, successes)
+        SELECT substr(b.created_at, 1, 10), b.channel, COUNT(*), SUM(b.success)
+        FROM delivery_batch_items AS i
+        JOIN delivery_batches AS b ON b.id = i.batch_id
+        GROUP BY 1, 2
+        """,
+        f"""
+        INSERT INTO delivery_failure_reasons (day, channel, reason, failures)
+        SELECT substr(b.created_at, 1, 10), b.channel, {_FAILURE_REASON_SQL}, COUNT(*)
+        FROM delivery_batch_items AS i
+        JOIN delivery_batches AS b ON b.id = i.batch_id
+        WHERE NOT b.success
+        GROUP BY 1, 2, 3
+        """,
+    ),
+)
+
+# Version of the article_search migration. Older SQLite libraries cannot build it; the database still opens and
+# /api/search answers every query with its LIKE scan instead.
+SEARCH_INDEX_MIGRATION = 4
+
+
+UPSERT_EVENT_SQL = """
+INSERT INTO article_events (
+    record_key, article_id, url, title, summary,
+    published_at, updated_at, translated_title, translated_summary,
+    source_blocks, translated_blocks,
+    status, created_at, created_ts, sort_ts
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?, ?, ?)
+ON CONFLICT(record_key) DO UPDATE SET
+    title = excluded.title,
+    summary = excluded.summary,
+    published_at = excluded.published_at,
+    updated_at = excluded.updated_at,
+    translated_title = excluded.translated_title,
+    translated_summary = excluded.translated_summary,
+    source_blocks = COALESCE(excluded.source_blocks, article_events.source_blocks),
+    translated_blocks = excluded.translated_blocks,
+    status = CASE
+        WHEN article_events.status = 'sent' THEN 'sent'
+        ELSE 'pending'
+    END
+"""
+
+MARK_SENT_SQL = """
+UPDATE article_events
+SET status = 'sent', sent_channel = ?, sent_at = ?, last_attempt_at = ?, last_error = NULL, sort_ts = ?
+WHERE record_key = ?
+"""
+
+MARK_FAILED_SQL = """
+UPDATE article_events
+SET status = 'failed', last_error = ?, last_attempt_at = ?,
+    sort_ts = CASE WHEN sent_at IS NULL THEN ? ELSE sort_ts END
+WHERE record_key = ?
 """
 
+INSERT_DELIVERY_BATCH_SQL = """
+INSERT INTO delivery_batches (
+    channel, target, success, error_message, response_excerpt, created_at
+) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Links every record key of an attempt in one statement; must run right after INSERT_DELIVERY_BATCH_SQL.
+INSERT_DELIVERY_BATCH_ITEMS_SQL = """
+INSERT OR IGNORE INTO delivery_batch_items (record_key, batch_id)
+SELECT value, last_insert_rowid() FROM json_each(?)
+"""
+
+INSERT_CONTENT_BLOCK_SQL = "INSERT OR IGNORE INTO content_blocks (hash, text) VALUES (?, ?)"
+
+REMEMBER_TRANSLATION_SQL = """
+INSERT INTO translation_memory (source_hash, source_lang, target_lang, translated_hash, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(source_hash, source_lang, target_lang) DO UPDATE SET
+    translated_hash = excluded.translated_hash,
+    updated_at = excluded.updated_at
+"""
+
+Statement = tuple[str, tuple[object, ...]]
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER (999 on older builds) for IN (...) lookups.
+IN_CLAUSE_CHUNK_SIZE = 500
+
+
+def _chunks(values: list[str], size: int = IN_CLAUSE_CHUNK_SIZE) -> Iterator[list[str]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def block_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def _encode_blocks(blocks: Sequence[ArticleBlock], statements: list[Statement]) -> Optional[str]:
+    """Queue the block texts for content_blocks and return the compact [[kind, hash], ...] reference list."""
+    refs: list[list[str]] = []
+    for block in blocks:
+        digest = block_hash(block.text)
+        statements.append((INSERT_CONTENT_BLOCK_SQL, (digest, block.text)))
+        refs.append([block.kind, digest])
+    if not refs:
+        return None
+    return json.dumps(refs, separators=(",", ":"))
+
+
+def read_content_blocks(
+    conn: sqlite3.Connection,
+    encoded_refs: Sequence[Optional[str]],
+) -> list[tuple[ArticleBlock, ...]]:
+    """Resolve block reference lists (as stored in article_events) with one content_blocks lookup."""
+    decoded = [json.loads(refs) if refs else [] for refs in encoded_refs]
+    hashes = list(dict.fromkeys(digest for refs in decoded for _, digest in refs))
+    texts: dict[str, str] = {}
+    for chunk in _chunks(hashes):
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = conn.execute(f"SELECT hash, text FROM content_blocks WHERE hash IN ({placeholders})", chunk)
+        texts.update({str(row[0]): str(row[1]) for row in rows})
+    return [
+        tuple(ArticleBlock(kind=kind, text=texts[digest]) for kind, digest in refs if digest in texts)
+        for refs in decoded
+    ]
+
+
+def _upsert_event_statements(
+    article: Article,
+    translated_title: str,
+    translated_summary: str,
+    translated_blocks: Sequence[ArticleBlock] = (),
+) -> list[Statement]:
+    now = utc_now_iso()
+    now_ms = epoch_ms(now)
+    statements: list[Statement] = []
+    source_refs = _encode_blocks(article.content_blocks, statements)
+    translated_refs = _encode_blocks(translated_blocks, statements)
+    statements.append(
+        (
+            UPSERT_EVENT_SQL,
+            (
+                article.record_key,
+                article.article_id,
+                article.url,
+                article.title,
+                article.summary,
+                article.published_at,
+                article.updated_at,
+                translated_title,
+                translated_summary,
+                source_refs,
+                translated_refs,
+                now,
+                now_ms,
+                now_ms,
+            ),
+        )
+    )
+    return statements
+
+
+def _remember_translation_statements(
+    pairs: Iterable[tuple[str, str]],
+    source_lang: Optional[str],
+    target_lang: str,
+) -> list[Statement]:
+    now = utc_now_iso()
+    statements: list[Statement] = []
+    for source_text, translated_text in pairs:
+        translated_hash = block_hash(translated_text)
+        statements.append((INSERT_CONTENT_BLOCK_SQL, (block_hash(source_text), source_text)))
+        statements.append((INSERT_CONTENT_BLOCK_SQL, (translated_hash, translated_text)))
+        statements.append(
+            (REMEMBER_TRANSLATION_SQL, (block_hash(source_text), source_lang or "", target_lang, translated_hash, now))
+        )
+    return statements
+
+
+def _mark_sent_statement(record_key: str, channel: str) -> Statement:
+    now = utc_now_iso()
+    return MARK_SENT_SQL, (channel, now, now, epoch_ms(now), record_key)
+
+
+def _mark_failed_statement(record_key: str, error_message: str) -> Statement:
+    now = utc_now_iso()
+    return MARK_FAILED_SQL, (error_message[:1000], now, epoch_ms(now), record_key)
+
+
+def _delivery_batch_statements(record_keys: Iterable[str], target: str, result: DeliveryResult) -> list[Statement]:
+    keys = list(dict.fromkeys(record_keys))
+    if not keys:
+        return []
+    batch: Statement = (
+        INSERT_DELIVERY_BATCH_SQL,
+        (
+            result.channel,
+            target,
+            1 if result.success else 0,
+            (result.error_message or "")[:1000] or None,
+            (result.response_excerpt or "")[:1000] or None,
+            utc_now_iso(),
+        ),
+    )
+    # The two statements always alternate, so _execute_statements never merges two batch inserts
+    # into one executemany and last_insert_rowid() always points at this attempt's batch row.
+    return [batch, (INSERT_DELIVERY_BATCH_ITEMS_SQL, (json.dumps(keys),))]
+
+
+class StoreUnitOfWork:
+    """Buffers article writes and applies them in one transaction on flush()."""
+
+    def __init__(self, store: "SQLiteStore"):
+        self._store = store
+        self._pending: list[Statement] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def upsert_event(
+        self,
+        article: Article,
+        translated_title: str,
+        translated_summary: str,
+        translated_blocks: Sequence[ArticleBlock] = (),
+    ) -> None:
+        self._pending.extend(_upsert_event_statements(article, translated_title, translated_summary, translated_blocks))
+
+    def remember_translations(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        *,
+        source_lang: Optional[str],
+        target_lang: str,
+    ) -> None:
+        self._pending.extend(_remember_translation_statements(pairs, source_lang, target_lang))
+
+    def mark_sent(self, record_key: str, channel: str) -> None:
+        self._pending.append(_mark_sent_statement(record_key, channel))
+
+    def mark_failed(self, record_key: str, error_message: str) -> None:
+        self._pending.append(_mark_failed_statement(record_key, error_message))
+
+    def record_delivery_attempt(self, record_key: str, target: str, result: DeliveryResult) -> None:
+        self.record_delivery_batch([record_key], target, result)
+
+    def record_delivery_batch(self, record_keys: Iterable[str], target: str, result: DeliveryResult) -> None:
+        self._pending.extend(_delivery_batch_statements(record_keys, target, result))
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        statements, self._pending = self._pending, []
+        self._store._execute_statements(statements)
+
+
+def _supports_trigram(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(text, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp.trigram_probe")
+    return True
+
+
+_SCHEMA_READY: set[Path] = set()
+_SCHEMA_LOCK = threading.Lock()
+
 
 class SQLiteStore:
     def __init__(self, db_path: Path):
         self.db_path = Path(db_path)
+        self._db = SQLiteConnectionManager(self.db_path)
         self._init_db()
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
-
     def _init_db(self) -> None:
-        with closing(self._connect()) as conn:
-            conn.executescript(SCHEMA)
-            conn.commit()
+        # Schema setup runs once per database file per process, not on every store construction.
+        key = self.db_path.resolve()
+        with _SCHEMA_LOCK:
+            if key in _SCHEMA_READY and self.db_path.exists():
+                return
+            # auto_vacuum only takes effect before the first table exists, i.e. on new databases.
+            self._db.connection().execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self._db.enable_wal()
+            self._migrate()
+            _SCHEMA_READY.add(key)
+
+    def _migrate(self) -> None:
+        with self._db.transaction() as conn:
+            # Re-read inside the write lock so concurrent processes never apply a step twice.
+            version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+            if version == 0:
+                # Version-0 databases may predate some baseline tables; IF NOT EXISTS fills them in.
+                for statement in SCHEMA.split(";"):
+                    if statement.strip():
+                        conn.execute(statement)
+            for target_version, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+                if target_version == SEARCH_INDEX_MIGRATION and not _supports_trigram(conn):
+                    logging.getLogger(__name__).warning(
+                        "SQLite %s has no fts5 trigram tokenizer (needs >= 3.34); search falls back to LIKE",
+                        sqlite3.sqlite_version,
+                    )
+                    statements = ()
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {target_version}")
+
+    def _execute_statements(self, statements: list[Statement]) -> None:
+        # Consecutive statements with the same SQL share one executemany call; order is preserved.
+        with self._db.transaction() as conn:
+            for sql, group in groupby(statements, key=lambda statement: statement[0]):
+                conn.executemany(sql, [params for _, params in group])
+
+    @property
+    def connection_manager(self) -> SQLiteConnectionManager:
+        return self._db
+
+    def lock_wait_stats(self) -> LockWaitStats:
+        return self._db.lock_wait_stats()
+
+    def close(self) -> None:
+        self._db.close()
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[StoreUnitOfWork]:
+        """Collect writes and flush them together; call flush() inside the block for checkpoints."""
+        work = StoreUnitOfWork(self)
+        try:
+            yield work
+        finally:
+            work.flush()
 
     def is_sent(self, record_key: str) -> bool:
-        with closing(self._connect()) as conn:
-            row = conn.execute(
-                "SELECT status FROM article_events WHERE record_key = ?",
-                (record_key,),
-            ).fetchone()
-            return bool(row and row["status"] == "sent")
+        row = self._db.connection().execute(
+            "SELECT status FROM article_events WHERE record_key = ?",
+            (record_key,),
+        ).fetchone()
+        return bool(row and row["status"] == "sent")
+
+    def is_sent_many(self, record_keys: Iterable[str]) -> set[str]:
+        statuses = self.get_statuses(record_keys)
+        return {record_key for record_key, status in statuses.items() if status == "sent"}
+
+    def get_statuses(self, record_keys: Iterable[str]) -> dict[str, str]:
+        keys = list(dict.fromkeys(record_keys))
+        conn = self._db.connection()
+        statuses: dict[str, str] = {}
+        for chunk in _chunks(keys):
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT record_key, status FROM article_events WHERE record_key IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            statuses.update({str(row["record_key"]): str(row["status"]) for row in rows})
+        return statuses
+
+    def get_known_articles(self, article_ids: Iterable[str]) -> dict[str, KnownArticle]:
+        """Return the most recently touched record for each article id already in the store."""
+        ids = list(dict.fromkeys(article_ids))
+        conn = self._db.connection()
+        known: dict[str, KnownArticle] = {}
+        for chunk in _chunks(ids):
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"""
+                SELECT article_id, record_key, status, COALESCE(last_attempt_at, created_at) AS seen_at
+                FROM article_events
+                WHERE article_id IN ({placeholders})
+                """,
+                chunk,
+            ).fetchall()
+            for row in rows:
+                candidate = KnownArticle(
+                    article_id=str(row["article_id"]),
+                    record_key=str(row["record_key"]),
+                    status=str(row["status"]),
+                    seen_at=str(row["seen_at"]),
+                )
+                current = known.get(candidate.article_id)
+                if current is None or candidate.seen_at > current.seen_at:
+                    known[candidate.article_id] = candidate
+        return known
+
+    def get_delivered_targets(self, record_keys: Iterable[str]) -> dict[str, dict[str, str]]:
+        """Return, per record key, each target that already has a successful delivery and the channel used."""
+        keys = list(dict.fromkeys(record_keys))
+        conn = self._db.connection()
+        delivered: dict[str, dict[str, str]] = {}
+        for chunk in _chunks(keys):
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"""
+                SELECT i.record_key, b.target, b.channel
+                FROM delivery_batch_items AS i
+                JOIN delivery_batches AS b ON b.id = i.batch_id
+                WHERE i.record_key IN ({placeholders}) AND b.success = 1
+                ORDER BY b.id
+                """,
+                chunk,
+            ).fetchall()
+            for row in rows:
+                delivered.setdefault(str(row["record_key"]), {})[str(row["target"])] = str(row["channel"])
+        return delivered
 
     def upsert_event(
         self,
         article: Article,
         translated_title: str,
         translated_summary: str,
+        translated_blocks: Sequence[ArticleBlock] = (),
     ) -> None:
-        now = utc_now_iso()
-        with closing(self._connect()) as conn:
-            conn.execute(
-                """
-                INSERT INTO article_events (
-                    record_key, article_id, url, title, summary,
-                    published_at, updated_at, translated_title, translated_summary,
-                    status, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)
-                ON CONFLICT(record_key) DO UPDATE SET
-                    title = excluded.title,
-                    summary = excluded.summary,
-                    published_at = excluded.published_at,
-                    updated_at = excluded.updated_at,
-                    translated_title = excluded.translated_title,
-                    translated_summary = excluded.translated_summary,
-                    status = CASE
-                        WHEN article_events.status = 'sent' THEN 'sent'
-                        ELSE 'pending'
-                    END
+        self._execute_statements(
+            _upsert_event_statements(article, translated_title, translated_summary, translated_blocks)
+        )
+
+    def remember_translations(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        *,
+        source_lang: Optional[str],
+        target_lang: str,
+    ) -> None:
+        statements = _remember_translation_statements(pairs, source_lang, target_lang)
+        if statements:
+            self._execute_statements(statements)
+
+    def get_translation_memory(
+        self,
+        texts: Iterable[str],
+        *,
+        source_lang: Optional[str],
+        target_lang: str,
+    ) -> dict[str, str]:
+        """Return previously stored translations for the given block texts."""
+        by_hash = {block_hash(text): text for text in texts}
+        conn = self._db.connection()
+        found: dict[str, str] = {}
+        for chunk in _chunks(list(by_hash)):
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"""
+                SELECT m.source_hash, b.text
+                FROM translation_memory AS m
+                JOIN content_blocks AS b ON b.hash = m.translated_hash
+                WHERE m.source_lang = ? AND m.target_lang = ? AND m.source_hash IN ({placeholders})
                 """,
-                (
-                    article.record_key,
-                    article.article_id,
-                    article.url,
-                    article.title,
-                    article.summary,
-                    article.published_at,
-                    article.updated_at,
-                    translated_title,
-                    translated_summary,
-                    now,
-                ),
-            )
-            conn.commit()
+                [source_lang or "", target_lang, *chunk],
+            ).fetchall()
+            found.update({by_hash[str(row[0])]: str(row[1]) for row in rows})
+        return found
+
+    def get_article_blocks(self, record_key: str) -> tuple[tuple[ArticleBlock, ...], tuple[ArticleBlock, ...]]:
+        """Return (source blocks, translated blocks) for a stored article; empty when none were stored."""
+        conn = self._db.connection()
+        row = conn.execute(
+            "SELECT source_blocks, translated_blocks FROM article_events WHERE record_key = ?",
+            (record_key,),
+        ).fetchone()
+        if row is None:
+            return (), ()
+        source, translated = read_content_blocks(conn, [row["source_blocks"], row["translated_blocks"]])
+        return source, translated
 
     def mark_sent(self, record_key: str, channel: str) -> None:
-        now = utc_now_iso()
-        with closing(self._connect()) as conn:
-            conn.execute(
+        self._execute_statements([_mark_sent_statement(record_key, channel)])
+
+    def mark_failed(self, record_key: str, error_message: str) -> None:
+        self._execute_statements([_mark_failed_statement(record_key, error_message)])
+
+    def record_delivery_attempt(self, record_key: str, target: str, result: DeliveryResult) -> None:
+        self.record_delivery_batch([record_key], target, result)
+
+    def record_delivery_batch(self, record_keys: Iterable[str], target: str, result: DeliveryResult) -> None:
+        """Record one send attempt covering every given article."""
+        statements = _delivery_batch_statements(record_keys, target, result)
+        if statements:
+            self._execute_statements(statements)
+
+    def read_changes(self, after_seq: int = 0, limit: int = 500) -> list[ChangeEntry]:
+        """Return up to limit change-log entries with seq > after_seq, oldest first."""
+        rows = self._db.connection().execute(
+            """
+            SELECT seq, record_key, op, status, changed_ts
+            FROM changes
+            WHERE seq > ?
+            ORDER BY seq
+            LIMIT ?
+            """,
+            (int(after_seq), max(1, int(limit))),
+        ).fetchall()
+        return [
+            ChangeEntry(
+                seq=int(row["seq"]),
+                record_key=str(row["record_key"]),
+                op=str(row["op"]),
+                status=row["status"],
+                changed_ts=int(row["changed_ts"]),
+            )
+            for row in rows
+        ]
+
+    def change_log_bounds(self) -> tuple[int, int]:
+        """
+        Return (oldest retained seq, latest seq); both are 0 for an empty log.
+        A reader whose cursor is below oldest - 1 missed compacted entries and should resync from the tables.
+        """
+        row = self._db.connection().execute(
+            """
+            SELECT
+                COALESCE((SELECT MIN(seq) FROM changes), 0),
+                COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'changes'), 0)
+            """
+        ).fetchone()
+        return int(row[0]), int(row[1])
+
+    def compact_changes(self, *, max_age_days: Optional[int] = None) -> int:
+        """
+        Drop entries superseded by a later entry for the same record_key, and optionally everything older
+        than max_age_days. Readers only need the latest entry per key, so the first step loses nothing.
+        """
+        with self._db.transaction() as conn:
+            removed = conn.execute(
                 """
-                UPDATE article_events
-                SET status = 'sent', sent_channel = ?, sent_at = ?, last_attempt_at = ?, last_error = NULL
-                WHERE record_key = ?
-                """,
-                (channel, now, now, record_key),
+                DELETE FROM changes
+                WHERE seq < (SELECT MAX(c.seq) FROM changes AS c WHERE c.record_key = changes.record_key)
+                """
+            ).rowcount
+            if max_age_days is not None:
+                cutoff_ms = epoch_ms(utc_now_iso()) - int(max_age_days) * 86_400_000
+                removed += conn.execute("DELETE FROM changes WHERE changed_ts < ?", (cutoff_ms,)).rowcount
+        return removed
+
+    def get_event_status(self, record_key: str) -> Optional[str]:
+        row = self._db.connection().execute(
+            "SELECT status FROM article_events WHERE record_key = ?",
+            (record_key,),
+        ).fetchone()
+        if not row:
+            return None
+        return str(row["status"])
+
+    def get_sent_translation_by_title(self, title: str) -> Optional[tuple[str, str]]:
+        cached = self.get_sent_translation_with_blocks(title)
+        if cached is None:
+            return None
+        return cached[0], cached[1]
+
+    def get_sent_translation_with_blocks(
+        self,
+        title: str,
+    ) -> Optional[tuple[str, str, tuple[ArticleBlock, ...]]]:
+        """Like get_sent_translation_by_title, plus the stored translated blocks (empty for legacy rows)."""
+        conn = self._db.connection()
+        row = conn.execute(
+            """
+            SELECT translated_title, translated_summary, translated_blocks
+            FROM article_events
+            WHERE title = ? AND status = 'sent'
+            ORDER BY sort_ts DESC
+            LIMIT 1
+            """,
+            (title,),
+        ).fetchone()
+        if not row:
+            return None
+        translated_title = str(row["translated_title"])
+        translated_summary = str(row["translated_summary"])
+        if not translated_title or not translated_summary:
+            return None
+        (translated_blocks,) = read_content_blocks(conn, [row["translated_blocks"]])
+        return translated_title, translated_summary, translated_blocks
+
+    def get_homepage_snapshot(self, feed: str) -> dict[str, HomepageEntry]:
+        rows = self._db.connection().execute(
+            """
+            SELECT url, position, last_checked_at
+            FROM homepage_urls
+            WHERE feed = ?
+            """,
+            (feed,),
+        ).fetchall()
+        return {
+            str(row["url"]): HomepageEntry(
+                url=str(row["url"]),
+                position=int(row["position"]),
+                last_checked_at=row["last_checked_at"],
             )
-            conn.commit()
+            for row in rows
+        }
 
-    def mark_failed(self, record_key: str, error_message: str) -> None:
+    def save_homepage_snapshot(self, feed: str, urls: list[str], check_times: Mapping[str, str]) -> None:
         now = utc_now_iso()
-        with closing(self._connect()) as conn:
+        with self._db.transaction() as conn:
             conn.execute(
-                """
-                UPDATE article_events
-                SET status = 'failed', last_error = ?, last_attempt_at = ?
-                WHERE record_key = ?
-                """,
-                (error_message[:1000], now, record_key),
+                "CREATE TEMP TABLE IF NOT EXISTS current_homepage_urls (url TEXT PRIMARY KEY)"
+            )
+            conn.execute("DELETE FROM current_homepage_urls")
+            conn.executemany(
+                "INSERT OR IGNORE INTO current_homepage_urls (url) VALUES (?)",
+                [(url,) for url in urls],
             )
-            conn.commit()
-
-    def record_delivery_attempt(self, record_key: str, target: str, result: DeliveryResult) -> None:
-        with closing(self._connect()) as conn:
             conn.execute(
                 """
-                INSERT INTO deliveries (
-                    record_key, channel, target, success,
-                    error_message, response_excerpt, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                DELETE FROM homepage_urls
+                WHERE feed = ? AND url NOT IN (SELECT url FROM current_homepage_urls)
                 """,
-                (
-                    record_key,
-                    result.channel,
-                    target,
-                    1 if result.success else 0,
-                    (result.error_message or "")[:1000] or None,
-                    (result.response_excerpt or "")[:1000] or None,
-                    utc_now_iso(),
-                ),
+                (feed,),
             )
-            conn.commit()
-
-    def get_event_status(self, record_key: str) -> Optional[str]:
-        with closing(self._connect()) as conn:
-            row = conn.execute(
-                "SELECT status FROM article_events WHERE record_key = ?",
-                (record_key,),
-            ).fetchone()
-            if not row:
-                return None
-            return str(row["status"])
-
-    def get_sent_translation_by_title(self, title: str) -> Optional[tuple[str, str]]:
-        with closing(self._connect()) as conn:
-            row = conn.execute(
+            conn.executemany(
                 """
-                SELECT translated_title, translated_summary
-                FROM article_events
-                WHERE title = ? AND status = 'sent'
-                ORDER BY COALESCE(sent_at, last_attempt_at, created_at) DESC
-                LIMIT 1
+                INSERT INTO homepage_urls (
+                    feed, url, position, first_seen_at, last_seen_at, last_checked_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(feed, url) DO UPDATE SET
+                    position = excluded.position,
+                    last_seen_at = excluded.last_seen_at,
+                    last_checked_at = COALESCE(excluded.last_checked_at, homepage_urls.last_checked_at)
                 """,
-                (title,),
-            ).fetchone()
-            if not row:
-                return None
-            translated_title = str(row["translated_title"])
-            translated_summary = str(row["translated_summary"])
-            if not translated_title or not translated_summary:
-                return None
-            return translated_title, translated_summary
+                [
+                    (feed, url, position, now, now, check_times.get(url))
+                    for position, url in enumerate(urls)
+                ],
+            )
@@ -19,6 +19,7 @@ def test_parse_args_uses_expected_defaults(monkeypatch) -> None:
     assert args.refresh_afr_session is False
     assert args.install_launchd is False
     assert args.uninstall_launchd is False
+    assert args.run_retention is False
     assert args.serve_api is False
     assert args.api_host == "127.0.0.1"
     assert args.api_port == 8000
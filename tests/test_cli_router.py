@@ -3,8 +3,8 @@ from pathlib import Path
 import pytest
 import requests
 
-from afr_pusher.cli import _build_router
-from afr_pusher.config import Settings
+from afr_pusher.cli import _build_fanout, _build_router
+from afr_pusher.config import Settings, TelegramTarget
 
 
 def _settings() -> Settings:
@@ -63,3 +63,16 @@ def test_build_router_without_telegram_returns_empty_router() -> None:
 
     assert router.primary is None
     assert router.fallback is None
+
+
+def test_build_fanout_creates_one_router_per_target_with_shared_limiter() -> None:
+    settings = _settings()
+    settings.telegram_targets = (TelegramTarget("-100123456"), TelegramTarget("@afr_plain", parse_mode="none"))
+
+    fanout = _build_fanout(settings, session=requests.Session())
+
+    assert fanout.targets == ["-100123456", "@afr_plain"]
+    first, second = (fanout.routers[target].primary for target in fanout.targets)
+    assert (first.chat_id, first.parse_mode) == ("-100123456", "HTML")
+    assert (second.chat_id, second.parse_mode) == ("@afr_plain", None)
+    assert first.rate_limiter is second.rate_limiter
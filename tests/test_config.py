@@ -156,3 +156,21 @@ def test_settings_from_files_keeps_os_env_as_highest_priority(tmp_path: Path) ->
     )
 
     assert settings.telegram_bot_token == "os-token"
+
+
+def test_settings_from_files_reads_telegram_targets(tmp_path: Path) -> None:
+    config_file = tmp_path / "config.ini"
+    config_file.write_text(
+        "[sender]\nTELEGRAM_CHAT_ID=-100999\nTELEGRAM_TARGETS=-1001, @afr_cn:MarkdownV2 ,12345:none,-1001\n",
+        encoding="utf-8",
+    )
+
+    settings = Settings.from_files(config_file=config_file, env_file=tmp_path / ".env", base_env={})
+
+    assert [(target.chat_id, target.parse_mode) for target in settings.delivery_targets()] == [
+        ("-1001", None),
+        ("@afr_cn", "MarkdownV2"),
+        ("12345", "none"),
+    ]
+    settings.telegram_targets = ()
+    assert [target.chat_id for target in settings.delivery_targets()] == ["-100999"]
@@ -0,0 +1,78 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from afr_pusher.db import SQLiteConnectionManager
+from afr_pusher.store import SQLiteStore
+
+
+def test_connection_manager_reuses_connection_per_thread(tmp_path: Path) -> None:
+    manager = SQLiteConnectionManager(tmp_path / "reuse.db")
+    main_conn = manager.connection()
+    assert manager.connection() is main_conn
+
+    other: list[sqlite3.Connection] = []
+    worker = threading.Thread(target=lambda: other.append(manager.connection()))
+    worker.start()
+    worker.join()
+
+    assert other[0] is not main_conn
+    assert main_conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert main_conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    manager.close()
+
+
+def test_store_enables_wal_mode(tmp_path: Path) -> None:
+    db_path = tmp_path / "wal.db"
+    SQLiteStore(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_transaction_records_lock_wait(tmp_path: Path) -> None:
+    db_path = tmp_path / "lock.db"
+    store = SQLiteStore(db_path)
+    before = store.lock_wait_stats()
+    blocker = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    blocker.execute("BEGIN IMMEDIATE")
+    release = threading.Timer(0.05, lambda: blocker.execute("COMMIT"))
+    release.start()
+
+    started = time.perf_counter()
+    store.save_homepage_snapshot("main", ["https://a"], {})
+    release.join()
+
+    stats = store.lock_wait_stats()
+    assert stats.waits == before.waits + 1
+    assert 0.03 <= stats.max_sec <= time.perf_counter() - started
+    blocker.close()
+
+
+def test_read_only_manager_rejects_writes_and_reads_through_checkpoints(tmp_path: Path) -> None:
+    db_path = tmp_path / "ro.db"
+    store = SQLiteStore(db_path)
+    store.save_homepage_snapshot("main", ["https://a"], {})
+    readers = SQLiteConnectionManager(db_path, read_only=True)
+
+    with readers.reading() as conn:
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM homepage_urls").fetchone()[0] == 1
+        try:
+            conn.execute("DELETE FROM homepage_urls")
+        except sqlite3.OperationalError:
+            pass
+        else:
+            raise AssertionError("read-only connection accepted a write")
+
+    store.save_homepage_snapshot("other", ["https://b"], {})
+    writer = store.connection_manager.connection()
+    assert writer.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0] == 0
+    with readers.reading() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM homepage_urls").fetchone()[0] == 2
+
+    stats = readers.read_stats()
+    assert (stats.connections, stats.acquires, stats.queries) == (1, 2, 2)
+    assert stats.query_total_sec >= stats.query_max_sec > 0
+    readers.close()
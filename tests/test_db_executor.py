@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+import pytest
+
+from afr_pusher.db_executor import DatabaseBusyError, DatabaseExecutor
+
+
+def test_executor_runs_calls_on_its_own_threads() -> None:
+    executor = DatabaseExecutor(workers=2, max_pending=0)
+
+    async def main() -> list[str]:
+        return await asyncio.gather(*(executor.run(lambda: threading.current_thread().name) for _ in range(2)))
+
+    names = asyncio.run(main())
+    assert all(name.startswith("afr-db") for name in names)
+    stats = executor.stats()
+    assert (stats.completed, stats.rejected, stats.in_flight) == (2, 0, 0)
+    executor.shutdown()
+
+
+def test_executor_rejects_work_beyond_the_backlog() -> None:
+    executor = DatabaseExecutor(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def main() -> list[object]:
+        calls = [asyncio.ensure_future(executor.run(release.wait, 5)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(DatabaseBusyError):
+            await executor.run(release.wait, 5)
+        release.set()
+        return await asyncio.gather(*calls)
+
+    assert asyncio.run(main()) == [True, True]
+    stats = executor.stats()
+    assert (stats.completed, stats.rejected, stats.in_flight) == (2, 1, 0)
+    executor.shutdown()
@@ -0,0 +1,58 @@
+import threading
+
+from afr_pusher.models import DeliveryResult
+from afr_pusher.senders.base import Sender
+from afr_pusher.senders.fanout import FanoutDelivery
+from afr_pusher.senders.router import SenderRouter
+
+
+class BarrierSender(Sender):
+    """Succeeds only once every target is sending at the same time."""
+
+    name = "barrier"
+
+    def __init__(self, barrier: threading.Barrier):
+        self.barrier = barrier
+
+    def send(self, target: str, message: str) -> DeliveryResult:
+        self.barrier.wait(timeout=5)
+        return DeliveryResult(channel=self.name, success=True, response_excerpt=target)
+
+
+class RaisingSender(Sender):
+    name = "raising"
+
+    def send(self, target: str, message: str) -> DeliveryResult:
+        raise RuntimeError("connection reset")
+
+
+def test_fanout_sends_to_all_targets_concurrently_in_target_order() -> None:
+    barrier = threading.Barrier(3)
+    sender = BarrierSender(barrier)
+    fanout = FanoutDelivery({target: SenderRouter(primary=sender, fallback=None) for target in ("a", "b", "c")})
+
+    deliveries = fanout.send("hello")
+
+    assert [delivery.target for delivery in deliveries] == ["a", "b", "c"]
+    assert [delivery.routed.final_result.response_excerpt for delivery in deliveries] == ["a", "b", "c"]
+    assert all(delivery.routed.final_result.success for delivery in deliveries)
+
+
+def test_fanout_reports_raising_target_without_blocking_others() -> None:
+    barrier = threading.Barrier(2)
+    fanout = FanoutDelivery(
+        {
+            "a": SenderRouter(primary=BarrierSender(barrier), fallback=None),
+            "broken": SenderRouter(primary=RaisingSender(), fallback=None),
+            "c": SenderRouter(primary=BarrierSender(barrier), fallback=None),
+        }
+    )
+
+    deliveries = fanout.send("hello")
+
+    results = {delivery.target: delivery.routed.final_result for delivery in deliveries}
+    assert results["a"].success and results["c"].success
+    assert results["broken"].success is False
+    assert results["broken"].channel == "raising"
+    assert "connection reset" in (results["broken"].error_message or "")
+    assert fanout.has_senders is True
@@ -1,6 +1,11 @@
+from pathlib import Path
+from typing import Optional
+
 from bs4 import BeautifulSoup
 
 from afr_pusher.fetchers.afr import AFRFetcher
+from afr_pusher.models import Article
+from afr_pusher.store import SQLiteStore
 
 
 def test_extract_article_urls_filters_and_dedupes() -> None:
@@ -174,3 +179,174 @@ def test_fetch_article_falls_back_to_page_content_when_api_has_no_body(monkeypat
     assert article.content is not None
     assert "longer fallback paragraph" in article.content
     assert "old HTML-based behaviour intact" in article.content
+
+
+def _homepage_html(*slugs: str) -> str:
+    links = "".join(f'<a href="/markets/{slug}">x</a>' for slug in slugs)
+    return f"<html><body>{links}</body></html>"
+
+
+def _article_html(title: str) -> str:
+    return f"""
+    <html>
+      <head>
+        <meta property="og:title" content="{title}">
+        <meta name="description" content="Summary for {title}">
+        <meta property="article:published_time" content="2026-02-07T00:00:00Z">
+      </head>
+      <body><article><p>Body paragraph long enough to be extracted as article content for {title}.</p></article></body>
+    </html>
+    """
+
+
+def _homepage_fetcher(
+    monkeypatch,
+    pages: dict[str, str],
+    store: Optional[SQLiteStore] = None,
+) -> tuple[AFRFetcher, list[str]]:
+    """A fetcher serving pages["homepage"] and a generated page per article; returns it and the article GETs."""
+    fetcher = AFRFetcher(
+        homepage_url="https://www.afr.com",
+        timeout_sec=5,
+        user_agent="ua",
+        store=store,
+        feed_name="main",
+    )
+    fetched_urls: list[str] = []
+
+    def fake_get_text(url: str) -> str:
+        if url == "https://www.afr.com":
+            return pages["homepage"]
+        fetched_urls.append(url)
+        return _article_html(url.rsplit("/", 1)[-1])
+
+    monkeypatch.setattr(fetcher, "_get_text", fake_get_text)
+    return fetcher, fetched_urls
+
+
+def _deliver(store: SQLiteStore, articles: list[Article]) -> None:
+    for article in articles:
+        store.upsert_event(article, article.title, article.summary)
+        store.mark_sent(article.record_key, "telegram-bot")
+
+
+def _store_shared_article(store: SQLiteStore) -> str:
+    """Store paaa111 as another feed (street-talk) would have, and return its record key."""
+    article = Article(
+        article_id="paaa111",
+        record_key="paaa111:2026-02-07T00:00:00+00:00",
+        url="https://www.afr.com/street-talk/a-20260207-paaa111",
+        title="Shared",
+        summary="Summary",
+        published_at="2026-02-07T00:00:00+00:00",
+        updated_at=None,
+    )
+    store.upsert_event(article, translated_title="Shared", translated_summary="Summary")
+    return article.record_key
+
+
+def test_fetch_recent_only_fetches_new_homepage_urls_on_later_runs(tmp_path: Path, monkeypatch) -> None:
+    store = SQLiteStore(tmp_path / "delta.db")
+    pages = {"homepage": _homepage_html("a-20260207-paaa111", "b-20260207-pbbb222")}
+    fetcher, fetched_urls = _homepage_fetcher(monkeypatch, pages, store)
+
+    first = fetcher.fetch_recent(limit=5)
+    assert len(first) == 2
+    assert len(fetched_urls) == 2
+    _deliver(store, first)
+
+    fetched_urls.clear()
+    assert fetcher.fetch_recent(limit=5) == []
+    assert fetched_urls == []
+
+    pages["homepage"] = _homepage_html("c-20260207-pccc333", "a-20260207-paaa111", "b-20260207-pbbb222")
+    articles = fetcher.fetch_recent(limit=5)
+    assert fetched_urls == ["https://www.afr.com/markets/c-20260207-pccc333"]
+    assert [article.article_id for article in articles] == ["pccc333"]
+    _deliver(store, articles)
+
+    # A fresh fetcher (one-shot run) reads the previous snapshot back from SQLite.
+    restarted, fetched_urls = _homepage_fetcher(monkeypatch, pages, store)
+    assert restarted.fetch_recent(limit=5) == []
+    assert fetched_urls == []
+
+
+def test_fetch_recent_fetches_no_more_articles_than_limit(tmp_path: Path, monkeypatch) -> None:
+    store = SQLiteStore(tmp_path / "limit.db")
+    slugs = [f"story{idx}-20260207-p{idx:03d}abc" for idx in range(30)]
+    pages = {"homepage": _homepage_html(*slugs)}
+    fetcher, fetched_urls = _homepage_fetcher(monkeypatch, pages, store)
+
+    fetch_counts = []
+    for _ in range(4):
+        fetched_urls.clear()
+        _deliver(store, fetcher.fetch_recent(limit=10))
+        fetch_counts.append(len(fetched_urls))
+
+    # Every link is fetched once, at most limit per run, and then the unchanged homepage costs nothing.
+    assert fetch_counts == [10, 10, 10, 0]
+
+    restarted, fetched_urls = _homepage_fetcher(monkeypatch, pages, store)
+    assert restarted.fetch_recent(limit=1) == []
+    assert fetched_urls == []
+
+
+def test_fetch_recent_refetches_articles_whose_send_failed(tmp_path: Path, monkeypatch) -> None:
+    store = SQLiteStore(tmp_path / "retry.db")
+    pages = {"homepage": _homepage_html("a-20260207-paaa111", "b-20260207-pbbb222")}
+    fetcher, fetched_urls = _homepage_fetcher(monkeypatch, pages, store)
+
+    sent, failed = sorted(fetcher.fetch_recent(limit=5), key=lambda article: article.article_id)
+    for article in (sent, failed):
+        store.upsert_event(article, article.title, article.summary)
+    store.mark_sent(sent.record_key, "telegram-bot")
+    store.mark_failed(failed.record_key, "Telegram error: Too Many Requests")
+
+    fetched_urls.clear()
+    retried = fetcher.fetch_recent(limit=5)
+    assert fetched_urls == [failed.url]
+    assert [article.record_key for article in retried] == [failed.record_key]
+
+
+def test_fetch_recent_rechecks_promoted_and_stale_urls(monkeypatch) -> None:
+    pages = {"homepage": _homepage_html("a-20260207-paaa111", "b-20260207-pbbb222", "c-20260207-pccc333")}
+    fetcher, fetched_urls = _homepage_fetcher(monkeypatch, pages)
+    fetcher.fetch_recent(limit=5)
+
+    fetched_urls.clear()
+    pages["homepage"] = _homepage_html("c-20260207-pccc333", "a-20260207-paaa111", "b-20260207-pbbb222")
+    fetcher.fetch_recent(limit=5)
+    assert fetched_urls == ["https://www.afr.com/markets/c-20260207-pccc333"]
+
+    fetched_urls.clear()
+    fetcher.recheck_interval_sec = 0
+    fetcher.fetch_recent(limit=5)
+    assert len(fetched_urls) == 3
+
+
+def test_fetch_recent_skips_articles_already_stored_by_another_feed(tmp_path: Path, monkeypatch) -> None:
+    store = SQLiteStore(tmp_path / "shared.db")
+    store.mark_sent(_store_shared_article(store), "telegram-bot")
+    pages = {"homepage": _homepage_html("a-20260207-paaa111", "b-20260207-pbbb222")}
+    fetcher, fetched_urls = _homepage_fetcher(monkeypatch, pages, store)
+
+    articles = fetcher.fetch_recent(limit=5)
+    assert fetched_urls == ["https://www.afr.com/markets/b-20260207-pbbb222"]
+    _deliver(store, articles)
+
+    fetched_urls.clear()
+    fetcher.fetch_recent(limit=5)
+    assert fetched_urls == []
+
+
+def test_fetch_recent_refetches_failed_articles_stored_by_another_feed(tmp_path: Path, monkeypatch) -> None:
+    store = SQLiteStore(tmp_path / "shared.db")
+    store.mark_failed(_store_shared_article(store), "timeout")
+    pages = {"homepage": _homepage_html("a-20260207-paaa111", "b-20260207-pbbb222")}
+    fetcher, fetched_urls = _homepage_fetcher(monkeypatch, pages, store)
+
+    fetcher.fetch_recent(limit=5)
+    assert fetched_urls == [
+        "https://www.afr.com/markets/a-20260207-paaa111",
+        "https://www.afr.com/markets/b-20260207-pbbb222",
+    ]
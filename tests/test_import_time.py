@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import afr_pusher
+
+# Cumulative import time of afr_pusher.cli in a fresh interpreter; before the imports were split per mode
+# it was ~550 ms because FastAPI and uvicorn were loaded for every run. Wall-clock budgets are unreliable on
+# loaded CI machines, so the timing check only runs when AFR_IMPORT_BUDGET_MS is set (e.g. 200 locally).
+IMPORT_BUDGET_ENV = "AFR_IMPORT_BUDGET_MS"
+WEB_STACK = {"fastapi", "starlette", "pydantic", "uvicorn"}
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Run statement under -X importtime and return module name -> cumulative microseconds."""
+    env = dict(os.environ, PYTHONPATH=str(Path(afr_pusher.__file__).resolve().parent.parent))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _top_level(times: dict[str, int]) -> set[str]:
+    return {name.split(".")[0] for name in times}
+
+
+def test_cli_import_loads_no_mode_specific_dependencies() -> None:
+    times = _import_times("import afr_pusher.cli")
+
+    assert not _top_level(times) & (WEB_STACK | {"bs4", "requests", "playwright"})
+
+
+@pytest.mark.skipif(not os.environ.get(IMPORT_BUDGET_ENV), reason=f"set {IMPORT_BUDGET_ENV} to check import time")
+def test_cli_import_stays_within_time_budget() -> None:
+    times = _import_times("import afr_pusher.cli")
+
+    assert times["afr_pusher.cli"] / 1000 < float(os.environ[IMPORT_BUDGET_ENV])
+
+
+def test_pusher_modules_do_not_import_web_stack() -> None:
+    times = _import_times(
+        "import afr_pusher.pipeline, afr_pusher.snapshot, afr_pusher.retention, "
+        "afr_pusher.senders.telegram, afr_pusher.translators"
+    )
+
+    assert not _top_level(times) & WEB_STACK
+
+
+def test_api_module_does_not_import_fetcher_or_server() -> None:
+    times = _import_times("import afr_pusher.miniapp_api")
+
+    assert not _top_level(times) & {"bs4", "uvicorn", "playwright"}
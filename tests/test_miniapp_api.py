@@ -1,10 +1,17 @@
+import asyncio
+import threading
+import time
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
+from fastapi.testclient import TestClient
 
+from afr_pusher import miniapp_api
+from afr_pusher.change_feed import format_sse
 from afr_pusher.miniapp_api import _parse_cors_origins, _resolve_api_key, build_app
-from afr_pusher.miniapp_api import MiniAppArticleStore
-from afr_pusher.models import Article, DeliveryResult
+from afr_pusher.miniapp_store import COMPACT_LIST_FIELDS, MiniAppArticleStore
+from afr_pusher.models import Article, ArticleBlock, DeliveryResult
 from afr_pusher.store import SQLiteStore
 
 
@@ -51,7 +58,15 @@ def test_miniapp_store_get_article_returns_delivery_history(tmp_path: Path) -> N
     store = SQLiteStore(db_path)
     article = _article(3)
 
-    store.upsert_event(article, translated_title="Detail Title", translated_summary="Detail Summary")
+    store.upsert_event(
+        article,
+        translated_title="Detail Title",
+        translated_summary="Detail Summary",
+        translated_blocks=(
+            ArticleBlock(kind="paragraph", text="Detail Summary"),
+            ArticleBlock(kind="list_item", text="Point"),
+        ),
+    )
     store.record_delivery_attempt(
         article.record_key,
         "target-room",
@@ -64,6 +79,11 @@ def test_miniapp_store_get_article_returns_delivery_history(tmp_path: Path) -> N
     assert item is not None
     assert item["record_key"] == article.record_key
     assert item["translated_summary"] == "Detail Summary"
+    assert item["source_blocks"] == []
+    assert item["translated_blocks"] == [
+        {"kind": "paragraph", "text": "Detail Summary"},
+        {"kind": "list_item", "text": "Point"},
+    ]
 
     deliveries = item["deliveries"]
     assert isinstance(deliveries, list)
@@ -99,3 +119,489 @@ def test_resolve_api_key_raises_when_missing(monkeypatch) -> None:
     monkeypatch.delenv("MINIAPP_API_KEY", raising=False)
     with pytest.raises(ValueError):
         _resolve_api_key(None)
+
+
+def test_miniapp_store_list_articles_uses_sort_index(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-plan.db"
+    store = SQLiteStore(db_path)
+    for idx in range(1, 4):
+        store.upsert_event(_article(idx), translated_title=f"T{idx}", translated_summary=f"S{idx}")
+    store.mark_sent(_article(1).record_key, "telegram")
+    # Explicit sort keys: the sent article is newest, the other two tie and fall back to record_key DESC.
+    with store.connection_manager.connection() as conn:
+        conn.execute("UPDATE article_events SET sort_ts = CASE status WHEN 'sent' THEN 3000 ELSE 1000 END")
+
+    api_store = MiniAppArticleStore(db_path)
+    items = api_store.list_articles(limit=3)
+    tied = sorted([_article(2).record_key, _article(3).record_key], reverse=True)
+    assert [item["record_key"] for item in items] == [_article(1).record_key, *tied]
+
+    conn = api_store._db.connection()
+    for where in ("", "WHERE status = 'sent'"):
+        plan = " ".join(
+            str(row[3])
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM article_events {where} ORDER BY sort_ts DESC, record_key DESC LIMIT 20"
+            )
+        )
+        assert "idx_article_events" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_miniapp_store_search_ranks_matches_and_stays_in_sync(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-search.db"
+    store = SQLiteStore(db_path)
+    in_title = replace(_article(1), title="Reserve Bank holds rates")
+    in_summary = replace(_article(2), summary="Analysts expect the Reserve Bank to move")
+    store.upsert_event(in_title, translated_title="澳洲联储维持利率不变", translated_summary="利率")
+    store.upsert_event(in_summary, translated_title="分析师观点", translated_summary="市场预期澳洲联储将调整")
+    store.upsert_event(_article(3), translated_title="T3", translated_summary="S3")
+    api_store = MiniAppArticleStore(db_path)
+
+    items, has_more = api_store.search_articles("reserve bank")
+    assert [item["record_key"] for item in items] == [in_title.record_key, in_summary.record_key]
+    assert has_more is False
+    assert items[0]["snippet"] == "【Reserve】 【Bank】 holds rates"
+
+    items, _ = api_store.search_articles("澳洲联储")
+    assert {item["record_key"] for item in items} == {in_title.record_key, in_summary.record_key}
+
+    # Two-character CJK terms are below the trigram minimum and use the LIKE fallback.
+    items, _ = api_store.search_articles("利率")
+    assert [item["record_key"] for item in items] == [in_title.record_key]
+    assert "【利率】" in str(items[0]["snippet"])
+
+    store.upsert_event(in_title, translated_title="新标题", translated_summary="新内容")
+    assert [item["record_key"] for item in api_store.search_articles("澳洲联储")[0]] == [in_summary.record_key]
+
+
+def test_store_opens_without_trigram_support_and_search_uses_like(tmp_path: Path, monkeypatch) -> None:
+    from afr_pusher import store as store_module
+
+    monkeypatch.setattr(store_module, "_supports_trigram", lambda conn: False)
+    db_path = tmp_path / "miniapp-no-trigram.db"
+    store = SQLiteStore(db_path)
+    matching = replace(_article(1), title="Reserve Bank holds rates")
+    store.upsert_event(matching, translated_title="澳洲联储维持利率不变", translated_summary="利率")
+    store.upsert_event(_article(2), translated_title="T2", translated_summary="S2")
+    api_store = MiniAppArticleStore(db_path)
+
+    conn = api_store._db.connection()
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name LIKE 'article_search%'").fetchone()[0] == 0
+    items, has_more = api_store.search_articles("reserve bank")
+    assert [item["record_key"] for item in items] == [matching.record_key]
+    assert has_more is False
+
+
+def test_search_endpoint_paginates_with_next_offset(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-search-api.db"
+    store = SQLiteStore(db_path)
+    for idx in range(1, 6):
+        store.upsert_event(_article(idx), translated_title=f"悉尼房价 {idx}", translated_summary="S")
+    client = TestClient(build_app(db_path=db_path, api_key="k"))
+
+    first = client.get("/api/search", params={"q": "悉尼房价", "limit": 3}, headers={"X-API-Key": "k"}).json()
+    assert first["count"] == 3
+    assert first["next_offset"] == 3
+    second = client.get(
+        "/api/search", params={"q": "悉尼房价", "limit": 3, "offset": 3}, headers={"X-API-Key": "k"}
+    ).json()
+    assert second["count"] == 2
+    assert second["next_offset"] is None
+    assert {item["record_key"] for item in first["items"] + second["items"]} == {
+        _article(idx).record_key for idx in range(1, 6)
+    }
+    assert client.get("/api/search", params={"q": "x"}).status_code == 401
+
+
+def test_miniapp_store_pages_with_keyset_cursor(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-pages.db"
+    store = SQLiteStore(db_path)
+    with store.unit_of_work() as work:
+        for idx in range(1, 26):
+            work.upsert_event(_article(idx), translated_title=f"T{idx}", translated_summary="S")
+    # Force sort_ts ties so record_key has to break them.
+    store.connection_manager.connection().execute("UPDATE article_events SET sort_ts = 1000 + rowid / 10")
+    api_store = MiniAppArticleStore(db_path)
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        items, cursor = api_store.list_articles_page(limit=10, cursor=cursor)
+        seen.extend(str(item["record_key"]) for item in items)
+        pages += 1
+        if cursor is None:
+            break
+    expected = [
+        str(row[0])
+        for row in api_store._db.connection().execute(
+            "SELECT record_key FROM article_events ORDER BY sort_ts DESC, record_key DESC"
+        )
+    ]
+    assert pages == 3
+    assert seen == expected
+
+    plan = " ".join(
+        str(row[3])
+        for row in api_store._db.connection().execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM article_events WHERE (sort_ts, record_key) < (?, ?) "
+            "ORDER BY sort_ts DESC, record_key DESC LIMIT 20",
+            (1001, "x"),
+        )
+    )
+    assert plan.startswith("SEARCH article_events USING INDEX idx_article_events_sort")
+    assert "TEMP B-TREE" not in plan
+
+
+def test_articles_endpoint_returns_next_cursor_and_rejects_bad_ones(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-cursor-api.db"
+    store = SQLiteStore(db_path)
+    for idx in range(1, 4):
+        store.upsert_event(_article(idx), translated_title=f"T{idx}", translated_summary="S")
+    client = TestClient(build_app(db_path=db_path, api_key="k"))
+    headers = {"X-API-Key": "k"}
+
+    first = client.get("/api/articles", params={"limit": 2}, headers=headers).json()
+    assert first["count"] == 2 and first["next_cursor"]
+    second = client.get("/api/articles", params={"limit": 2, "cursor": first["next_cursor"]}, headers=headers).json()
+    assert second["count"] == 1 and second["next_cursor"] is None
+    assert client.get("/api/articles", params={"cursor": "not-a-cursor"}, headers=headers).status_code == 400
+
+
+def test_api_answers_conditional_requests_from_the_data_version(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-etag.db"
+    store = SQLiteStore(db_path)
+    store.upsert_event(_article(1), translated_title="T1", translated_summary="S1")
+    client = TestClient(build_app(db_path=db_path, api_key="k"))
+    headers = {"X-API-Key": "k"}
+
+    first = client.get("/api/articles", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert "Last-Modified" in first.headers
+
+    cached = client.get("/api/articles", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert client.get(
+        "/api/articles", headers={**headers, "If-Modified-Since": first.headers["Last-Modified"]}
+    ).status_code == 304
+    assert client.get("/api/articles", headers={"If-None-Match": etag}).status_code == 401
+
+    store.mark_sent(_article(1).record_key, "telegram")
+    changed = client.get("/api/articles", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    store.record_delivery_attempt(_article(1).record_key, "@chat", DeliveryResult(channel="telegram", success=True))
+    detail = client.get(
+        f"/api/articles/{_article(1).record_key}",
+        headers={**headers, "If-None-Match": changed.headers["ETag"]},
+    )
+    assert detail.status_code == 200
+
+
+def test_data_validator_is_reused_until_another_connection_commits(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-validator.db"
+    store = SQLiteStore(db_path)
+    api_store = MiniAppArticleStore(db_path)
+
+    first = api_store.data_validator()
+    assert api_store.data_validator() is first
+    store.upsert_event(_article(1), translated_title="T1", translated_summary="S1")
+    assert api_store.data_validator() != first
+
+
+def test_cache_max_age_allows_shared_caching(tmp_path: Path) -> None:
+    client = TestClient(build_app(db_path=tmp_path / "miniapp-max-age.db", api_key="k", cache_max_age=30))
+    response = client.get("/api/articles", headers={"X-API-Key": "k"})
+    assert response.headers["Cache-Control"] == "public, max-age=30"
+    assert "X-API-Key" in response.headers["Vary"]
+
+
+def test_api_serves_repeated_requests_from_the_response_cache(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "miniapp-cache.db"
+    store = SQLiteStore(db_path)
+    store.upsert_event(_article(1), translated_title="T1", translated_summary="S1")
+    validator_reads: list[int] = []
+    data_validator = MiniAppArticleStore.data_validator
+
+    def counting_validator(self):
+        validator_reads.append(1)
+        return data_validator(self)
+
+    monkeypatch.setattr(MiniAppArticleStore, "data_validator", counting_validator)
+    client = TestClient(build_app(db_path=db_path, api_key="k"))
+    headers = {"X-API-Key": "k"}
+
+    first = client.get("/api/articles", params={"limit": 5}, headers=headers)
+    second = client.get("/api/articles", params={"limit": " 5"}, headers=headers)
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    # conditional_get and the response cache share one validator read per request.
+    assert len(validator_reads) == 2
+
+    store.upsert_event(_article(2), translated_title="T2", translated_summary="S2")
+    third = client.get("/api/articles", params={"limit": 5}, headers=headers).json()
+    assert third["count"] == 2
+
+    payload = client.get("/api/metrics", headers=headers).json()
+    metrics = payload["response_cache"]
+    assert (metrics["hits"], metrics["misses"], metrics["invalidations"]) == (1, 2, 1)
+    assert payload["db_reads"]["queries"] >= 2
+    assert payload["db_reads"]["connections"] >= 1
+    assert "ETag" not in client.get("/api/metrics", headers=headers).headers
+    assert client.get("/api/metrics").status_code == 401
+
+
+def test_api_compresses_large_responses_when_the_client_accepts_gzip(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-gzip.db"
+    store = SQLiteStore(db_path)
+    for idx in range(1, 21):
+        store.upsert_event(_article(idx), translated_title=f"T{idx}", translated_summary="摘要" * 50)
+    client = TestClient(build_app(db_path=db_path, api_key="k", compress_min_bytes=1024))
+    headers = {"X-API-Key": "k"}
+
+    page = client.get("/api/articles", params={"limit": 20}, headers={**headers, "Accept-Encoding": "gzip"})
+    assert page.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in page.headers["Vary"]
+    assert page.json()["count"] == 20
+    plain = client.get("/api/articles", params={"limit": 20}, headers={**headers, "Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.json() == page.json()
+    assert int(page.headers["Content-Length"]) < int(plain.headers["Content-Length"]) // 3
+
+    small = client.get("/api/articles", params={"limit": 1}, headers={**headers, "Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    refused = client.get("/api/articles", params={"limit": 20}, headers={**headers, "Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in refused.headers
+
+
+def test_articles_endpoint_projects_fields_from_the_covering_index(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-fields.db"
+    store = SQLiteStore(db_path)
+    for idx in range(1, 4):
+        store.upsert_event(_article(idx), translated_title=f"T{idx}", translated_summary=f"S{idx}")
+    client = TestClient(build_app(db_path=db_path, api_key="k"))
+    headers = {"X-API-Key": "k"}
+
+    compact = client.get("/api/articles", headers=headers).json()["items"]
+    assert set(compact[0]) == set(COMPACT_LIST_FIELDS)
+    projected = client.get("/api/articles", params={"fields": "summary, title"}, headers=headers).json()["items"]
+    assert projected[0] == {"record_key": _article(3).record_key, "title": "Title 3", "summary": "Summary 3"}
+    bad = client.get("/api/articles", params={"fields": "title,password"}, headers=headers)
+    assert bad.status_code == 400
+    assert bad.json()["error"] == "unknown fields: password"
+
+    conn = MiniAppArticleStore(db_path)._db.connection()
+    columns = ", ".join(COMPACT_LIST_FIELDS)
+    for where in ("", "WHERE status = 'sent'"):
+        plan = " ".join(
+            str(row[3])
+            for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT {columns}, sort_ts FROM article_events {where} "
+                "ORDER BY sort_ts DESC, record_key DESC LIMIT 20"
+            )
+        )
+        assert "USING COVERING INDEX idx_article_events" in plan
+
+
+def test_batch_endpoint_returns_articles_in_request_order(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-batch.db"
+    store = SQLiteStore(db_path)
+    for idx in range(1, 4):
+        store.upsert_event(_article(idx), translated_title=f"T{idx}", translated_summary=f"S{idx}")
+    for attempt in range(12):
+        store.record_delivery_batch(
+            [_article(1).record_key, _article(2).record_key],
+            "telegram:chat",
+            DeliveryResult(channel="telegram", success=False, error_message=f"attempt {attempt}"),
+        )
+    client = TestClient(build_app(db_path=db_path, api_key="k"))
+    headers = {"X-API-Key": "k"}
+    keys = [_article(2).record_key, "missing", _article(3).record_key, _article(1).record_key]
+
+    payload = client.post("/api/articles/batch", json={"record_keys": keys}, headers=headers).json()
+    assert [item["record_key"] for item in payload["items"]] == [keys[0], keys[2], keys[3]]
+    assert payload["missing"] == ["missing"]
+    first = payload["items"][0]
+    assert first == client.get(f"/api/articles/{keys[0]}", headers=headers).json()["item"]
+    assert len(first["deliveries"]) == 10
+    assert [d["error_message"] for d in first["deliveries"][:2]] == ["attempt 11", "attempt 10"]
+    assert payload["items"][1]["deliveries"] == []
+
+    too_many = client.post("/api/articles/batch", json={"record_keys": ["k"] * 51}, headers=headers)
+    assert too_many.status_code == 422
+    assert client.post("/api/articles/batch", json={"record_keys": keys}).status_code == 401
+
+
+def test_long_poll_returns_changes_written_while_waiting(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-feed.db"
+    store = SQLiteStore(db_path)
+    store.upsert_event(_article(1), translated_title="T1", translated_summary="S1")
+    headers = {"X-API-Key": "k"}
+
+    with TestClient(build_app(db_path=db_path, api_key="k", stream_poll_interval=0.02)) as client:
+        backlog = client.get("/api/changes", params={"since": 0, "timeout": 0}, headers=headers).json()
+        assert [(item["op"], item["record_key"]) for item in backlog["items"]] == [("insert", _article(1).record_key)]
+        assert backlog["items"][0]["article"]["translated_title"] == "T1"
+        since = backlog["next_since"]
+
+        writer = threading.Timer(0.1, lambda: store.mark_sent(_article(1).record_key, "telegram"))
+        writer.start()
+        started = time.perf_counter()
+        update = client.get("/api/changes", params={"since": since, "timeout": 5}, headers=headers).json()
+        writer.join()
+        assert time.perf_counter() - started < 2
+        assert [item["op"] for item in update["items"]] == ["update"]
+        assert update["items"][0]["article"]["status"] == "sent"
+        assert update["next_since"] == since + 1
+
+        idle = client.get("/api/changes", params={"since": update["next_since"], "timeout": 0}, headers=headers)
+        assert idle.json()["items"] == []
+
+
+def test_format_sse_frames_change_events() -> None:
+    frame = format_sse({"seq": 7, "op": "insert", "record_key": "a", "article": {"title": "澳洲"}})
+    assert frame == 'id: 7\nevent: change\ndata: {"seq":7,"op":"insert","record_key":"a","article":{"title":"澳洲"}}\n\n'
+
+
+async def _read_stream(app, headers: dict[str, str], until, on_open=None) -> tuple[dict[str, str], list[str]]:
+    """
+    Drive GET /api/stream as a raw ASGI call, collecting SSE frames until until(frames) is true and then
+    disconnecting. TestClient cannot be used here: it buffers the whole body, which never ends for a stream.
+    """
+    disconnected = asyncio.Event()
+    request_sent = False
+    response_headers: dict[str, str] = {}
+    frames: list[str] = []
+    pending = ""
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal pending
+        if message["type"] == "http.response.start":
+            response_headers.update({name.decode(): value.decode() for name, value in message["headers"]})
+            return
+        pending += message.get("body", b"").decode()
+        while "\n\n" in pending:
+            frame, pending = pending.split("\n\n", 1)
+            frames.append(frame)
+            if len(frames) == 1 and on_open is not None:
+                on_open()
+        if until(frames):
+            disconnected.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/stream",
+        "raw_path": b"/api/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), timeout=5)
+    return response_headers, frames
+
+
+def test_stream_pushes_new_changes_and_resumes_from_last_event_id(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(miniapp_api, "STREAM_KEEPALIVE_SEC", 0.05)
+    db_path = tmp_path / "miniapp-stream.db"
+    store = SQLiteStore(db_path)
+    store.upsert_event(_article(1), translated_title="T1", translated_summary="S1")
+    app = build_app(db_path=db_path, api_key="k", stream_poll_interval=0.01, compress_min_bytes=1)
+    headers = {"X-API-Key": "k", "Accept-Encoding": "gzip"}
+
+    def has_change(frames: list[str]) -> bool:
+        return any("event: change" in frame for frame in frames)
+
+    def write_second_article() -> None:
+        store.upsert_event(_article(2), translated_title="T2", translated_summary="S2")
+
+    response_headers, frames = asyncio.run(_read_stream(app, headers, has_change, on_open=write_second_article))
+
+    # Compression is skipped for the event stream, so frames reach the client as they are written.
+    assert response_headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in response_headers
+    assert frames[0] == "retry: 3000"
+    (change,) = [frame for frame in frames if "event: change" in frame]
+    assert _article(2).record_key in change
+    assert _article(1).record_key not in change
+    seq = change.split("\n", 1)[0][len("id: ") :]
+
+    # A reconnect with Last-Event-ID replays what came after it, then idles with keepalive comments.
+    store.mark_sent(_article(2).record_key, "telegram")
+
+    def has_keepalive(frames: list[str]) -> bool:
+        return frames[-1] == ": keepalive"
+
+    _, frames = asyncio.run(_read_stream(app, {**headers, "Last-Event-ID": seq}, has_keepalive))
+
+    changes = [frame for frame in frames if "event: change" in frame]
+    assert len(changes) == 1
+    assert f"id: {int(seq) + 1}" in changes[0]
+    assert '"status":"sent"' in changes[0]
+    assert frames[-1] == ": keepalive"
+
+
+def test_stats_endpoint_reads_incrementally_maintained_rollups(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-stats.db"
+    store = SQLiteStore(db_path)
+    for idx in range(1, 4):
+        store.upsert_event(_article(idx), translated_title=f"T{idx}", translated_summary=f"S{idx}")
+    keys = [_article(idx).record_key for idx in range(1, 4)]
+    store.record_delivery_batch(keys[:2], "telegram:chat", DeliveryResult(channel="telegram", success=True))
+    store.mark_sent(keys[0], "telegram")
+    store.mark_sent(keys[1], "telegram")
+    store.record_delivery_batch(
+        keys[2:], "telegram:chat", DeliveryResult(channel="telegram", success=False, error_message="HTTP 429\nbody")
+    )
+    store.mark_failed(keys[2], "HTTP 429")
+    store.mark_failed(keys[2], "HTTP 429")
+    client = TestClient(build_app(db_path=db_path, api_key="k"))
+
+    stats = client.get("/api/stats", params={"days": 7}, headers={"X-API-Key": "k"}).json()
+    today = stats["articles_per_day"][-1]
+    assert (today["created"], today["sent"], today["failed"]) == (3, 2, 1)
+    assert stats["success_rate_by_channel"] == [
+        {"channel": "telegram", "attempts": 3, "successes": 2, "success_rate": 0.6667}
+    ]
+    assert stats["failure_reasons"] == [{"channel": "telegram", "reason": "HTTP 429", "failures": 1}]
+
+    conn = MiniAppArticleStore(db_path)._db.connection()
+    plan = " ".join(
+        str(row[3])
+        for row in conn.execute("EXPLAIN QUERY PLAN SELECT * FROM delivery_daily_stats WHERE day >= '2026-01-01'")
+    )
+    assert "SEARCH delivery_daily_stats USING PRIMARY KEY" in plan
+
+
+def test_api_rate_limits_per_ip_and_per_key(tmp_path: Path) -> None:
+    db_path = tmp_path / "miniapp-ratelimit.db"
+    SQLiteStore(db_path)
+    client = TestClient(build_app(db_path=db_path, api_key="k", rate_per_ip=0.001, burst_per_ip=3))
+    assert [client.get("/api/articles", headers={"X-API-Key": "bad"}).status_code for _ in range(3)] == [401] * 3
+    limited = client.get("/api/articles", headers={"X-API-Key": "k"})
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert client.get("/health").status_code == 200
+
+    client = TestClient(build_app(db_path=db_path, api_key="k", rate_per_key=0.001, burst_per_key=2))
+    statuses = [client.get("/api/articles", headers={"X-API-Key": "k"}).status_code for _ in range(2)]
+    assert statuses == [200, 200]
+    assert client.get("/api/articles", headers={"X-API-Key": "bad"}).status_code == 401
+    assert client.get("/api/metrics", headers={"X-API-Key": "k"}).status_code == 429
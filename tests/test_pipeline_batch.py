@@ -1,3 +1,4 @@
+from dataclasses import replace
 from pathlib import Path
 from typing import Optional
 
@@ -6,6 +7,7 @@ from afr_pusher.config import Settings
 from afr_pusher.models import Article, ArticleBlock, DeliveryResult
 from afr_pusher.pipeline import NewsPipeline
 from afr_pusher.senders.base import Sender
+from afr_pusher.senders.fanout import FanoutDelivery
 from afr_pusher.senders.router import SenderRouter
 from afr_pusher.store import SQLiteStore
 from afr_pusher.translators.base import Translator
@@ -26,6 +28,13 @@ class PrefixTranslator(Translator):
         return f"ZH:{text}"
 
 
+class EchoTranslator(Translator):
+    name = "echo"
+
+    def translate(self, text: str, source_lang: Optional[str], target_lang: str) -> str:
+        return f" {text} "
+
+
 class FailingTranslator(Translator):
     name = "failing"
 
@@ -326,6 +335,72 @@ def test_pipeline_single_article_preserves_block_layout(tmp_path: Path) -> None:
     assert stats.sent == 1
 
 
+class CountingTranslator(PrefixTranslator):
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def translate(self, text: str, source_lang: Optional[str], target_lang: str) -> str:
+        self.texts.append(text)
+        return super().translate(text, source_lang, target_lang)
+
+
+def test_pipeline_reuses_translation_memory_and_stored_blocks(tmp_path: Path) -> None:
+    db_path = tmp_path / "memory.db"
+    store = SQLiteStore(db_path)
+    shared = ArticleBlock(kind="list_item", text="Shared disclosure")
+
+    def structured(article_id: str, title: str, lead: str) -> Article:
+        article = _article(article_id, title, content=f"{lead}\n\n• {shared.text}")
+        return replace(article, content_blocks=(ArticleBlock(kind="paragraph", text=lead), shared))
+
+    translator = CountingTranslator()
+    for article in (structured("pmem001", "First", "Lead one"), structured("pmem002", "Second", "Lead two")):
+        NewsPipeline(
+            settings=_settings(db_path, max_articles=1),
+            fetcher=FakeFetcher([article]),
+            translator=translator,
+            sender_router=SenderRouter(primary=CapturingSender(success=True), fallback=None),
+            store=store,
+        ).run_once()
+
+    assert translator.texts == ["First", "Lead one", "Shared disclosure", "Second", "Lead two"]
+
+    # A later article with the same title is served from the stored blocks, list items included.
+    sender = CapturingSender(success=True)
+    NewsPipeline(
+        settings=_settings(db_path, max_articles=1),
+        fetcher=FakeFetcher([structured("pmem003", "Second", "Other lead")]),
+        translator=FailingTranslator(),
+        sender_router=SenderRouter(primary=sender, fallback=None),
+        store=store,
+    ).run_once()
+
+    assert sender.calls[0][1] == (
+        '<a href="https://www.afr.com/test-pmem003"><b>ZH:Second</b></a>\n\n'
+        "ZH:Lead two\n\n"
+        "• ZH:Shared disclosure"
+    )
+
+
+def test_pipeline_does_not_remember_untranslated_blocks(tmp_path: Path) -> None:
+    db_path = tmp_path / "memory-identity.db"
+    store = SQLiteStore(db_path)
+    article = replace(
+        _article("pmem010", "Title", content="Lead"),
+        content_blocks=(ArticleBlock(kind="paragraph", text="Lead"),),
+    )
+
+    NewsPipeline(
+        settings=_settings(db_path, max_articles=1),
+        fetcher=FakeFetcher([article]),
+        translator=EchoTranslator(),
+        sender_router=SenderRouter(primary=CapturingSender(success=True), fallback=None),
+        store=store,
+    ).run_once()
+
+    assert store.get_translation_memory(["Lead"], source_lang="EN", target_lang="ZH") == {}
+
+
 def test_run_pipelines_sends_primary_and_street_talk_feeds(tmp_path: Path) -> None:
     sender = CapturingSender(success=True)
     db_path = tmp_path / "dual.db"
@@ -365,6 +440,114 @@ def test_run_pipelines_sends_primary_and_street_talk_feeds(tmp_path: Path) -> No
     assert stats.sent == 2
 
 
+def test_pipeline_fans_out_to_every_target_and_records_each_once(tmp_path: Path) -> None:
+    articles = [_article("pfan001", "Title One"), _article("pfan002", "Title Two")]
+    db_path = tmp_path / "fanout.db"
+    store = SQLiteStore(db_path)
+    good = CapturingSender(success=True)
+    broken = CapturingSender(success=False)
+    fanout = FanoutDelivery(
+        {
+            "@one": SenderRouter(primary=good, fallback=None),
+            "-1002": SenderRouter(primary=broken, fallback=None),
+            "@three": SenderRouter(primary=good, fallback=None),
+        }
+    )
+    pipeline = NewsPipeline(
+        settings=_settings(db_path),
+        fetcher=FakeFetcher(articles),
+        translator=PrefixTranslator(),
+        sender_router=None,
+        store=store,
+        fanout=fanout,
+    )
+
+    stats = pipeline.run_once()
+
+    assert sorted(target for target, _ in good.calls) == ["@one", "@three"]
+    assert [target for target, _ in broken.calls] == ["-1002"]
+    assert (stats.sent, stats.failed, stats.partial) == (0, 0, 2)
+    assert store.is_sent_many(article.record_key for article in articles) == set()
+    conn = store.connection_manager.connection()
+    batches = conn.execute("SELECT target, success FROM delivery_batches ORDER BY id").fetchall()
+    assert [(row["target"], row["success"]) for row in batches] == [("@one", 1), ("-1002", 0), ("@three", 1)]
+    assert conn.execute("SELECT COUNT(*) FROM delivery_batch_items").fetchone()[0] == 2 * 3
+
+    # The next run only re-sends to the target that failed.
+    good.calls.clear()
+    broken.success = True
+    stats = pipeline.run_once()
+
+    assert good.calls == []
+    assert [target for target, _ in broken.calls] == ["-1002", "-1002"]
+    assert (stats.sent, stats.failed, stats.partial) == (2, 0, 0)
+    assert store.is_sent_many(article.record_key for article in articles) == {a.record_key for a in articles}
+    assert store.get_delivered_targets([articles[0].record_key]) == {
+        articles[0].record_key: {"@one": "capturing", "-1002": "capturing", "@three": "capturing"}
+    }
+
+
+def test_pipeline_marks_failed_when_every_target_fails(tmp_path: Path) -> None:
+    db_path = tmp_path / "fanout-failed.db"
+    store = SQLiteStore(db_path)
+    fanout = FanoutDelivery(
+        {
+            "@one": SenderRouter(primary=CapturingSender(success=False), fallback=None),
+            "@two": SenderRouter(primary=CapturingSender(success=False), fallback=None),
+        }
+    )
+
+    stats = NewsPipeline(
+        settings=_settings(db_path),
+        fetcher=FakeFetcher([_article("pfan003", "Title")]),
+        translator=PrefixTranslator(),
+        sender_router=None,
+        store=store,
+        fanout=fanout,
+    ).run_once()
+
+    assert stats.failed == 1
+    row = store.connection_manager.connection().execute("SELECT status, last_error FROM article_events").fetchone()
+    assert row["status"] == "failed"
+    assert row["last_error"] == "@one: send failed; @two: send failed"
+
+
+def test_pipeline_persists_each_target_group_before_sending_the_next(tmp_path: Path) -> None:
+    db_path = tmp_path / "fanout-groups.db"
+    store = SQLiteStore(db_path)
+    retried, fresh = _article("pfan004", "Retried"), _article("pfan005", "Fresh")
+    store.upsert_event(retried, retried.title, retried.summary)
+    store.record_delivery_batch([retried.record_key], "@one", DeliveryResult(channel="capturing", success=True))
+    store.mark_failed(retried.record_key, "@two: send failed")
+    fanout = FanoutDelivery(
+        {
+            "@one": SenderRouter(primary=CapturingSender(success=True), fallback=None),
+            "@two": SenderRouter(primary=CapturingSender(success=True), fallback=None),
+        }
+    )
+    sent_before_each_send: list[set[str]] = []
+    fanout_send = fanout.send
+
+    def observing_send(message, *, targets=None):
+        sent_before_each_send.append(store.is_sent_many([retried.record_key, fresh.record_key]))
+        return fanout_send(message, targets=targets)
+
+    fanout.send = observing_send
+
+    stats = NewsPipeline(
+        settings=_settings(db_path),
+        fetcher=FakeFetcher([retried, fresh]),
+        translator=PrefixTranslator(),
+        sender_router=None,
+        store=store,
+        fanout=fanout,
+    ).run_once()
+
+    # The retried article only needed @two and went first; it was stored as sent before the second group.
+    assert sent_before_each_send == [set(), {retried.record_key}]
+    assert stats.sent == 2
+
+
 def test_pipeline_batch_skips_previously_sent_article_and_sends_remaining(tmp_path: Path) -> None:
     db_path = tmp_path / "batch-skip.db"
     store = SQLiteStore(db_path)
@@ -395,6 +578,21 @@ def test_pipeline_batch_skips_previously_sent_article_and_sends_remaining(tmp_pa
     assert stats.skipped == 1
 
 
+class LookupCountingStore(SQLiteStore):
+    def __init__(self, db_path: Path) -> None:
+        super().__init__(db_path)
+        self.single_lookups = 0
+        self.bulk_lookups = 0
+
+    def is_sent(self, record_key: str) -> bool:
+        self.single_lookups += 1
+        return super().is_sent(record_key)
+
+    def is_sent_many(self, record_keys):
+        self.bulk_lookups += 1
+        return super().is_sent_many(record_keys)
+
+
 class FakePreviewRenderer:
     def __init__(self, preview_path: Path):
         self.preview_path = preview_path
@@ -436,3 +634,36 @@ def test_pipeline_sends_preview_image_before_text(tmp_path: Path) -> None:
     )
     assert preview_renderer.captured_titles == ["ZH:Title One", "ZH:Title Two"]
     assert stats.sent == 2
+
+
+def test_pipeline_flushes_store_writes_at_checkpoints(tmp_path: Path) -> None:
+    db_path = tmp_path / "checkpoints.db"
+    store = LookupCountingStore(db_path)
+    flushed: list[int] = []
+    execute_statements = store._execute_statements
+
+    def counting_execute(statements):
+        flushed.append(len(statements))
+        execute_statements(statements)
+
+    store._execute_statements = counting_execute
+    articles = [_article(f"pabc00{idx}", f"Title {idx}") for idx in range(1, 6)]
+
+    pipeline = NewsPipeline(
+        settings=_settings(db_path),
+        fetcher=FakeFetcher(articles),
+        translator=PrefixTranslator(),
+        sender_router=SenderRouter(primary=CapturingSender(success=True), fallback=None),
+        store=store,
+    )
+
+    stats = pipeline.run_once()
+
+    # raw content, translations, then delivery attempts + sent marks
+    assert flushed == [5, 5, 7]
+    assert stats.sent == 5
+    # candidates are checked with one bulk lookup, never one query per article
+    assert (store.bulk_lookups, store.single_lookups) == (1, 0)
+    assert store.is_sent_many(article.record_key for article in articles) == {
+        article.record_key for article in articles
+    }
@@ -0,0 +1,65 @@
+import time
+
+from afr_pusher.ratelimit import TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_allows_burst_then_refills_at_rate() -> None:
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(2.0, 3, clock=clock)
+
+    assert [limiter.acquire("k") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("k") == 0.5
+    assert limiter.acquire("other") == 0.0
+
+    clock.now += 0.5
+    assert limiter.acquire("k") == 0.0
+    assert limiter.acquire("k") == 0.5
+    clock.now += 60
+    assert [limiter.acquire("k") for _ in range(4)][-1] == 0.5
+
+    stats = limiter.stats()
+    assert (stats.allowed, stats.limited, stats.tracked_keys) == (8, 3, 2)
+
+
+def test_limiter_forgets_least_recently_seen_keys() -> None:
+    limiter = TokenBucketLimiter(1.0, 1, max_keys=2, clock=FakeClock())
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("a")
+    limiter.acquire("c")
+
+    assert limiter.stats().tracked_keys == 2
+    assert limiter.acquire("b") == 0.0
+    assert limiter.acquire("a") == 0.0
+
+
+def test_acquire_overhead_is_negligible() -> None:
+    limiter = TokenBucketLimiter(1_000_000.0, 1_000_000)
+    keys = [f"10.0.{idx // 256}.{idx % 256}" for idx in range(1000)]
+    started = time.perf_counter()
+    for _ in range(100):
+        for key in keys:
+            limiter.acquire(key)
+    per_call = (time.perf_counter() - started) / (100 * len(keys))
+    # A request through the FastAPI stack costs milliseconds; the check has to stay in the microseconds.
+    assert per_call < 20e-6
+
+
+def test_wait_time_reports_delay_without_taking_a_token() -> None:
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(1.0, 1, clock=clock)
+
+    assert limiter.wait_time("k") == 0.0
+    assert limiter.acquire("k") == 0.0
+    assert limiter.wait_time("k") == 1.0
+    clock.now += 1.0
+    assert limiter.wait_time("k") == 0.0
+    assert limiter.acquire("k") == 0.0
@@ -0,0 +1,40 @@
+from afr_pusher.response_cache import ResponseCache
+
+
+def test_response_cache_evicts_least_recently_used() -> None:
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "v1", b"A")  # ignored: the version has not been seen by get() yet
+    assert cache.get("a", "v1") is None
+    cache.put("a", "v1", b"A")
+    cache.put("b", "v1", b"B")
+    assert cache.get("a", "v1") == b"A"
+    cache.put("c", "v1", b"C")
+
+    assert cache.get("b", "v1") is None
+    assert cache.get("a", "v1") == b"A"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries, stats.bytes) == (2, 2, 1, 2, 2)
+
+
+def test_response_cache_drops_everything_on_a_new_version() -> None:
+    cache = ResponseCache(max_entries=8)
+    cache.get("a", "v1")
+    cache.put("a", "v1", b"A")
+
+    assert cache.get("a", "v2") is None
+    cache.put("a", "v1", b"stale")  # a request that started before the change
+    assert cache.get("a", "v2") is None
+    assert cache.stats().invalidations == 1
+
+
+def test_response_cache_respects_byte_budget() -> None:
+    cache = ResponseCache(max_entries=8, max_bytes=4)
+    cache.get("a", "v1")
+    cache.put("a", "v1", b"AAA")
+    cache.put("b", "v1", b"BBB")
+    cache.put("huge", "v1", b"x" * 10)
+
+    assert cache.get("a", "v1") is None
+    assert cache.get("b", "v1") == b"BBB"
+    assert cache.get("huge", "v1") is None
+    assert cache.stats().bytes == 3
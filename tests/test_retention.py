@@ -0,0 +1,188 @@
+import gzip
+import json
+import sqlite3
+from pathlib import Path
+
+from afr_pusher.miniapp_store import MiniAppArticleStore
+from afr_pusher.models import Article, DeliveryResult
+from afr_pusher.retention import RetentionPolicy, run_retention
+from afr_pusher.store import SQLiteStore
+
+
+def _article(idx: int) -> Article:
+    ts = f"2026-02-{idx:02d}T00:00:00+00:00"
+    return Article(
+        article_id=f"p{idx:06d}",
+        record_key=f"p{idx:06d}:{ts}",
+        url=f"https://www.afr.com/test-{idx}",
+        title=f"Title {idx}",
+        summary="Summary " + "x" * 2000,
+        published_at=ts,
+        updated_at=ts,
+    )
+
+
+def _seed(store: SQLiteStore, count: int) -> None:
+    for idx in range(1, count + 1):
+        article = _article(idx)
+        store.upsert_event(article, translated_title=f"T{idx}", translated_summary="S" * 2000)
+        store.record_delivery_attempt(article.record_key, "@chat", DeliveryResult(channel="telegram-bot", success=True))
+        store.mark_sent(article.record_key, "telegram-bot")
+
+
+def _read_archive(path: Path) -> list[dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_retention_archives_expired_events_with_their_deliveries(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "retention.db")
+    _seed(store, 30)
+    conn = store.connection_manager.connection()
+    # Age the first 20 articles by two years.
+    conn.execute(
+        "UPDATE article_events SET sort_ts = sort_ts - 2 * 365 * 86400000 WHERE record_key IN "
+        "(SELECT record_key FROM article_events ORDER BY record_key LIMIT 20)"
+    )
+
+    report = run_retention(
+        store,
+        events_policy=RetentionPolicy(max_age_days=365),
+        deliveries_policy=RetentionPolicy(),
+        archive_dir=tmp_path / "archive",
+        vacuum_step_pages=4,
+    )
+
+    assert report.archived_events == 20
+    assert report.archived_deliveries == 20
+    # 30 inserts, 30 updates and 20 deletes collapse into the latest entry per article.
+    assert report.compacted_changes == 80 - 30
+    assert [op for (op,) in conn.execute("SELECT op FROM changes ORDER BY seq")] == ["update"] * 10 + ["delete"] * 20
+    assert conn.execute("SELECT COUNT(*) FROM article_events").fetchone()[0] == 10
+    assert conn.execute("SELECT COUNT(*) FROM delivery_batches").fetchone()[0] == 10
+    assert report.vacuum_steps >= 1
+    assert report.bytes_reclaimed > 0
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+    archived = _read_archive(report.archive_path)
+    assert sum(1 for item in archived if item["table"] == "article_events") == 20
+    assert {item["row"]["record_key"] for item in archived if item["table"] == "delivery_batch_items"} == {
+        _article(idx).record_key for idx in range(1, 21)
+    }
+
+
+def test_retention_keeps_batches_shared_with_live_articles(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "shared.db")
+    old, new = _article(1), _article(2)
+    for article in (old, new):
+        store.upsert_event(article, translated_title="T", translated_summary="S")
+    store.record_delivery_batch([old.record_key, new.record_key], "@chat", DeliveryResult(channel="telegram-bot", success=True))
+    store.record_delivery_batch([old.record_key], "@chat", DeliveryResult(channel="telegram-bot", success=False))
+    conn = store.connection_manager.connection()
+    conn.execute("UPDATE article_events SET sort_ts = 0 WHERE record_key = ?", (old.record_key,))
+
+    report = run_retention(
+        store,
+        events_policy=RetentionPolicy(max_age_days=365),
+        deliveries_policy=RetentionPolicy(),
+        archive_dir=tmp_path / "archive",
+    )
+
+    assert report.archived_events == 1
+    assert report.archived_deliveries == 1
+    assert conn.execute("SELECT COUNT(*) FROM delivery_batches").fetchone()[0] == 1
+    assert [tuple(row) for row in conn.execute("SELECT record_key FROM delivery_batch_items")] == [(new.record_key,)]
+
+
+def test_retention_enforces_row_limits(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "rows.db")
+    _seed(store, 12)
+
+    report = run_retention(
+        store,
+        events_policy=RetentionPolicy(max_rows=10),
+        deliveries_policy=RetentionPolicy(max_rows=5),
+        archive_dir=tmp_path / "archive",
+    )
+
+    conn = store.connection_manager.connection()
+    assert report.archived_events == 2
+    assert conn.execute("SELECT COUNT(*) FROM article_events").fetchone()[0] == 10
+    assert conn.execute("SELECT COUNT(*) FROM delivery_batches").fetchone()[0] == 5
+    assert report.archived_deliveries == 7
+
+
+def test_retention_row_limit_keeps_newest_deliveries_across_id_gaps(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "gaps.db")
+    _seed(store, 12)
+    conn = store.connection_manager.connection()
+    # Leave gaps in the id sequence, as earlier archiving or manual cleanup would.
+    conn.execute("DELETE FROM delivery_batch_items WHERE batch_id IN (9, 10, 11)")
+    conn.execute("DELETE FROM delivery_batches WHERE id IN (9, 10, 11)")
+
+    report = run_retention(
+        store,
+        events_policy=RetentionPolicy(),
+        deliveries_policy=RetentionPolicy(max_rows=5),
+        archive_dir=tmp_path / "archive",
+    )
+
+    assert report.archived_deliveries == 4
+    assert [row[0] for row in conn.execute("SELECT id FROM delivery_batches ORDER BY id")] == [5, 6, 7, 8, 12]
+
+
+def test_retention_of_deliveries_changes_the_api_validator(tmp_path: Path) -> None:
+    db_path = tmp_path / "validator.db"
+    store = SQLiteStore(db_path)
+    _seed(store, 3)
+    api_store = MiniAppArticleStore(db_path)
+    before = api_store.data_validator()
+
+    report = run_retention(
+        store,
+        events_policy=RetentionPolicy(),
+        deliveries_policy=RetentionPolicy(max_rows=2),
+        archive_dir=tmp_path / "archive",
+    )
+
+    assert report.archived_deliveries == 1
+    # The article is kept but its delivery history shrank, so cached detail responses must not be reused.
+    assert api_store.data_validator().etag != before.etag
+    latest = store.connection_manager.connection().execute(
+        "SELECT record_key, op FROM changes ORDER BY seq DESC LIMIT 1"
+    ).fetchone()
+    assert tuple(latest) == (_article(1).record_key, "update")
+    assert api_store.get_article(_article(1).record_key)["deliveries"] == []
+
+
+def test_retention_without_expired_rows_writes_no_archive(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "noop.db")
+    _seed(store, 2)
+
+    report = run_retention(
+        store,
+        events_policy=RetentionPolicy(max_age_days=30),
+        deliveries_policy=RetentionPolicy(max_age_days=30),
+        archive_dir=tmp_path / "archive",
+    )
+
+    assert report.archived_events == 0
+    assert report.archive_path is None
+    assert not (tmp_path / "archive").exists()
+
+
+def test_retention_converts_legacy_database_to_incremental_vacuum(tmp_path: Path) -> None:
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE legacy (id INTEGER)")
+    store = SQLiteStore(db_path)
+    assert store.connection_manager.connection().execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+
+    run_retention(
+        store,
+        events_policy=RetentionPolicy(),
+        deliveries_policy=RetentionPolicy(),
+        archive_dir=tmp_path / "archive",
+    )
+
+    assert store.connection_manager.connection().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
@@ -0,0 +1,73 @@
+import gzip
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from afr_pusher.miniapp_api import build_app
+from afr_pusher.models import Article
+from afr_pusher.snapshot import export_snapshots
+from afr_pusher.store import SQLiteStore
+
+
+def _seed(store: SQLiteStore, count: int) -> list[str]:
+    keys = []
+    for idx in range(1, count + 1):
+        ts = f"2026-03-{idx:02d}T00:00:00+00:00"
+        article = Article(
+            article_id=f"s{idx:06d}",
+            record_key=f"s{idx:06d}:{ts}",
+            url=f"https://www.afr.com/snapshot-{idx}",
+            title=f"Title {idx}",
+            summary=f"Summary {idx}",
+            published_at=ts,
+            updated_at=ts,
+        )
+        store.upsert_event(article, translated_title=f"标题 {idx}", translated_summary=f"摘要 {idx}")
+        keys.append(article.record_key)
+    if count:
+        store.mark_sent(keys[0], "telegram-bot")
+    return keys
+
+
+def test_snapshots_match_api_responses(tmp_path: Path) -> None:
+    db_path = tmp_path / "snapshot.db"
+    _seed(SQLiteStore(db_path), 25)
+    out_dir = tmp_path / "snapshot"
+
+    report = export_snapshots(db_path, out_dir, detail_count=3)
+
+    assert report.files_written == 4 + 3
+    client = TestClient(build_app(db_path=db_path, api_key="k"))
+    headers = {"X-API-Key": "k"}
+    for name, params in (("all", {"limit": 20}), ("sent", {"limit": 20, "status": "sent"})):
+        path = out_dir / "lists" / f"{name}.json"
+        assert json.loads(path.read_bytes()) == client.get("/api/articles", params=params, headers=headers).json()
+        assert gzip.decompress((out_dir / "lists" / f"{name}.json.gz").read_bytes()) == path.read_bytes()
+
+    listing = client.get("/api/articles", params={"limit": 3, "fields": "record_key"}, headers=headers).json()
+    newest = [item["record_key"] for item in listing["items"]]
+    detail_files = sorted(path.name for path in (out_dir / "articles").iterdir())
+    assert detail_files == sorted([f"{key}.json" for key in newest] + [f"{key}.json.gz" for key in newest])
+    detail = json.loads((out_dir / "articles" / f"{newest[0]}.json").read_bytes())
+    assert detail == client.get(f"/api/articles/{newest[0]}", headers=headers).json()
+
+
+def test_snapshot_rerun_skips_unchanged_files_and_prunes_old_details(tmp_path: Path) -> None:
+    db_path = tmp_path / "snapshot.db"
+    store = SQLiteStore(db_path)
+    _seed(store, 3)
+    out_dir = tmp_path / "snapshot"
+    export_snapshots(db_path, out_dir, detail_count=2)
+    list_file = out_dir / "lists" / "all.json"
+    first_mtime = list_file.stat().st_mtime_ns
+
+    report = export_snapshots(db_path, out_dir, detail_count=2)
+    assert report.files_written == 0
+    assert report.files_unchanged == 4 + 2
+    assert list_file.stat().st_mtime_ns == first_mtime
+
+    report = export_snapshots(db_path, out_dir, detail_count=1)
+    assert report.files_removed == 2
+    assert len(list((out_dir / "articles").glob("*.json"))) == 1
+    assert not [path for path in out_dir.rglob(".*")]
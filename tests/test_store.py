@@ -1,6 +1,7 @@
+from dataclasses import replace
 from pathlib import Path
 
-from afr_pusher.models import Article
+from afr_pusher.models import Article, ArticleBlock, DeliveryResult, epoch_ms
 from afr_pusher.store import SQLiteStore
 
 
@@ -41,3 +42,240 @@ def test_get_sent_translation_by_title_only_returns_sent_rows(tmp_path: Path) ->
 
     store.mark_sent(article.record_key, "telegram-bot")
     assert store.get_sent_translation_by_title(article.title) == ("待发送标题", "待发送内容")
+
+
+def test_homepage_snapshot_round_trip_keeps_check_times(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "homepage.db")
+
+    store.save_homepage_snapshot("main", ["https://a", "https://b"], {"https://a": "2026-02-07T00:00:00+00:00"})
+    snapshot = store.get_homepage_snapshot("main")
+    assert snapshot["https://a"].position == 0
+    assert snapshot["https://a"].last_checked_at == "2026-02-07T00:00:00+00:00"
+    assert snapshot["https://b"].last_checked_at is None
+
+    store.save_homepage_snapshot("main", ["https://b", "https://a"], {})
+    snapshot = store.get_homepage_snapshot("main")
+    assert snapshot["https://a"].position == 1
+    assert snapshot["https://a"].last_checked_at == "2026-02-07T00:00:00+00:00"
+
+    store.save_homepage_snapshot("main", ["https://b"], {})
+    assert set(store.get_homepage_snapshot("main")) == {"https://b"}
+    assert store.get_homepage_snapshot("street-talk") == {}
+
+
+def test_unit_of_work_buffers_writes_until_flush(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "uow.db")
+    article = _article()
+
+    with store.unit_of_work() as work:
+        work.upsert_event(article, translated_title="T", translated_summary="S")
+        assert store.get_event_status(article.record_key) is None
+
+        work.flush()
+        assert store.get_event_status(article.record_key) == "pending"
+
+        work.record_delivery_attempt(article.record_key, "@chat", DeliveryResult(channel="telegram-bot", success=True))
+        work.mark_sent(article.record_key, "telegram-bot")
+        assert len(work) == 3
+        assert store.is_sent(article.record_key) is False
+
+    assert store.is_sent(article.record_key) is True
+
+
+def test_bulk_status_lookups_answer_for_whole_candidate_list(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "bulk.db")
+    sent = _article()
+    pending = Article(
+        article_id="p456def",
+        record_key="p456def:2026-02-08T00:00:00+00:00",
+        url="https://www.afr.com/test-20260208-p456def",
+        title="Other",
+        summary="Summary",
+        published_at="2026-02-08T00:00:00+00:00",
+        updated_at="2026-02-08T00:00:00+00:00",
+    )
+    store.upsert_event(sent, translated_title="T", translated_summary="S")
+    store.mark_sent(sent.record_key, "telegram-bot")
+    store.upsert_event(pending, translated_title="T", translated_summary="S")
+
+    missing_keys = [f"missing:{idx}" for idx in range(1200)]
+    keys = [sent.record_key, pending.record_key, *missing_keys]
+
+    assert store.is_sent_many(keys) == {sent.record_key}
+    assert store.get_statuses(keys) == {sent.record_key: "sent", pending.record_key: "pending"}
+
+    known = store.get_known_articles(["p123abc", "p456def", "pmissing"])
+    assert set(known) == {"p123abc", "p456def"}
+    assert known["p123abc"].record_key == sent.record_key
+    assert known["p123abc"].status == "sent"
+
+
+def test_store_migrates_legacy_database_and_backfills_sort_keys(tmp_path: Path) -> None:
+    import sqlite3
+
+    from afr_pusher.store import MIGRATIONS, SCHEMA
+
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA)
+        conn.execute(
+            """
+            INSERT INTO article_events (
+                record_key, article_id, url, title, summary, translated_title, translated_summary,
+                status, created_at, sent_at
+            ) VALUES ('k1', 'p1', 'u', 't', 's', 'tt', 'ts', 'sent',
+                      '2026-02-07T00:00:00+00:00', '2026-02-07T00:00:01.500000+00:00')
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO deliveries (record_key, channel, target, success, response_excerpt, created_at)
+            VALUES ('k1', 'telegram-bot', '@chat', 1, 'ok', '2026-02-07T00:00:01+00:00')
+            """
+        )
+
+    store = SQLiteStore(db_path)
+    row = store._db.connection().execute("SELECT created_ts, sort_ts FROM article_events").fetchone()
+    assert tuple(row) == (1770422400000, 1770422401500)
+    batch = store._db.connection().execute(
+        """
+        SELECT i.record_key, b.channel, b.response_excerpt
+        FROM delivery_batch_items AS i JOIN delivery_batches AS b ON b.id = i.batch_id
+        """
+    ).fetchall()
+    assert [tuple(item) for item in batch] == [("k1", "telegram-bot", "ok")]
+    assert store._db.connection().execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE name = 'deliveries'"
+    ).fetchone()[0] == 0
+    rollups = store._db.connection().execute(
+        """
+        SELECT a.day, a.created, a.sent, a.failed, d.channel, d.attempts, d.successes
+        FROM article_daily_stats AS a JOIN delivery_daily_stats AS d ON d.day = a.day
+        """
+    ).fetchall()
+    assert [tuple(item) for item in rollups] == [("2026-02-07", 1, 1, 0, "telegram-bot", 1, 1)]
+    assert store._db.connection().execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+
+
+def test_store_maintains_sort_key_on_status_changes(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "sort.db")
+    article = _article()
+    conn = store._db.connection()
+
+    store.upsert_event(article, translated_title="T", translated_summary="S")
+    created_ts, sort_ts = conn.execute("SELECT created_ts, sort_ts FROM article_events").fetchone()
+    assert created_ts == sort_ts
+
+    store.mark_failed(article.record_key, "boom")
+    failed_sort_ts = conn.execute("SELECT sort_ts FROM article_events").fetchone()[0]
+    assert failed_sort_ts >= sort_ts
+
+    store.mark_sent(article.record_key, "telegram-bot")
+    sent_at, sent_sort_ts = conn.execute("SELECT sent_at, sort_ts FROM article_events").fetchone()
+    assert sent_sort_ts == epoch_ms(sent_at)
+
+    store.mark_failed(article.record_key, "later failure")
+    assert conn.execute("SELECT sort_ts FROM article_events").fetchone()[0] == sent_sort_ts
+
+
+def test_store_daily_stats_count_final_outcomes_like_the_backfill(tmp_path: Path) -> None:
+    from afr_pusher.store import MIGRATIONS
+
+    store = SQLiteStore(tmp_path / "daily-stats.db")
+    retried = _article()
+    abandoned = replace(_article(), article_id="p789ghi", record_key="p789ghi:2026-02-07T00:00:00+00:00")
+    for attempt in range(3):
+        for article in (retried, abandoned):
+            store.upsert_event(article, translated_title="T", translated_summary="S")
+            store.mark_failed(article.record_key, f"boom {attempt}")
+    store.upsert_event(retried, translated_title="T", translated_summary="S")
+    store.mark_sent(retried.record_key, "telegram-bot")
+
+    conn = store._db.connection()
+    live = [tuple(row) for row in conn.execute("SELECT day, created, sent, failed FROM article_daily_stats")]
+    assert [row[1:] for row in live] == [(2, 1, 1)]
+
+    backfill_prefix = "INSERT INTO article_daily_stats (day, created, sent, failed)"
+    (backfill,) = [sql for sql in MIGRATIONS[7] if backfill_prefix in sql]
+    conn.execute("DELETE FROM article_daily_stats")
+    conn.execute(backfill)
+    assert [tuple(row) for row in conn.execute("SELECT day, created, sent, failed FROM article_daily_stats")] == live
+
+
+def test_store_records_one_delivery_batch_per_attempt(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "batches.db")
+    keys = [f"p{idx}:2026-02-07T00:00:00+00:00" for idx in range(3)]
+    failed = DeliveryResult(channel="telegram-bot", success=False, error_message="boom", response_excerpt="x" * 5000)
+    sent = DeliveryResult(channel="telegram-user", success=True)
+
+    with store.unit_of_work() as work:
+        work.record_delivery_batch(keys, "@chat", failed)
+        work.record_delivery_batch(keys, "@chat", sent)
+    store.record_delivery_batch(keys[:1], "@other", sent)
+
+    conn = store._db.connection()
+    batches = conn.execute("SELECT id, channel, target, LENGTH(response_excerpt) FROM delivery_batches ORDER BY id").fetchall()
+    assert [tuple(row)[1:] for row in batches] == [
+        ("telegram-bot", "@chat", 1000),
+        ("telegram-user", "@chat", None),
+        ("telegram-user", "@other", None),
+    ]
+    items = conn.execute("SELECT batch_id, COUNT(*) FROM delivery_batch_items GROUP BY batch_id ORDER BY batch_id").fetchall()
+    assert [tuple(row) for row in items] == [(batches[0][0], 3), (batches[1][0], 3), (batches[2][0], 1)]
+
+
+def test_store_keeps_structured_blocks_and_deduplicates_texts(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "blocks.db")
+    disclaimer = ArticleBlock(kind="paragraph", text="Shared disclaimer")
+    first = replace(_article(), content_blocks=(ArticleBlock(kind="paragraph", text="Lead"), disclaimer))
+    second = replace(
+        _article(),
+        article_id="p456def",
+        record_key="p456def:2026-02-07T00:00:00+00:00",
+        content_blocks=(ArticleBlock(kind="list_item", text="Point"), disclaimer),
+    )
+    translated = (ArticleBlock(kind="paragraph", text="导语"), ArticleBlock(kind="paragraph", text="声明"))
+
+    store.upsert_event(first, translated_title="T", translated_summary="导语\n\n声明", translated_blocks=translated)
+    store.upsert_event(second, translated_title="T2", translated_summary="S2")
+    store.mark_sent(first.record_key, "telegram-bot")
+
+    assert store.get_article_blocks(first.record_key) == (first.content_blocks, translated)
+    assert store.get_article_blocks(second.record_key) == (second.content_blocks, ())
+    assert store.get_sent_translation_with_blocks(first.title) == ("T", "导语\n\n声明", translated)
+    # Lead, Point, the shared disclaimer and two translated texts.
+    assert store._db.connection().execute("SELECT COUNT(*) FROM content_blocks").fetchone()[0] == 5
+
+
+def test_store_translation_memory_is_scoped_by_language(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "memory.db")
+    with store.unit_of_work() as work:
+        work.remember_translations([("Hello", "你好")], source_lang="EN", target_lang="ZH")
+
+    assert store.get_translation_memory(["Hello", "Bye"], source_lang="EN", target_lang="ZH") == {"Hello": "你好"}
+    assert store.get_translation_memory(["Hello"], source_lang="EN", target_lang="JA") == {}
+
+
+def test_store_change_log_tracks_writes_after_a_cursor(tmp_path: Path) -> None:
+    store = SQLiteStore(tmp_path / "changes.db")
+    article = _article()
+
+    store.upsert_event(article, translated_title="T", translated_summary="S")
+    store.upsert_event(article, translated_title="T", translated_summary="S")  # no-op, not logged
+    store.mark_sent(article.record_key, "telegram-bot")
+
+    changes = store.read_changes()
+    assert [(change.op, change.status) for change in changes] == [("insert", "pending"), ("update", "sent")]
+    assert changes[0].seq < changes[1].seq
+    assert store.read_changes(after_seq=changes[0].seq, limit=1) == changes[1:]
+    assert store.read_changes(after_seq=changes[-1].seq) == []
+
+    store._db.connection().execute("DELETE FROM article_events")
+    last = store.read_changes(after_seq=changes[-1].seq)
+    assert [(change.record_key, change.op) for change in last] == [(article.record_key, "delete")]
+
+    assert store.compact_changes() == 2
+    assert store.change_log_bounds() == (last[0].seq, last[0].seq)
+    assert store.compact_changes(max_age_days=1) == 0
+    assert store.compact_changes(max_age_days=-1) == 1
+    assert store.change_log_bounds() == (0, last[0].seq)
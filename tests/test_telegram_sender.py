@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from afr_pusher.senders.telegram import TelegramBotSender
+from afr_pusher.senders.telegram import TelegramBotSender, TelegramRateLimiter
 
 
 class FakeResponse:
@@ -20,8 +20,9 @@ class FakeResponse:
 
 
 class FakeSession:
-    def __init__(self, response: FakeResponse):
+    def __init__(self, response: FakeResponse, *queued: FakeResponse):
         self.response = response
+        self.queued = list(queued)
         self.calls: list[dict] = []
 
     def post(
@@ -37,9 +38,35 @@ class FakeSession:
             image = files["photo"]
             call["photo_bytes"] = image.read()
         self.calls.append(call)
+        if self.queued:
+            return self.queued.pop(0)
         return self.response
 
 
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _limited_sender(session: FakeSession, clock: FakeClock, chat_id: str = "12345", **kwargs) -> TelegramBotSender:
+    return TelegramBotSender(
+        bot_token="abc123",
+        chat_id=chat_id,
+        timeout_sec=5,
+        session=session,
+        rate_limiter=TelegramRateLimiter(clock=clock, sleep=clock.sleep),
+        **kwargs,
+    )
+
+
 def test_telegram_send_message_builds_payload() -> None:
     session = FakeSession(FakeResponse(body={"ok": True, "result": {"message_id": 1}}, text="ok"))
     sender = TelegramBotSender(
@@ -121,3 +148,75 @@ def test_telegram_send_can_disable_parse_mode() -> None:
         "text": "hello world",
         "disable_web_page_preview": True,
     }
+
+
+def test_telegram_sender_paces_messages_to_one_chat() -> None:
+    clock = FakeClock()
+    session = FakeSession(FakeResponse(body={"ok": True}, text="ok"))
+    sender = _limited_sender(session, clock)
+
+    results = [sender.send("unused", f"message {idx}") for idx in range(3)]
+
+    assert all(result.success for result in results)
+    assert len(session.calls) == 3
+    assert clock.sleeps == [1.0, 1.0]
+
+
+def test_telegram_group_limit_allows_burst_then_paces_per_minute() -> None:
+    clock = FakeClock()
+    limiter = TelegramRateLimiter(chat_rate_per_sec=1000.0, clock=clock, sleep=clock.sleep)
+
+    delays = []
+    for _ in range(21):
+        delays.append(limiter.acquire("-1000001"))
+        clock.now += 0.01
+
+    assert delays[:20] == [0.0] * 20
+    # 20 per minute: one token every 3 s, minus what trickled in during the burst.
+    assert 2.5 < delays[20] <= 3.0
+    assert limiter.acquire("12345") == 0.0
+
+
+def test_telegram_sender_retries_after_429_within_budget() -> None:
+    clock = FakeClock()
+    too_many = FakeResponse(
+        body={
+            "ok": False,
+            "error_code": 429,
+            "description": "Too Many Requests: retry after 7",
+            "parameters": {"retry_after": 7},
+        },
+        text="429",
+        status_code=429,
+    )
+    session = FakeSession(FakeResponse(body={"ok": True}, text="ok"), too_many)
+    sender = _limited_sender(session, clock)
+
+    result = sender.send("unused", "hello")
+
+    assert result.success is True
+    assert len(session.calls) == 2
+    assert clock.sleeps == [7.0]
+
+
+def test_telegram_sender_gives_up_when_retry_after_exceeds_budget() -> None:
+    clock = FakeClock()
+    too_many = FakeResponse(
+        body={
+            "ok": False,
+            "error_code": 429,
+            "description": "Too Many Requests: retry after 90",
+            "parameters": {"retry_after": 90},
+        },
+        text="429",
+        status_code=429,
+    )
+    session = FakeSession(too_many)
+    sender = _limited_sender(session, clock, retry_budget_sec=30)
+
+    result = sender.send("unused", "hello")
+
+    assert result.success is False
+    assert "retry after 90" in (result.error_message or "")
+    assert len(session.calls) == 1
+    assert clock.sleeps == []